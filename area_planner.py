@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Планировщик шардов по регионам
+
+Скачивает дерево /areas (с кэшем на неделю), узнаёт `found` по каждому
+региону для всех ключевых слов сборщика (SEARCH_KEYWORDS, с кэшем на
+несколько часов) и раскладывает регионы по N шардам так, чтобы ожидаемое
+число страниц в шардах было примерно одинаковым и каждый шард
+укладывался в лимит пагинации HH (не глубже 2000 результатов). Вес
+региона - сумма found по словам: столько страниц запрашивает сбор по
+каждому слову, а объединённый запрос не больше этого.
+
+План строится в workflow update-vacancies-fullDay.yml раз в неделю
+(--max-age) и коммитится - оба fullDay-шарда читают один и тот же план.
+
+Примеры:
+    python area_planner.py --shards 2            # построить area_shards.json
+    python area_planner.py --shards 2 --max-age 7  # только если план старше недели
+    python area_planner.py --shards 0            # подобрать минимальное N
+    python area_planner.py --check               # проверить текущие списки
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from hh_client import HHClient
+from json_cache import cache_path, read_cache, write_cache
+from vacancy_fields import parse_timestamp
+
+# Дерево регионов меняется редко - кэшируем на неделю
+AREAS_CACHE_FILE = cache_path('hh_areas.json')
+AREAS_CACHE_TTL = 7 * 24 * 3600
+
+# Количество вакансий по региону - кэшируем на 6 часов
+FOUND_CACHE_FILE = cache_path('area_found.json')
+FOUND_CACHE_TTL = 6 * 3600
+
+# Файл с планом шардов, который читают сборщики
+PLAN_FILE = 'area_shards.json'
+
+# HH не отдаёт результаты глубже page * per_page = 2000
+PAGINATION_CAP = 2000
+PER_PAGE = 100
+
+# Корень дерева (Россия) и регионы, которые собирает основной workflow
+ROOT_AREA = '113'
+MAIN_WORKFLOW_AREAS = ['1', '2', '2019', '145']
+
+# Параметры поиска, как в сборщиках вакансий (text - каждое из SEARCH_KEYWORDS)
+DEFAULT_QUERY = {
+    'schedule': ['remote', 'flexible', 'fullDay', 'shift', 'flyInFlyOut'],
+    'search_field': 'name'
+}
+
+# Сборщики с захардкоженными списками регионов (для --check)
+LEGACY_SHARD_SCRIPTS = ['update_vacancies_fullDay.py', 'update_vacancies_fullDay_2.py']
+
+
+def load_areas_tree(client: HHClient, force: bool = False) -> List[Dict]:
+    """
+    Возвращает дерево регионов /areas, скачивая его не чаще раза в неделю
+
+    Args:
+        client: Клиент API HH.ru
+        force: Игнорировать кэш
+
+    Returns:
+        Список корневых регионов с вложенными 'areas'
+    """
+    if not force:
+        cached = read_cache(AREAS_CACHE_FILE, AREAS_CACHE_TTL)
+        if cached:
+            return cached['areas']
+
+    print("🌍 Загружаем дерево регионов /areas...")
+    areas = client.get_json('/areas')
+    if areas is None:
+        # Лучше устаревший кэш, чем ничего
+        cached = read_cache(AREAS_CACHE_FILE, float('inf'))
+        if cached:
+            print("   ⚠️ Используем устаревший кэш регионов")
+            return cached['areas']
+        raise RuntimeError("Не удалось загрузить дерево регионов /areas")
+
+    write_cache(AREAS_CACHE_FILE, {'fetched_at': time.time(), 'areas': areas})
+    return areas
+
+
+def index_areas(tree: List[Dict]) -> Dict[str, Dict]:
+    """Плоский индекс id -> {'id', 'name', 'parent_id', 'children'}"""
+    index = {}
+    stack = list(tree)
+    while stack:
+        area = stack.pop()
+        children = area.get('areas') or []
+        index[area['id']] = {
+            'id': area['id'],
+            'name': area.get('name', ''),
+            'parent_id': area.get('parent_id'),
+            'children': [child['id'] for child in children]
+        }
+        stack.extend(children)
+    return index
+
+
+def query_key(query: Dict) -> str:
+    """Короткий стабильный ключ поискового запроса для кэша found"""
+    canonical = json.dumps(query, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+class FoundCache:
+    """Мемоизация found по (запрос, регион) с TTL"""
+
+    def __init__(self, path: str = FOUND_CACHE_FILE, ttl: float = FOUND_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, key: str, area_id: str) -> Optional[int]:
+        entry = self.entries.get(key, {}).get(area_id)
+        if entry and time.time() - entry['ts'] <= self.ttl:
+            self.hits += 1
+            return entry['found']
+        return None
+
+    def put(self, key: str, area_id: str, found: int):
+        self.entries.setdefault(key, {})[area_id] = {'found': found, 'ts': time.time()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+
+def probe_found(client: HHClient, area_ids: Iterable[str], query: Dict,
+                cache: FoundCache) -> Dict[str, int]:
+    """
+    Узнаёт количество вакансий (found) по каждому региону
+
+    Запрашивает одну вакансию на страницу - нужен только счётчик.
+    Регионы из свежего кэша повторно не запрашиваются.
+
+    Returns:
+        Словарь id региона -> found (регионы с ошибкой пропускаются)
+    """
+    key = query_key(query)
+    found = {}
+    for area_id in area_ids:
+        cached = cache.get(key, area_id)
+        if cached is not None:
+            found[area_id] = cached
+            continue
+
+        params = dict(query, area=area_id, per_page=1, page=0)
+        data = client.search_vacancies(params)
+        if data is None:
+            print(f"   ⚠️ Не удалось узнать found для региона {area_id}")
+            continue
+        found[area_id] = data.get('found', 0)
+        cache.put(key, area_id, found[area_id])
+
+    return found
+
+
+def probe_found_total(client: HHClient, area_ids: Iterable[str], queries: List[Dict],
+                      cache: FoundCache) -> Dict[str, int]:
+    """
+    Сумма found по всем запросам (ключевым словам) для каждого региона
+
+    Регион, по которому хотя бы один запрос не удался, пропускается.
+    """
+    area_ids = list(area_ids)
+    per_query = [probe_found(client, area_ids, query, cache) for query in queries]
+    return {area_id: sum(found[area_id] for found in per_query)
+            for area_id in area_ids if all(area_id in found for found in per_query)}
+
+
+def expected_pages(found: int, per_page: int = PER_PAGE) -> int:
+    """Сколько страниц займёт выдача (с учётом лимита пагинации)"""
+    return math.ceil(min(found, PAGINATION_CAP) / per_page)
+
+
+def split_oversized(found: Dict[str, int], index: Dict[str, Dict], client: HHClient,
+                    queries: List[Dict], cache: FoundCache, cap: int = PAGINATION_CAP) -> Dict[str, int]:
+    """
+    Заменяет регионы, которые сами по себе не влезают в лимит, их дочерними
+
+    Регион без дочерних элементов остаётся как есть - его придётся
+    дополнительно сегментировать по датам.
+    """
+    result = dict(found)
+    oversized = [area_id for area_id, count in result.items() if count > cap]
+    while oversized:
+        area_id = oversized.pop()
+        children = index.get(area_id, {}).get('children', [])
+        if not children:
+            print(f"   ⚠️ Регион {area_id} ({result[area_id]} вакансий) больше лимита и не делится")
+            continue
+        print(f"   ✂️ Регион {area_id} ({result[area_id]} вакансий) делим на {len(children)} дочерних")
+        del result[area_id]
+        child_found = probe_found_total(client, children, queries, cache)
+        result.update(child_found)
+        oversized.extend(a for a, count in child_found.items() if count > cap)
+    return result
+
+
+def plan_shards(found: Dict[str, int], shards: int, cap: int = PAGINATION_CAP,
+                per_page: int = PER_PAGE) -> List[Dict]:
+    """
+    Раскладывает регионы по шардам (жадная упаковка LPT)
+
+    Регионы берутся по убыванию found и кладутся в наименее загруженный
+    шард, в который они ещё влезают по лимиту пагинации. Если ни один
+    не подходит - в наименее загруженный (шард будет помечен over_cap).
+
+    Args:
+        found: id региона -> found
+        shards: Количество шардов
+        cap: Максимум результатов, доступный одним запросом
+
+    Returns:
+        Список шардов {'areas', 'found', 'pages', 'over_cap'}
+    """
+    plan = [{'areas': [], 'found': 0} for _ in range(shards)]
+
+    for area_id in sorted(found, key=lambda a: (-found[a], a)):
+        count = found[area_id]
+        fitting = [shard for shard in plan if shard['found'] + count <= cap]
+        target = min(fitting or plan, key=lambda shard: shard['found'])
+        target['areas'].append(area_id)
+        target['found'] += count
+
+    for shard in plan:
+        shard['areas'].sort(key=int)
+        shard['pages'] = math.ceil(shard['found'] / per_page)
+        shard['over_cap'] = shard['found'] > cap
+    return plan
+
+
+def plan_auto(found: Dict[str, int], cap: int = PAGINATION_CAP,
+              per_page: int = PER_PAGE, max_shards: int = 16) -> List[Dict]:
+    """Подбирает минимальное число шардов, при котором все влезают в лимит"""
+    minimum = max(1, math.ceil(sum(found.values()) / cap))
+    for shards in range(minimum, max_shards + 1):
+        plan = plan_shards(found, shards, cap, per_page)
+        if not any(shard['over_cap'] for shard in plan):
+            return plan
+    return plan_shards(found, max_shards, cap, per_page)
+
+
+def print_plan(plan: List[Dict], index: Optional[Dict[str, Dict]] = None,
+               found: Optional[Dict[str, int]] = None):
+    """Выводит сводку по шардам и их дисбаланс"""
+    print("\n📦 Шарды:")
+    print("-" * 50)
+    for number, shard in enumerate(plan, 1):
+        flag = " 🚫 больше лимита!" if shard['over_cap'] else ""
+        print(f"{number:2d}. регионов: {len(shard['areas']):3d} | "
+              f"вакансий: {shard['found']:5d} | страниц: {shard['pages']:3d}{flag}")
+        if index and found:
+            biggest = sorted(shard['areas'], key=lambda a: -found.get(a, 0))[:3]
+            names = ', '.join(index.get(a, {}).get('name', a) for a in biggest)
+            print(f"    {names}...")
+
+    pages = [shard['pages'] for shard in plan]
+    if pages and max(pages):
+        print(f"\n⚖️ Дисбаланс: max/min страниц = {max(pages)}/{min(pages)}")
+
+
+def save_plan(plan: List[Dict], query: Dict, filename: str = PLAN_FILE):
+    """Сохраняет план шардов для сборщиков"""
+    output = {
+        'generated': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'query': query,
+        'pagination_cap': PAGINATION_CAP,
+        'per_page': PER_PAGE,
+        'shards': [
+            {'areas': shard['areas'], 'found': shard['found'], 'pages': shard['pages']}
+            for shard in plan
+        ]
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\n✅ План сохранён в {filename}")
+
+
+def load_shard_areas(shard: int, filename: str = PLAN_FILE) -> Optional[List[str]]:
+    """
+    Возвращает список регионов шарда из плана (нумерация с 0)
+
+    Returns:
+        Список id регионов или None, если плана нет или шарда в нём нет
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+        return plan['shards'][shard]['areas']
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+def plan_age_days(filename: str = PLAN_FILE) -> Optional[float]:
+    """Возраст плана в днях по его полю generated или None, если плана нет"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            generated = parse_timestamp(json.load(f).get('generated') or '')
+    except (OSError, ValueError, AttributeError):
+        return None
+    return None if generated is None else (time.time() - generated) / 86400
+
+
+def read_legacy_shards(scripts: List[str] = LEGACY_SHARD_SCRIPTS) -> List[List[str]]:
+    """Достаёт захардкоженные списки 'area' из старых сборщиков"""
+    shards = []
+    for script in scripts:
+        try:
+            with open(script, 'r', encoding='utf-8') as f:
+                source = f.read()
+        except OSError:
+            continue
+        match = re.search(r"'area':\s*\[([^\]]*)\]", source)
+        if match:
+            shards.append(re.findall(r"'(\d+)'", match.group(1)))
+    return shards
+
+
+def check_shards(shards: List[List[str]], found: Dict[str, int], expected: List[str]):
+    """Проверяет полноту, пересечения и баланс заданных списков регионов"""
+    print("\n🔎 Проверка списков регионов:")
+    print("-" * 50)
+    seen = {}
+    for number, areas in enumerate(shards, 1):
+        total = sum(found.get(a, 0) for a in areas)
+        flag = " 🚫 больше лимита!" if total > PAGINATION_CAP else ""
+        print(f"{number:2d}. регионов: {len(areas):3d} | вакансий: {total:5d} | "
+              f"страниц: {math.ceil(total / PER_PAGE):3d}{flag}")
+        for area_id in areas:
+            seen.setdefault(area_id, []).append(number)
+
+    missing = sorted(set(expected) - set(seen), key=int)
+    duplicated = sorted((a for a, where in seen.items() if len(where) > 1), key=int)
+    extra = sorted(set(seen) - set(expected), key=int)
+
+    print(f"\n❓ Не покрыто ни одним шардом: {len(missing)}"
+          f" ({sum(found.get(a, 0) for a in missing)} вакансий)")
+    if missing:
+        print(f"   {', '.join(missing)}")
+    if duplicated:
+        print(f"⚠️ Встречаются в нескольких шардах: {', '.join(duplicated)}")
+    if extra:
+        print(f"⚠️ Не являются регионами {ROOT_AREA}: {', '.join(extra)}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Планировщик шардов по регионам HH.ru")
+    parser.add_argument('--shards', type=int, default=2,
+                        help="количество шардов (0 - подобрать минимальное)")
+    parser.add_argument('--root', default=ROOT_AREA, help="корневой регион (по умолчанию Россия)")
+    parser.add_argument('--exclude', default=','.join(MAIN_WORKFLOW_AREAS),
+                        help="регионы, которые собираются отдельно")
+    parser.add_argument('--output', default=PLAN_FILE, help="файл плана")
+    parser.add_argument('--check', action='store_true',
+                        help="только проверить списки регионов в старых сборщиках")
+    parser.add_argument('--refresh', action='store_true', help="игнорировать кэши")
+    parser.add_argument('--max-age', type=float,
+                        help="не перестраивать план, если он моложе стольких дней")
+    args = parser.parse_args(argv)
+
+    if args.max_age is not None and not args.check:
+        age = plan_age_days(args.output)
+        if age is not None and age < args.max_age:
+            print(f"✅ План {args.output} построен {age:.1f} дн. назад - перестраивать рано")
+            return True
+
+    # Сборщик импортирует этот модуль - ключевые слова берём при запуске
+    from collect_vacancies import SEARCH_KEYWORDS
+    queries = [dict(DEFAULT_QUERY, text=keyword) for keyword in SEARCH_KEYWORDS]
+
+    client = HHClient()
+    cache = FoundCache(ttl=0 if args.refresh else FOUND_CACHE_TTL)
+
+    tree = load_areas_tree(client, force=args.refresh)
+    index = index_areas(tree)
+    if args.root not in index:
+        print(f"❌ Регион {args.root} не найден в дереве /areas")
+        return False
+
+    excluded = {a for a in args.exclude.split(',') if a}
+    regions = [a for a in index[args.root]['children'] if a not in excluded]
+    print(f"🌍 Регионов для раскладки: {len(regions)} (исключено: {len(excluded)})")
+
+    found = probe_found_total(client, regions, queries, cache)
+    print(f"🔢 Запросов к API: {client.requests_made}, из кэша: {cache.hits}")
+
+    if args.check:
+        check_shards(read_legacy_shards(), found, regions)
+        cache.save()
+        return True
+
+    found = split_oversized(found, index, client, queries, cache)
+    cache.save()
+
+    if args.shards > 0:
+        plan = plan_shards(found, args.shards)
+    else:
+        plan = plan_auto(found)
+
+    print_plan(plan, index, found)
+    save_plan(plan, dict(DEFAULT_QUERY, text=SEARCH_KEYWORDS), args.output)
+    return not any(shard['over_cap'] for shard in plan)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бинарный снимок (.vsnap через mmap) против полной загрузки JSON
+
+Для каждого сценария засекается полный путь инструмента: открыть снимок
+и получить ответ. JSON приходится каждый раз разбирать целиком, .vsnap -
+только отобразить и пройти двоичным поиском.
+
+Пример:
+    python benchmarks/binary_snapshot.py                   # синтетический снимок
+    python benchmarks/binary_snapshot.py --count 50000
+    python benchmarks/binary_snapshot.py --file hh_vacancies.json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from binary_snapshot import BinarySnapshot, pack_snapshot  # noqa: E402
+from load_read_api import synthetic_snapshot  # noqa: E402
+from vacancy_fields import parse_timestamp  # noqa: E402
+
+
+def median_ms(action: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def json_lookup(path: str, vacancy_id: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        vacancies = json.load(f)['vacancies']
+    return next((v for v in vacancies if v['id'] == vacancy_id), None)
+
+
+def json_count(path: str, start: float, end: float) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        vacancies = json.load(f)['vacancies']
+    return sum(1 for v in vacancies if start <= (parse_timestamp(v.get('published_at')) or 0) < end)
+
+
+def json_slice(path: str, start: float, end: float, limit: int) -> List:
+    with open(path, 'r', encoding='utf-8') as f:
+        vacancies = json.load(f)['vacancies']
+    dated = [(parse_timestamp(v.get('published_at')) or 0, v) for v in vacancies]
+    matching = [item for item in dated if start <= item[0] < end]
+    matching.sort(key=lambda item: item[0], reverse=True)
+    return [v for _, v in matching[:limit]]
+
+
+def binary_lookup(path: str, vacancy_id: str):
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.get(vacancy_id)
+
+
+def binary_count(path: str, start: float, end: float) -> int:
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.count_range(start, end)
+
+
+def binary_slice(path: str, start: float, end: float, limit: int) -> List:
+    with BinarySnapshot(path) as snapshot:
+        return [v for _, v in zip(range(limit), snapshot.iter_range(start, end))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк .vsnap против json.load")
+    parser.add_argument('--file', help="JSON-снимок (по умолчанию - синтетический)")
+    parser.add_argument('--count', type=int, default=20000, help="вакансий в синтетическом снимке")
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='vsnap-bench-')
+    path = args.file
+    if not path:
+        path = os.path.join(workdir, 'synthetic.json')
+        synthetic_snapshot(path, args.count)
+    binary = os.path.join(workdir, 'snapshot.vsnap')
+
+    started = time.perf_counter()
+    pack_snapshot(path, binary)
+    pack_ms = (time.perf_counter() - started) * 1000
+
+    with open(path, 'r', encoding='utf-8') as f:
+        vacancies = json.load(f)['vacancies']
+    rng = random.Random(1)
+    ids = [v['id'] for v in rng.sample(vacancies, min(len(vacancies), 1000))]
+    stamps = sorted(t for t in (parse_timestamp(v.get('published_at')) for v in vacancies) if t)
+    start, end = stamps[len(stamps) // 2], stamps[len(stamps) * 3 // 4]
+
+    assert json_lookup(path, ids[0]) == binary_lookup(binary, ids[0])
+    assert json_count(path, start, end) == binary_count(binary, start, end)
+
+    print(f"Снимок: {len(vacancies)} вакансий, JSON {os.path.getsize(path) / 1e6:.1f} МБ, "
+          f".vsnap {os.path.getsize(binary) / 1e6:.1f} МБ (упаковка {pack_ms:.0f} мс)\n")
+    rows = [
+        ('вакансия по id', median_ms(lambda: json_lookup(path, ids[0]), args.repeat),
+         median_ms(lambda: binary_lookup(binary, ids[0]), args.repeat)),
+        ('число за период', median_ms(lambda: json_count(path, start, end), args.repeat),
+         median_ms(lambda: binary_count(binary, start, end), args.repeat)),
+        ('20 новых за период', median_ms(lambda: json_slice(path, start, end, 20), args.repeat),
+         median_ms(lambda: binary_slice(binary, start, end, 20), args.repeat)),
+    ]
+    print(f"{'сценарий':22s} {'json.load, мс':>14s} {'.vsnap, мс':>12s} {'ускорение':>10s}")
+    for name, json_ms, binary_ms in rows:
+        print(f"{name:22s} {json_ms:14.2f} {binary_ms:12.3f} {json_ms / binary_ms:9.0f}x")
+
+    # Много поисков в одном открытом снимке
+    with BinarySnapshot(binary) as snapshot:
+        started = time.perf_counter()
+        for vacancy_id in ids:
+            snapshot.get(vacancy_id)
+        per_lookup = (time.perf_counter() - started) / len(ids) * 1e6
+    print(f"\nПоиск по id в открытом .vsnap: {per_lookup:.1f} мкс на запрос")
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
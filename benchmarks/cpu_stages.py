@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Офлайн-стадии сборщика на синтетических данных: элементов в секунду и пик RSS
+
+Страницы из synthetic_hh.py (10k, 100k, 1M элементов) проходят тот же
+путь, что и в collect_vacancies, но без сети:
+    поток по страницам - decode (json_codec.loads), dedup (по id между
+    ключевыми словами), clean_html, format_salary, parse_vacancy;
+    затем по списку вакансий - sort, near_duplicates, skills, statistics,
+    snapshot_json (canonical_bytes) и стадии экспорта (views, geo,
+    suggest, facets, columns).
+Время каждой стадии считается отдельно. Пик RSS сбрасывается перед
+стадией (/proc/self/clear_refs в Linux), так что это пик именно стадии;
+у потоковых стадий он общий на весь поток. Без /proc - максимум за процесс.
+
+С --json результат дописывается строкой JSON (время, коммит, бэкенд JSON,
+размер, стадии) - удобно копить историю и сравнивать между коммитами.
+Несколько --size запускаются по очереди в отдельных процессах.
+
+Пример:
+    python benchmarks/cpu_stages.py --size 10k
+    python benchmarks/cpu_stages.py --size 10k --size 100k --json bench.jsonl
+    python benchmarks/cpu_stages.py --size 1m --skip near_duplicates
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+# Кэш подписей почти-дублей и прочее - во временный каталог, не в .cache репозитория
+os.environ.setdefault('VACANCY_CACHE_DIR', tempfile.mkdtemp(prefix='cpu_stages_'))
+
+import json_codec  # noqa: E402
+from collect_vacancies import clean_html, format_salary, parse_vacancy, snapshot_statistics  # noqa: E402
+from near_duplicates import mark_near_duplicates  # noqa: E402
+from skill_tagger import tag_vacancies  # noqa: E402
+from snapshot_writer import EXPORT_STAGES, sort_vacancies  # noqa: E402
+from synthetic_hh import parse_size, synthetic_pages  # noqa: E402
+
+try:
+    from columnar_export import build_columns, np
+except ImportError:
+    np = None
+
+STREAM_STAGES = ('decode', 'dedup', 'clean_html', 'format_salary', 'parse_vacancy')
+
+
+def reset_peak():
+    """Сбрасывает пик RSS процесса (Linux); иначе пик остаётся общим"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    try:
+        with open('/proc/self/status') as f:
+            return int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def stage_row(name: str, items: int, seconds: float, peak: float) -> Dict:
+    return {'stage': name, 'items': items, 'seconds': round(seconds, 4),
+            'items_per_sec': round(items / seconds) if seconds else None, 'peak_rss_mb': round(peak, 1)}
+
+
+def run_stream(total: int, seed: int) -> tuple:
+    """Потоковые стадии: страницы генерируются и кодируются вне замера"""
+    timers = dict.fromkeys(STREAM_STAGES, 0.0)
+    counts = dict.fromkeys(STREAM_STAGES, 0)
+    seen = set()
+    vacancies: List[Dict] = []
+    reset_peak()
+    clock = time.perf_counter
+    for page in synthetic_pages(total, seed):
+        body = json_codec.dumps(page)
+
+        started = clock()
+        items = json_codec.loads(body)['items']
+        timers['decode'] += clock() - started
+        counts['decode'] += len(items)
+
+        started = clock()
+        fresh = []
+        for item in items:
+            vacancy_id = item.get('id')
+            if vacancy_id and vacancy_id not in seen:
+                seen.add(vacancy_id)
+                fresh.append(item)
+        timers['dedup'] += clock() - started
+        counts['dedup'] += len(items)
+
+        started = clock()
+        for item in fresh:
+            snippet = item.get('snippet') or {}
+            clean_html(snippet.get('requirement') or '')
+            clean_html(snippet.get('responsibility') or '')
+        timers['clean_html'] += clock() - started
+
+        started = clock()
+        for item in fresh:
+            format_salary(item.get('salary'))
+        timers['format_salary'] += clock() - started
+
+        started = clock()
+        vacancies.extend(parse_vacancy(item) for item in fresh)
+        timers['parse_vacancy'] += clock() - started
+        for name in ('clean_html', 'format_salary', 'parse_vacancy'):
+            counts[name] += len(fresh)
+
+    peak = peak_rss_mb()
+    return vacancies, [stage_row(name, counts[name], timers[name], peak) for name in STREAM_STAGES]
+
+
+def timed_stage(name: str, items: int, action: Callable[[], object]) -> Dict:
+    reset_peak()
+    started = time.perf_counter()
+    action()
+    return stage_row(name, items, time.perf_counter() - started, peak_rss_mb())
+
+
+def run_batch(vacancies: List[Dict], skip: List[str]) -> List[Dict]:
+    """Стадии по готовому списку вакансий, в порядке save_vacancies / write_snapshot"""
+    state = {'vacancies': vacancies}
+    stages = [
+        ('sort', lambda: state.update(vacancies=sort_vacancies(state['vacancies']))),
+        ('near_duplicates', lambda: mark_near_duplicates(state['vacancies'])),
+        ('skills', lambda: tag_vacancies(state['vacancies'])),
+        ('statistics', lambda: state.update(stats=snapshot_statistics(state['vacancies']))),
+        ('snapshot_json', lambda: json_codec.canonical_bytes(
+            {'source': 'hh.ru', 'statistics': state['stats'], 'vacancies': state['vacancies']})),
+    ]
+    stages += [(f'export_{kind}', lambda build=build: build(state['vacancies'])) for kind, build in EXPORT_STAGES.items()]
+    if np is not None:
+        stages.append(('export_columns', lambda: build_columns(state['vacancies'])))
+
+    rows = []
+    for name, action in stages:
+        if name in skip:
+            continue
+        rows.append(timed_stage(name, len(state['vacancies']), action))
+    return rows
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(size: str, seed: int, skip: List[str]) -> Dict:
+    total = parse_size(size)
+    vacancies, rows = run_stream(total, seed)
+    rows += run_batch(vacancies, skip)
+    return {
+        'timestamp': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'json_backend': json_codec.BACKEND,
+        'size': total,
+        'unique': len(vacancies),
+        'stages': rows
+    }
+
+
+def print_report(result: Dict):
+    print(f"\nЭлементов: {result['size']}, уникальных вакансий: {result['unique']}, "
+          f"JSON: {result['json_backend']}, коммит {result['commit']}")
+    print(f"{'стадия':18s} {'элементов':>10s} {'сек':>9s} {'эл./сек':>11s} {'пик RSS, МБ':>12s}")
+    for row in result['stages']:
+        rate = f"{row['items_per_sec']:,}".replace(',', ' ') if row['items_per_sec'] else '—'
+        print(f"{row['stage']:18s} {row['items']:10d} {row['seconds']:9.3f} {rate:>11s} {row['peak_rss_mb']:12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк офлайн-стадий сборщика")
+    parser.add_argument('--size', action='append', help="элементов выдачи: 10k, 100k, 1m или число (можно несколько)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip', action='append', default=[], help="пропустить стадию (например, near_duplicates)")
+    parser.add_argument('--json', metavar='FILE', help="дописать результат строкой JSON ('-' - в stdout)")
+    args = parser.parse_args()
+    sizes = args.size or ['10k']
+
+    if len(sizes) > 1:
+        # Каждый размер - в своём процессе, чтобы пики RSS не смешивались
+        for size in sizes:
+            command = [sys.executable, os.path.abspath(__file__), '--size', size, '--seed', str(args.seed)]
+            command += [part for name in args.skip for part in ('--skip', name)]
+            command += ['--json', args.json] if args.json else []
+            subprocess.run(command, check=True)
+        return
+
+    if args.json == '-':
+        # В stdout - только JSON, сообщения стадий уходят в stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_size(sizes[0], args.seed, args.skip)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    result = run_size(sizes[0], args.seed, args.skip)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        print(f"\n💾 {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Время запуска команд CLI
+
+Запускает каждую команду несколько раз отдельным процессом и печатает
+медиану, а также проверяет, что быстрые команды не импортируют requests.
+
+Пример:
+    python benchmarks/import_time.py --runs 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Команды, которые должны стартовать быстро
+FAST_COMMANDS = [
+    ['--help'],
+    ['status'],
+    ['diagnose', '--dry-run']
+]
+
+
+def median_time(command, runs: int) -> float:
+    """Медиана времени выполнения процесса, секунд"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def imported_modules(args) -> set:
+    """Модули верхнего уровня, импортированные командой (по -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime',
+                             os.path.join(REPO_ROOT, 'vacancy_cli.py'), *args],
+                            cwd=REPO_ROOT, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip().split('.')[0])
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска команд CLI")
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = median_time([sys.executable, '-c', 'pass'], args.runs)
+    print(f"Пустой интерпретатор: {baseline * 1000:.0f} мс")
+
+    ok = True
+    for command in FAST_COMMANDS:
+        median = median_time([sys.executable, os.path.join(REPO_ROOT, 'vacancy_cli.py'), *command],
+                             args.runs)
+        heavy = imported_modules(command) & {'requests', 'urllib3', 'numpy'}
+        flag = f" ⚠️ импортирует {', '.join(sorted(heavy))}" if heavy else ""
+        ok = ok and not heavy
+        print(f"{' '.join(command):22s} {median * 1000:6.0f} мс (+{(median - baseline) * 1000:.0f} мс){flag}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
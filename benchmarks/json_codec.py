@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Кодек JSON: разбор страниц API и запись снимка, orjson против json
+
+Страницы - синтетические, в формате ответа /vacancies HH (100 вакансий с
+работодателем, зарплатой, сниппетами и ролями). Разбор сравнивается с
+тем, что делал requests: response.json() = декодирование в str + json.loads.
+Запись - канонический снимок (отступ 2, sort_keys) из разобранных вакансий.
+Перед замерами проверяется, что оба бэкенда дают одинаковые байты.
+
+Пример:
+    python benchmarks/json_codec.py
+    python benchmarks/json_codec.py --pages 50 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import json_codec  # noqa: E402
+from collect_vacancies import parse_vacancy  # noqa: E402
+
+WORDS = ('администрирование серверов linux windows сетей active directory резервное копирование '
+         'мониторинг zabbix виртуализация vmware hyper-v поддержка пользователей 1С docker '
+         'опыт работы от года знание принципов построения <highlighttext>системный</highlighttext> '
+         'администратор ответственность обучаемость').split()
+
+
+def synthetic_item(rng: random.Random, number: int) -> Dict:
+    salary = None
+    if rng.random() < 0.6:
+        low = rng.randrange(40, 250) * 1000
+        salary = {'from': low, 'to': low + rng.randrange(0, 100) * 1000 if rng.random() < 0.5 else None,
+                  'currency': 'RUR', 'gross': rng.random() < 0.3}
+    return {
+        'id': str(90000000 + number),
+        'premium': False,
+        'name': f"Системный администратор {rng.choice(WORDS)}",
+        'department': None,
+        'has_test': rng.random() < 0.1,
+        'response_letter_required': False,
+        'area': {'id': str(rng.randrange(1, 2000)), 'name': rng.choice(['Москва', 'Санкт-Петербург', 'Казань']),
+                 'url': 'https://api.hh.ru/areas/1'},
+        'salary': salary,
+        'type': {'id': 'open', 'name': 'Открытая'},
+        'address': {'city': 'Москва', 'street': 'Ленинградский проспект', 'building': '39с79',
+                    'lat': round(rng.uniform(55.5, 56.0), 6), 'lng': round(rng.uniform(37.3, 37.9), 6),
+                    'metro_stations': []},
+        'published_at': f"2026-10-{rng.randrange(1, 19):02d}T{rng.randrange(24):02d}:00:00+0300",
+        'created_at': '2026-10-01T10:00:00+0300',
+        'archived': False,
+        'apply_alternate_url': f"https://hh.ru/applicant/vacancy_response?vacancyId={90000000 + number}",
+        'url': f"https://api.hh.ru/vacancies/{90000000 + number}?host=hh.ru",
+        'alternate_url': f"https://hh.ru/vacancy/{90000000 + number}",
+        'employer': {'id': str(rng.randrange(1, 50000)), 'name': f"ООО «Компания {rng.randrange(3000)}»",
+                     'url': 'https://api.hh.ru/employers/1', 'alternate_url': 'https://hh.ru/employer/1',
+                     'logo_urls': {'original': 'https://img.hhcdn.ru/employer-logo-original/1.png',
+                                   '90': 'https://img.hhcdn.ru/employer-logo/1.png'},
+                     'trusted': True},
+        'snippet': {'requirement': ' '.join(rng.choice(WORDS) for _ in range(25)),
+                    'responsibility': ' '.join(rng.choice(WORDS) for _ in range(20))},
+        'schedule': {'id': 'remote', 'name': 'Удаленная работа'},
+        'working_days': [], 'working_time_intervals': [], 'working_time_modes': [],
+        'accept_temporary': False,
+        'professional_roles': [{'id': '113', 'name': 'Системный администратор'}],
+        'experience': {'id': 'between1And3', 'name': 'От 1 года до 3 лет'},
+        'employment': {'id': 'full', 'name': 'Полная занятость'}
+    }
+
+
+def synthetic_pages(count: int) -> List[bytes]:
+    rng = random.Random(7)
+    pages = []
+    for page in range(count):
+        items = [synthetic_item(rng, page * 100 + i) for i in range(100)]
+        body = {'items': items, 'found': count * 100, 'pages': count, 'page': page, 'per_page': 100}
+        pages.append(json.dumps(body, ensure_ascii=False).encode('utf-8'))
+    return pages
+
+
+def median_ms(action: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def stdlib_canonical(payload: Dict) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False, indent=2, sort_keys=True) + '\n').encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк json_codec против json")
+    parser.add_argument('--pages', type=int, default=40, help="страниц по 100 вакансий")
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.pages)
+    vacancies = [parse_vacancy(item) for page in pages for item in json.loads(page)['items']]
+    snapshot = {'source': 'hh.ru', 'statistics': {'total': len(vacancies)}, 'vacancies': vacancies}
+
+    print(f"Бэкенд json_codec: {json_codec.BACKEND}")
+    print(f"Страниц: {len(pages)} ({sum(map(len, pages)) / 1e6:.1f} МБ), "
+          f"вакансий в снимке: {len(vacancies)}\n")
+
+    canonical = json_codec.canonical_bytes(snapshot)
+    assert canonical == stdlib_canonical(snapshot), "вывод бэкендов различается"
+    assert all(json_codec.loads(page) == json.loads(page) for page in pages[:3])
+
+    rows = [
+        ('разбор страниц', median_ms(lambda: [json.loads(page.decode('utf-8')) for page in pages], args.repeat),
+         median_ms(lambda: [json_codec.loads(page) for page in pages], args.repeat)),
+        ('запись снимка', median_ms(lambda: stdlib_canonical(snapshot), args.repeat),
+         median_ms(lambda: json_codec.canonical_bytes(snapshot), args.repeat)),
+    ]
+    print(f"{'операция':16s} {'json, мс':>10s} {json_codec.BACKEND + ', мс':>12s} {'ускорение':>10s}")
+    for name, stdlib_ms, codec_ms in rows:
+        print(f"{name:16s} {stdlib_ms:10.1f} {codec_ms:12.1f} {stdlib_ms / codec_ms:9.1f}x")
+    print(f"\nСнимок {len(canonical) / 1e6:.1f} МБ, байты совпадают с json.dumps(indent=2, sort_keys=True)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нагрузочный тест API чтения (read_api.py)
+
+Поднимает сервер отдельным процессом (один поток asyncio, то есть одно
+ядро), гоняет смесь типичных запросов с нескольких keep-alive
+соединений и печатает задержки p50/p95/p99 и RPS.
+
+Пример:
+    python benchmarks/load_read_api.py                      # синтетический снимок
+    python benchmarks/load_read_api.py --files hh_vacancies.json --requests 50000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+from urllib.parse import urlencode
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AREAS = ['Москва', 'Санкт-Петербург', 'Новосибирск', 'Екатеринбург', 'Казань']
+EXPERIENCE = ['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет', 'Более 6 лет']
+WORDS = ['linux', 'windows', 'сетевой', 'ведущий', 'старший', 'devops', 'helpdesk']
+
+
+def synthetic_snapshot(path: str, count: int):
+    """Снимок в формате collect_vacancies со случайными вакансиями"""
+    rng = random.Random(42)
+    vacancies = []
+    for i in range(count):
+        salary = None
+        if rng.random() < 0.6:
+            low = rng.randrange(40, 300) * 1000
+            salary = {'from': low, 'to': low + rng.randrange(0, 100) * 1000,
+                      'currency': 'RUR', 'gross': False}
+        vacancies.append({
+            'id': str(10_000_000 + i),
+            'name': f"Системный администратор {rng.choice(WORDS)}",
+            'company': f"Компания {rng.randrange(count // 5 + 1)}",
+            'area': rng.choice(AREAS),
+            'experience': rng.choice(EXPERIENCE),
+            'salary_raw': salary,
+            'published_at': f"2026-10-{rng.randrange(1, 29):02d}T{rng.randrange(24):02d}:00:00+0300"
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'vacancies': vacancies}, f, ensure_ascii=False)
+
+
+def random_query(rng: random.Random) -> str:
+    """Случайная комбинация фильтров, как у фронтенда"""
+    params = {}
+    if rng.random() < 0.5:
+        params['area'] = rng.choice(AREAS)
+    if rng.random() < 0.3:
+        params['experience'] = rng.choice(EXPERIENCE)
+    if rng.random() < 0.3:
+        params['salary_min'] = rng.choice([50000, 100000, 150000, 200000])
+    if rng.random() < 0.3:
+        params['q'] = rng.choice(WORDS)
+    if rng.random() < 0.3:
+        params['sort'] = 'salary'
+    params['page'] = rng.randrange(5)
+    return '/vacancies?' + urlencode(params)
+
+
+async def client_worker(port: int, targets: List[str], latencies: List[float]):
+    """Одно keep-alive соединение, запросы по очереди"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for target in targets:
+        started = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n"
+                     f"Accept-Encoding: gzip\r\n\r\n".encode('utf-8'))
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b'\r\n':
+                break
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - started)
+    writer.close()
+
+
+async def run_load(port: int, total: int, concurrency: int) -> List[float]:
+    rng = random.Random(7)
+    targets = [random_query(rng) for _ in range(total)]
+    latencies: List[float] = []
+    chunks = [targets[i::concurrency] for i in range(concurrency)]
+    await asyncio.gather(*(client_worker(port, chunk, latencies) for chunk in chunks))
+    return latencies
+
+
+def wait_ready(port: int, timeout: float = 30):
+    """Ждёт, пока сервер начнёт принимать соединения"""
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Сервер не запустился")
+
+
+def percentile(sorted_values: List[float], share: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(share * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест read_api.py")
+    parser.add_argument('--files', nargs='+', help="снимки (по умолчанию синтетический)")
+    parser.add_argument('--vacancies', type=int, default=5000, help="размер синтетического снимка")
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8091)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = args.files
+        if not files:
+            files = [os.path.join(tmp, 'synthetic.json')]
+            synthetic_snapshot(files[0], args.vacancies)
+            print(f"🧪 Синтетический снимок: {args.vacancies} вакансий")
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, 'read_api.py'),
+             '--port', str(args.port), '--files', *files],
+            cwd=REPO_ROOT, stdout=subprocess.DEVNULL)
+        try:
+            wait_ready(args.port)
+            # Прогрев: первые ответы попадают в кэш сервера
+            asyncio.run(run_load(args.port, min(1000, args.requests), 1))
+
+            started = time.perf_counter()
+            latencies = asyncio.run(run_load(args.port, args.requests, args.concurrency))
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    print(f"📊 Запросов: {len(latencies)}, соединений: {args.concurrency}")
+    print(f"   RPS: {len(latencies) / elapsed:.0f}")
+    for name, share in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+        print(f"   {name}: {percentile(latencies, share) * 1000:.2f} мс")
+    print(f"   max: {latencies[-1] * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
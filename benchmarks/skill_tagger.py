@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Теги навыков: автомат Ахо-Корасик против цикла re.search по шаблонам
+
+Тексты - синтетические сниппеты из слов словаря и обычной лексики
+вакансий. Сначала проверяется, что оба способа находят одни и те же
+навыки, затем замеряется время на штатном словаре и на словаре,
+раздутом синтетическими навыками: у автомата время почти не меняется,
+у регулярных выражений растёт вместе с числом шаблонов.
+
+Пример:
+    python benchmarks/skill_tagger.py
+    python benchmarks/skill_tagger.py --texts 5000 --extra 1000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Set
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from skill_tagger import SKILLS, SkillMatcher, normalize  # noqa: E402
+
+FILLER = ('администрирование опыт работы поддержка пользователей сетей знание принципов '
+          'построения admin sanitize ответственность обучаемость , . ; / -').split()
+
+
+def regex_tagger(skills: Dict[str, List[str]]):
+    patterns = {name: [re.compile(r'(?<![^\W_])' + re.escape(normalize(alias)) + r'(?![^\W_])')
+                       for alias in {name, *aliases}]
+                for name, aliases in skills.items()}
+
+    def find(text: str) -> Set[str]:
+        text = normalize(text)
+        return {name for name, compiled in patterns.items() if any(p.search(text) for p in compiled)}
+    return find
+
+
+def timed(find, texts: List[str]) -> float:
+    started = time.perf_counter()
+    for text in texts:
+        find(text)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк skill_tagger против re.search")
+    parser.add_argument('--texts', type=int, default=3000, help="число сниппетов")
+    parser.add_argument('--words', type=int, default=60, help="слов в сниппете")
+    parser.add_argument('--extra', type=int, default=500, help="синтетических навыков в раздутом словаре")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    vocabulary = [word for aliases in SKILLS.values() for alias in aliases for word in alias.split()] + FILLER * 5
+    texts = [' '.join(rng.choice(vocabulary) for _ in range(args.words)) for _ in range(args.texts)]
+    inflated = dict(SKILLS, **{f'Навык {i}': [f'tool{i}', f'инструмент {i}'] for i in range(args.extra)})
+
+    print(f"Сниппетов: {args.texts} по {args.words} слов\n")
+    print(f"{'словарь':22s} {'re.search, с':>13s} {'автомат, с':>11s} {'ускорение':>10s}")
+    for label, skills in (('штатный', SKILLS), (f'+{args.extra} навыков', inflated)):
+        matcher, regex = SkillMatcher(skills), regex_tagger(skills)
+        assert all(matcher.find(text) == regex(text) for text in texts[:300]), "результаты различаются"
+        regex_s, matcher_s = timed(regex, texts), timed(matcher.find, texts)
+        print(f"{label:22s} {regex_s:13.2f} {matcher_s:11.2f} {regex_s / matcher_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
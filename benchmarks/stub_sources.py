@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальные стабы API площадок для проверки sources.py без сети
+
+Поднимает три сервера (HH, Trudvsem, SuperJob) с синтетическими
+вакансиями в формате каждой площадки. Часть вакансий повторяется между
+площадками (тот же URL или то же название и компания), чтобы было видно
+дедупликацию.
+
+Пример:
+    python benchmarks/stub_sources.py --port 8901 &
+    HH_API_URL=http://127.0.0.1:8901 TRUDVSEM_API_URL=http://127.0.0.1:8902 \\
+    SUPERJOB_API_URL=http://127.0.0.1:8903 SUPERJOB_API_KEY=stub \\
+        python sources.py --query-mode per-keyword --output /tmp/all.json
+"""
+
+import argparse
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+COMPANIES = ['Ромашка', 'Вектор', 'Сигма', 'ТехноСервис', 'Альфа-Софт']
+TITLES = ['Системный администратор', 'Сисадмин Linux', 'System administrator', 'Ведущий сисадмин']
+CITIES = ['Москва', 'Санкт-Петербург', 'Казань']
+
+
+def synthetic_jobs(count: int, seed: int = 7) -> List[Dict]:
+    """Общий пул вакансий; каждая площадка отдаёт свой срез пула"""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        low = rng.randrange(50, 250) * 1000
+        jobs.append({
+            'id': str(100000 + i),
+            'title': f"{rng.choice(TITLES)} {i}",
+            'company': rng.choice(COMPANIES),
+            'city': rng.choice(CITIES),
+            'salary': (low, low + 50000) if rng.random() < 0.6 else (None, None),
+            'day': rng.randrange(1, 29)
+        })
+    return jobs
+
+
+def hh_page(jobs: List[Dict], query: Dict) -> Dict:
+    per_page, page = int(query.get('per_page', ['20'])[0]), int(query.get('page', ['0'])[0])
+    chunk = jobs[page * per_page:(page + 1) * per_page]
+    items = [{
+        'id': job['id'],
+        'name': job['title'],
+        'employer': {'id': job['company'], 'name': job['company']},
+        'alternate_url': f"https://hh.ru/vacancy/{job['id']}",
+        'published_at': f"2026-10-{job['day']:02d}T10:00:00+0300",
+        'area': {'name': job['city']},
+        'salary': {'from': job['salary'][0], 'to': job['salary'][1], 'currency': 'RUR',
+                   'gross': False} if job['salary'][0] else None,
+        'snippet': {'requirement': 'Linux, <highlighttext>сети</highlighttext>'}
+    } for job in chunk]
+    return {'found': len(jobs), 'pages': -(-len(jobs) // per_page), 'items': items}
+
+
+def trudvsem_page(jobs: List[Dict], query: Dict) -> Dict:
+    limit, offset = int(query.get('limit', ['100'])[0]), int(query.get('offset', ['0'])[0])
+    chunk = jobs[offset * limit:(offset + 1) * limit]
+    vacancies = [{'vacancy': {
+        'id': f"tv-{job['id']}",
+        'job-name': job['title'],
+        'company': {'name': job['company'], 'companycode': job['company']},
+        'region': {'name': job['city']},
+        'vac_url': f"https://trudvsem.ru/vacancy/card/{job['id']}",
+        'creation-date': f"2026-10-{job['day']:02d}",
+        'salary_min': job['salary'][0] or 0,
+        'salary_max': job['salary'][1] or 0,
+        'duty': '<p>Поддержка серверов</p>',
+        'requirement': {'experience': 1, 'qualification': 'Windows Server'}
+    }} for job in chunk]
+    return {'status': '200', 'meta': {'total': len(jobs), 'limit': limit},
+            'results': {'vacancies': vacancies}}
+
+
+def superjob_page(jobs: List[Dict], query: Dict) -> Dict:
+    count, page = int(query.get('count', ['20'])[0]), int(query.get('page', ['0'])[0])
+    chunk = jobs[page * count:(page + 1) * count]
+    objects = [{
+        'id': int(job['id']),
+        'profession': job['title'],
+        'firm_name': job['company'],
+        'link': f"https://www.superjob.ru/vakansii/{job['id']}.html",
+        'town': {'title': job['city']},
+        'payment_from': job['salary'][0] or 0,
+        'payment_to': job['salary'][1] or 0,
+        'date_published': 1790000000 + job['day'] * 86400,
+        'candidat': 'Опыт администрирования'
+    } for job in chunk]
+    return {'objects': objects, 'total': len(jobs), 'more': (page + 1) * count < len(jobs)}
+
+
+def serve(port: int, path: str, render: Callable[[List[Dict], Dict], Dict], jobs: List[Dict]):
+    """Сервер одной площадки в фоновом потоке"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip('/') == path.rstrip('/'):
+                code, body = 200, render(jobs, parse_qs(url.query))
+            else:
+                code, body = 404, {'error': 'not found'}
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стабы API HH, Trudvsem и SuperJob")
+    parser.add_argument('--port', type=int, default=8901, help="порт HH; следующие два - Trudvsem и SuperJob")
+    parser.add_argument('--count', type=int, default=450, help="вакансий в общем пуле")
+    args = parser.parse_args()
+
+    pool = synthetic_jobs(args.count)
+    third = args.count // 3
+    # HH - первые две трети пула, Trudvsem - с середины (пересечение по названию
+    # и компании), SuperJob - последняя треть и немного HH
+    serve(args.port, '/vacancies', hh_page, pool[:2 * third])
+    serve(args.port + 1, '/vacancies', trudvsem_page, pool[third:])
+    serve(args.port + 2, '/vacancies/', superjob_page, pool[2 * third:] + pool[:20])
+    print(f"HH: {args.port}, Trudvsem: {args.port + 1}, SuperJob: {args.port + 2}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
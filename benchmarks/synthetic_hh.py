@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Синтетические страницы /vacancies HH любого размера (10k, 100k, 1M вакансий)
+
+Реальные запуски - несколько тысяч вакансий, и время в них съедает сеть;
+чтобы мерить офлайн-стадии на больших объёмах, нужны данные той же формы,
+что отдаёт HH, со всеми неудобными случаями:
+    - employer = null и работодатели без логотипа;
+    - salary = null, вилки только с from или только с to, gross,
+      валюты RUR, USD, EUR, KZT, BYR;
+    - сниппеты с HTML (<highlighttext>, <strong>, <br />, &quot;, &nbsp;)
+      и сниппеты = null;
+    - address = null или с координатами рядом с городом;
+    - одни и те же вакансии в выдаче разных ключевых слов (дубли id);
+    - переизданные вакансии: тот же текст и компания под новым id.
+Страницы генерируются лениво, память не растёт с размером.
+
+Пример:
+    python benchmarks/synthetic_hh.py --size 100k --output /tmp/hh_pages
+"""
+
+import argparse
+import json
+import os
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+KEYWORDS = ('системный администратор', 'сисадмин', 'system administrator')
+
+PER_PAGE = 100
+
+# Доля выдачи второго и следующих ключевых слов, уже встречавшаяся раньше
+DUPLICATE_SHARE = 0.2
+# Доля переизданных вакансий
+REPOST_SHARE = 0.05
+
+MSK = timezone(timedelta(hours=3))
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=MSK)
+
+AREAS = [  # (id, название, широта, долгота, вес)
+    ('1', 'Москва', 55.75, 37.62, 35), ('2', 'Санкт-Петербург', 59.94, 30.31, 15),
+    ('88', 'Казань', 55.79, 49.12, 5), ('4', 'Новосибирск', 55.03, 82.92, 5),
+    ('3', 'Екатеринбург', 56.84, 60.61, 5), ('66', 'Нижний Новгород', 56.33, 44.0, 4),
+    ('104', 'Челябинск', 55.16, 61.4, 3), ('76', 'Ростов-на-Дону', 47.23, 39.72, 3),
+    ('160', 'Алматы', 43.24, 76.89, 3), ('1002', 'Минск', 53.9, 27.56, 2),
+    ('113', 'Россия', 61.52, 105.32, 20),
+]
+AREA_WEIGHTS = [area[4] for area in AREAS]
+
+CURRENCIES = [('RUR', 1, 85), ('USD', 0.011, 6), ('EUR', 0.01, 3), ('KZT', 5.2, 4), ('BYR', 0.036, 2)]
+CURRENCY_WEIGHTS = [currency[2] for currency in CURRENCIES]
+
+TITLES = ('Системный администратор', 'Системный администратор Linux', 'Сисадмин', 'System administrator',
+          'Ведущий системный администратор', 'Системный администратор Windows', 'DevOps / системный администратор',
+          'Системный администратор (удалённо)', 'Младший системный администратор', 'Инженер-администратор')
+COMPANY_WORDS = ('Техно', 'Софт', 'Инфо', 'Сеть', 'Ком', 'Сервис', 'Альфа', 'Град', 'Лаб', 'Систем', 'Ёлка', 'Net')
+LEGAL_FORMS = ('ООО', 'АО', 'ПАО', 'ИП', '')
+PHRASES = ('администрирование серверов Linux и Windows', 'поддержка <highlighttext>пользователей</highlighttext>',
+           'настройка Active Directory, DNS, DHCP', 'виртуализация VMware и Hyper-V', 'мониторинг Zabbix',
+           'резервное копирование Veeam', 'сети Cisco, MikroTik', 'обслуживание 1С', 'опыт работы от&nbsp;2 лет',
+           'знание &quot;ITIL&quot; приветствуется', 'Docker, Ansible, <strong>Git</strong>', 'английский B1',
+           '<highlighttext>Системный</highlighttext> <highlighttext>администратор</highlighttext>',
+           'ответственность &amp; обучаемость', 'работа с СХД и RAID<br />')
+ROLES = (('113', 'Системный администратор'), ('160', 'DevOps-инженер'), ('112', 'Сетевой инженер'),
+         ('121', 'Специалист технической поддержки'))
+EXPERIENCE = (('noExperience', 'Нет опыта'), ('between1And3', 'От 1 года до 3 лет'),
+              ('between3And6', 'От 3 до 6 лет'), ('moreThan6', 'Более 6 лет'))
+SCHEDULES = (('remote', 'Удаленная работа'), ('fullDay', 'Полный день'), ('flexible', 'Гибкий график'))
+EMPLOYMENT = (('full', 'Полная занятость'), ('part', 'Частичная занятость'), ('project', 'Проектная работа'))
+
+
+def parse_size(text: str) -> int:
+    """'10k', '1m' или число"""
+    return SIZES.get(text.lower()) or int(text.lower().replace('k', '000').replace('m', '000000'))
+
+
+def _snippet(rng: random.Random) -> Optional[str]:
+    if rng.random() < 0.05:
+        return None
+    return '. '.join(rng.choice(PHRASES) for _ in range(rng.randrange(2, 6))) + '...'
+
+
+def _salary(rng: random.Random) -> Optional[Dict]:
+    if rng.random() < 0.45:
+        return None
+    currency, rate, _ = rng.choices(CURRENCIES, CURRENCY_WEIGHTS)[0]
+    low = round(rng.randrange(35, 300) * 1000 * rate, -1) or None
+    high = round(low * rng.uniform(1.1, 1.8), -1) if low else None
+    shape = rng.random()
+    if shape < 0.3:
+        high = None
+    elif shape < 0.45:
+        low = None
+    return {'from': int(low) if low else None, 'to': int(high) if high else None,
+            'currency': currency, 'gross': rng.random() < 0.3}
+
+
+def _employer(rng: random.Random, companies: int) -> Optional[Dict]:
+    if rng.random() < 0.03:
+        return None
+    number = int(rng.paretovariate(1.2)) % companies
+    words = random.Random(number)
+    name = f"{words.choice(COMPANY_WORDS)}{words.choice(COMPANY_WORDS).lower()} {number}"
+    form = words.choice(LEGAL_FORMS)
+    logo = None if words.random() < 0.2 else {
+        'original': f'https://img.hhcdn.ru/employer-logo-original/{number}.png',
+        '90': f'https://img.hhcdn.ru/employer-logo/{number}.png'}
+    return {'id': str(10000 + number), 'name': f"{form} «{name}»" if form else name,
+            'url': f'https://api.hh.ru/employers/{10000 + number}',
+            'alternate_url': f'https://hh.ru/employer/{10000 + number}', 'logo_urls': logo,
+            'vacancies_url': f'https://api.hh.ru/vacancies?employer_id={10000 + number}', 'trusted': True}
+
+
+def synthetic_item(rng: random.Random, number: int, companies: int = 20000) -> Dict:
+    """Элемент items выдачи /vacancies"""
+    vacancy_id = str(80000000 + number)
+    area_id, area_name, lat, lng, _ = rng.choices(AREAS, AREA_WEIGHTS)[0]
+    published = NOW - timedelta(seconds=rng.randrange(30 * 86400))
+    address = None if rng.random() < 0.4 else {
+        'city': area_name, 'street': 'улица Ленина', 'building': str(rng.randrange(1, 200)),
+        'lat': round(lat + rng.gauss(0, 0.08), 6), 'lng': round(lng + rng.gauss(0, 0.12), 6),
+        'metro_stations': []}
+    role = rng.choice(ROLES)
+    experience, schedule, employment = rng.choice(EXPERIENCE), rng.choice(SCHEDULES), rng.choice(EMPLOYMENT)
+    return {
+        'id': vacancy_id,
+        'premium': rng.random() < 0.03,
+        'name': rng.choice(TITLES),
+        'department': None,
+        'has_test': rng.random() < 0.08,
+        'response_letter_required': False,
+        'area': {'id': area_id, 'name': area_name, 'url': f'https://api.hh.ru/areas/{area_id}'},
+        'salary': _salary(rng),
+        'type': {'id': 'open', 'name': 'Открытая'},
+        'address': address,
+        'published_at': published.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+        'created_at': published.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+        'archived': False,
+        'apply_alternate_url': f'https://hh.ru/applicant/vacancy_response?vacancyId={vacancy_id}',
+        'url': f'https://api.hh.ru/vacancies/{vacancy_id}?host=hh.ru',
+        'alternate_url': f'https://hh.ru/vacancy/{vacancy_id}',
+        'employer': _employer(rng, companies),
+        'snippet': {'requirement': _snippet(rng), 'responsibility': _snippet(rng)},
+        'schedule': {'id': schedule[0], 'name': schedule[1]},
+        'working_days': [], 'working_time_intervals': [], 'working_time_modes': [],
+        'accept_temporary': rng.random() < 0.05,
+        'professional_roles': [{'id': role[0], 'name': role[1]}],
+        'experience': {'id': experience[0], 'name': experience[1]},
+        'employment': {'id': employment[0], 'name': employment[1]},
+    }
+
+
+def synthetic_pages(total: int, seed: int = 1, per_page: int = PER_PAGE) -> Iterator[Dict]:
+    """
+    Тела ответов /vacancies с total элементами на все ключевые слова
+
+    Выдача делится между KEYWORDS; у второго и следующих слов доля
+    DUPLICATE_SHARE - вакансии, уже отданные раньше.
+    """
+    rng = random.Random(seed)
+    recent: deque = deque(maxlen=5000)
+    number = 0
+    per_keyword = -(-total // len(KEYWORDS))
+    for keyword_index, keyword in enumerate(KEYWORDS):
+        count = min(per_keyword, total - keyword_index * per_keyword)
+        pages = -(-count // per_page)
+        for page in range(pages):
+            items = []
+            for _ in range(min(per_page, count - page * per_page)):
+                if keyword_index and recent and rng.random() < DUPLICATE_SHARE:
+                    items.append(rng.choice(recent))
+                    continue
+                number += 1
+                item = synthetic_item(rng, number)
+                if recent and rng.random() < REPOST_SHARE:
+                    original = rng.choice(recent)
+                    item.update(name=original['name'], employer=original['employer'], snippet=original['snippet'])
+                recent.append(item)
+                items.append(item)
+            yield {'items': items, 'found': count, 'pages': pages, 'page': page, 'per_page': per_page,
+                   'clusters': None, 'arguments': None, 'alternate_url': f'https://hh.ru/search/vacancy?text={keyword}'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Синтетические страницы /vacancies HH")
+    parser.add_argument('--size', default='10k', help="элементов выдачи: 10k, 100k, 1m или число")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', required=True, help="каталог для page_NNNNN.json")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    items = 0
+    for number, page in enumerate(synthetic_pages(parse_size(args.size), args.seed)):
+        with open(os.path.join(args.output, f'page_{number:05d}.json'), 'w', encoding='utf-8') as f:
+            json.dump(page, f, ensure_ascii=False)
+        items += len(page['items'])
+    print(f"Записано страниц: {number + 1}, элементов: {items} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
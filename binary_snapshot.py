@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бинарный снимок вакансий с индексами для чтения через mmap
+
+Чтобы получить одну вакансию по id или срез по датам, не нужно разбирать
+весь hh_vacancies*.json: рядом пишется <имя>.vsnap, который читается
+через mmap без загрузки целиком.
+
+Формат (все числа little-endian):
+    MAGIC
+    записи:  u32 длина + компактный JSON вакансии (UTF-8)
+    ...
+    ключи:   u16 длина + id (UTF-8) - для каждой вакансии
+    id:      пары u64 (позиция ключа, смещение записи), отсортированы по id
+    даты:    i64 published_at (unix), по возрастанию
+    смещения записей в порядке дат (u64)
+    FOOTER:  FOOTER_MAGIC и смещения блоков
+
+Файл только дописывается: при обновлении неизменившиеся записи остаются
+на месте, новые и изменённые дописываются в конец вместе с новыми
+индексами и футером (старые становятся мусором). Когда мусора больше
+половины файла, снимок пересобирается целиком. Читатели, открывшие файл
+раньше, продолжают видеть свою версию: дописанное лежит за пределами их
+отображения, а пересборка заменяет файл атомарно.
+
+Поиск по id и подсчёт по диапазону дат - двоичный поиск, O(log n).
+
+Пример:
+    python binary_snapshot.py pack hh_vacancies.json
+    python binary_snapshot.py get hh_vacancies.vsnap 98765432
+    python binary_snapshot.py range hh_vacancies.vsnap --from 2024-05-01 --to 2024-05-08
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from vacancy_fields import parse_timestamp
+
+MAGIC = b'VSNAP01\n'
+FOOTER_MAGIC = b'VSNAPEND'
+
+# count, начало ключей, начало id-индекса, начало дат, число дат, конец данных
+FOOTER = struct.Struct('<QQQQQQ8s')
+LENGTH = struct.Struct('<I')
+KEY_LENGTH = struct.Struct('<H')
+
+# Пересобирать файл, когда мусор занимает больше этой доли (и не меньше 64 КБ)
+COMPACT_RATIO = 0.5
+COMPACT_MIN_BYTES = 64 * 1024
+
+EXTENSION = '.vsnap'
+
+
+def binary_path(filename: str) -> str:
+    """hh_vacancies.json -> hh_vacancies.vsnap"""
+    return os.path.splitext(filename)[0] + EXTENSION
+
+
+def encode_record(vacancy: Dict) -> bytes:
+    """Компактная запись одной вакансии"""
+    return json.dumps(vacancy, ensure_ascii=False, separators=(',', ':'),
+                      sort_keys=True).encode('utf-8')
+
+
+class BinarySnapshot:
+    """Чтение .vsnap через mmap: вакансия по id, срезы и счётчики по датам"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._views = []
+        self._mm = None
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: пустой файл")
+
+        if len(self._mm) < len(MAGIC) + FOOTER.size or self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: не бинарный снимок")
+        (self.count, self._keys_start, self._ids_start, self._dates_start,
+         self.dated, self.data_end, magic) = FOOTER.unpack_from(self._mm, len(self._mm) - FOOTER.size)
+        if magic != FOOTER_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: нет футера (запись прервана?)")
+
+        # cast() читает числа в порядке байт платформы - little-endian, как в файле
+        view = memoryview(self._mm)
+        self._ids = view[self._ids_start:self._ids_start + 16 * self.count].cast('Q')
+        self._dates = view[self._dates_start:self._dates_start + 8 * self.dated].cast('q')
+        offsets_start = self._dates_start + 8 * self.dated
+        self._date_offsets = view[offsets_start:offsets_start + 8 * self.dated].cast('Q')
+        self._views = [view, self._ids, self._dates, self._date_offsets]
+
+    def close(self):
+        # Сначала производные memoryview, иначе mmap не закрыть
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _raw(self, offset: int) -> bytes:
+        (length,) = LENGTH.unpack_from(self._mm, offset)
+        start = offset + LENGTH.size
+        return self._mm[start:start + length]
+
+    def record(self, offset: int) -> Dict:
+        """Вакансия по смещению записи"""
+        return json.loads(self._raw(offset))
+
+    def _key(self, index: int) -> bytes:
+        position = self._ids[2 * index]
+        (length,) = KEY_LENGTH.unpack_from(self._mm, position)
+        start = position + KEY_LENGTH.size
+        return self._mm[start:start + length]
+
+    def offset_of(self, vacancy_id: str) -> Optional[int]:
+        """Смещение записи по id (двоичный поиск) или None"""
+        key = str(vacancy_id).encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == key:
+            return self._ids[2 * low + 1]
+        return None
+
+    def get(self, vacancy_id: str) -> Optional[Dict]:
+        """Вакансия по id или None"""
+        offset = self.offset_of(vacancy_id)
+        return None if offset is None else self.record(offset)
+
+    def entries(self) -> Iterator[Tuple[str, int]]:
+        """Пары (id, смещение записи) в порядке id"""
+        for index in range(self.count):
+            yield self._key(index).decode('utf-8'), self._ids[2 * index + 1]
+
+    def _date_bounds(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        low = 0 if start is None else bisect.bisect_left(self._dates, int(start))
+        high = self.dated if end is None else bisect.bisect_left(self._dates, int(end))
+        return low, max(low, high)
+
+    def count_range(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """Число вакансий с published_at в [start, end) - O(log n)"""
+        low, high = self._date_bounds(start, end)
+        return high - low
+
+    def iter_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                   newest_first: bool = True) -> Iterator[Dict]:
+        """Вакансии с published_at в [start, end), по умолчанию сначала новые"""
+        low, high = self._date_bounds(start, end)
+        positions = range(high - 1, low - 1, -1) if newest_first else range(low, high)
+        for position in positions:
+            yield self.record(self._date_offsets[position])
+
+
+def _published(vacancy: Dict) -> Optional[int]:
+    timestamp = parse_timestamp(vacancy.get('published_at') or '')
+    return None if timestamp is None else int(timestamp)
+
+
+def _write_index(f, records: Dict[str, Tuple[int, Optional[int]]], data_end: int):
+    """Дописывает ключи, индексы и футер; records: id -> (смещение, дата)"""
+    keys_start = f.tell()
+    ordered = sorted(records, key=lambda vacancy_id: vacancy_id.encode('utf-8'))
+    positions = []
+    for vacancy_id in ordered:
+        positions.append(f.tell())
+        key = vacancy_id.encode('utf-8')
+        f.write(KEY_LENGTH.pack(len(key)) + key)
+
+    ids_start = f.tell()
+    f.write(struct.pack(f'<{2 * len(ordered)}Q',
+                        *(value for position, vacancy_id in zip(positions, ordered)
+                          for value in (position, records[vacancy_id][0]))))
+
+    dated = sorted((published, offset) for offset, published in records.values() if published is not None)
+    dates_start = f.tell()
+    f.write(struct.pack(f'<{len(dated)}q', *(published for published, _ in dated)))
+    f.write(struct.pack(f'<{len(dated)}Q', *(offset for _, offset in dated)))
+    f.write(FOOTER.pack(len(ordered), keys_start, ids_start, dates_start, len(dated),
+                        data_end, FOOTER_MAGIC))
+
+
+def _write_records(f, vacancies: List[Dict], records: Dict[str, Tuple[int, Optional[int]]]):
+    for vacancy in vacancies:
+        data = encode_record(vacancy)
+        records[str(vacancy['id'])] = (f.tell(), _published(vacancy))
+        f.write(LENGTH.pack(len(data)) + data)
+
+
+def write_binary(path: str, vacancies: List[Dict]):
+    """Пишет снимок заново (атомарно через временный файл)"""
+    records: Dict[str, Tuple[int, Optional[int]]] = {}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        _write_records(f, [v for v in vacancies if v.get('id')], records)
+        _write_index(f, records, f.tell())
+    os.replace(tmp_path, path)
+
+
+def sync_binary(path: str, vacancies: List[Dict]) -> Dict:
+    """
+    Приводит .vsnap к списку вакансий, дописывая только изменения
+
+    Returns:
+        {'appended': дописано записей, 'kept': осталось на месте,
+         'compacted': пересобран ли файл целиком}
+    """
+    vacancies = [v for v in vacancies if v.get('id')]
+    try:
+        snapshot = BinarySnapshot(path)
+    except (OSError, ValueError):
+        write_binary(path, vacancies)
+        return {'appended': len(vacancies), 'kept': 0, 'compacted': True}
+
+    with snapshot:
+        existing = dict(snapshot.entries())
+        records: Dict[str, Tuple[int, Optional[int]]] = {}
+        changed = []
+        live_bytes = new_bytes = 0
+        for vacancy in vacancies:
+            vacancy_id = str(vacancy['id'])
+            data = encode_record(vacancy)
+            offset = existing.get(vacancy_id)
+            if offset is not None and snapshot._raw(offset) == data:
+                records[vacancy_id] = (offset, _published(vacancy))
+                live_bytes += LENGTH.size + len(data)
+            else:
+                changed.append(vacancy)
+                new_bytes += LENGTH.size + len(data)
+        file_size = len(snapshot._mm)
+
+    garbage = file_size - len(MAGIC) - live_bytes
+    if garbage > COMPACT_MIN_BYTES and garbage > (file_size + new_bytes) * COMPACT_RATIO:
+        write_binary(path, vacancies)
+        return {'appended': len(vacancies), 'kept': 0, 'compacted': True}
+
+    if not changed and len(records) == len(existing):
+        return {'appended': 0, 'kept': len(records), 'compacted': False}
+
+    with open(path, 'ab') as f:
+        _write_records(f, changed, records)
+        _write_index(f, records, f.tell())
+    return {'appended': len(changed), 'kept': len(records) - len(changed), 'compacted': False}
+
+
+def pack_snapshot(filename: str, output: Optional[str] = None) -> Dict:
+    """Строит или обновляет .vsnap по JSON-снимку"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        vacancies = json.load(f).get('vacancies', [])
+    return sync_binary(output or binary_path(filename), vacancies)
+
+
+def _date_arg(value: Optional[str]) -> Optional[float]:
+    """'2024-05-01' или ISO-время -> unix time"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Бинарные снимки вакансий с доступом через mmap")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack = commands.add_parser('pack', help="построить/обновить .vsnap по JSON-снимкам")
+    pack.add_argument('files', nargs='+')
+
+    get = commands.add_parser('get', help="вакансия по id")
+    get.add_argument('snapshot')
+    get.add_argument('id')
+
+    dates = commands.add_parser('range', help="вакансии за период [--from, --to)")
+    dates.add_argument('snapshot')
+    dates.add_argument('--from', dest='start', help="дата или время ISO")
+    dates.add_argument('--to', dest='end', help="дата или время ISO")
+    dates.add_argument('--count', action='store_true', help="только количество")
+    dates.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == 'pack':
+        for filename in args.files:
+            result = pack_snapshot(filename)
+            print(f"📦 {binary_path(filename)}: дописано {result['appended']}, "
+                  f"без изменений {result['kept']}"
+                  f"{', пересобран' if result['compacted'] else ''}")
+        return True
+
+    with BinarySnapshot(args.snapshot) as snapshot:
+        if args.command == 'get':
+            vacancy = snapshot.get(args.id)
+            if vacancy is None:
+                print(f"❌ Вакансия {args.id} не найдена")
+                return False
+            print(json.dumps(vacancy, ensure_ascii=False, indent=2))
+            return True
+
+        start, end = _date_arg(args.start), _date_arg(args.end)
+        print(f"📅 Вакансий за период: {snapshot.count_range(start, end)} из {len(snapshot)}")
+        if not args.count:
+            for number, vacancy in enumerate(snapshot.iter_range(start, end)):
+                if number >= args.limit:
+                    break
+                print(f"   {vacancy.get('published_at', '')[:16]}  {vacancy.get('id')}  "
+                      f"{vacancy.get('name', '')} - {vacancy.get('company', '')}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
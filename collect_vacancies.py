@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Сборщик вакансий системного администратора для GitHub Actions
+
+Раньше этот скрипт создавался через heredoc в каждом workflow,
+теперь все три workflow запускают его с разными регионами:
+    python collect_vacancies.py --areas 1,2,2019,145 --output hh_vacancies.json
+    python collect_vacancies.py --shard 1 --areas ... --output hh_vacancies_fullDay.json
+
+С --dry-run сборщик только строит план (query_plan.py): проверяет
+параметры запросов, узнаёт found и оценивает число запросов и время -
+бюджет на сами страницы не тратится; --plan делает то же перед сбором.
+
+С --deadline <секунд> сбор укладывается в отведённое время: сначала
+первые (самые свежие) страницы всех запросов, затем пропущенное прошлым
+запуском, затем более глубокие страницы. Не успевшие сегменты
+записываются в .cache и берутся первыми в следующий раз, а вакансии
+прошлого снимка, которые могли быть в пропущенных страницах, остаются
+в файле (не старше CARRY_OVER_MAX_AGE).
+"""
+
+import argparse
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+import re
+
+from area_planner import load_shard_areas
+from deadline import Deadline, load_skipped, save_skipped
+from fetch_policy import print_fetch_stats, stats_since
+from hh_client import HHClient
+from history_store import record_history
+from near_duplicates import mark_near_duplicates
+from page_prober import page_limit
+from query_compiler import MODE_VERIFY, QUERY_MODES, choose_queries, planned_queries
+from query_plan import MAX_PER_PAGE, estimate_time, normalize_query, plan_segments, print_plan, report_plan, save_plan
+from skill_tagger import skill_statistics, tag_vacancies
+from snapshot_writer import read_snapshot, sort_vacancies, write_snapshot
+from vacancy_fields import coordinate, parse_timestamp
+
+# Заголовки для запросов
+HEADERS = {
+    'User-Agent': 'VacancyAggregator/2.0 (https://gradelift.ru)'
+}
+
+# Задержка между запросами (в секундах)
+REQUEST_DELAY = 0.3
+
+# Ключевые слова для поиска
+SEARCH_KEYWORDS = [
+    'системный администратор',
+    'сисадмин',
+    'system administrator'
+]
+
+# Регионы по умолчанию: Москва, СПб + области
+DEFAULT_AREAS = ['1', '2', '2019', '145']
+
+# Файл результата по умолчанию
+DEFAULT_OUTPUT = 'hh_vacancies.json'
+
+# Вакансии прошлого снимка старше стольких часов не переносятся (HH держит
+# вакансию в выдаче 30 дней, как последний уровень tiered_refresh.py)
+CARRY_OVER_MAX_AGE = 30 * 24
+
+# Оценка длительности запроса, пока у клиента мало замеров (секунд)
+DEFAULT_REQUEST_COST = 2.0
+
+
+def search_params(areas: List[str]) -> Dict:
+    """Параметры поиска без текста запроса и номера страницы"""
+    return {
+        'area': areas,
+        'schedule': ['remote', 'flexible', 'fullDay', 'shift', 'flyInFlyOut'],       # Удаленная работа
+        'search_field': 'name',     # Искать в названии
+        'per_page': '100'           # Максимум на страницу
+    }
+
+
+def checked_params(params: Dict) -> Dict:
+    """Параметры запроса после normalize_query (query_plan.py); замечания печатаются"""
+    normalized, warnings, errors = normalize_query(params)
+    for message in warnings + errors:
+        print(f"   ⚠️ {message}")
+    return normalized
+
+
+def get_vacancies_by_keyword(keyword: str, areas: List[str], client: HHClient,
+                             extra_params: Optional[Dict] = None) -> List[Dict]:
+    """Получает все вакансии по одному поисковому запросу"""
+    print(f"\n🔍 Поиск по запросу: '{keyword}'")
+
+    params = search_params(areas)
+    params.update(extra_params or {})
+    params['text'] = keyword
+    params = checked_params(params)
+
+    all_vacancies = []
+    page = 0
+    total_pages = None
+
+    while True:
+        params['page'] = str(page)
+
+        data = client.search_vacancies(params)
+        if data is None:
+            break
+
+        if total_pages is None:
+            # Не глубже предела пагинации из отчёта page_prober.py
+            total_pages = min(data.get('pages', 0), page_limit(int(params['per_page'])))
+            total_found = data.get('found', 0)
+            print(f"   Найдено: {total_found} вакансий ({total_pages} страниц)")
+
+        items = data.get('items', [])
+        all_vacancies.extend(items)
+
+        page += 1
+        if page >= total_pages:
+            break
+
+    print(f"   ✅ Собрано: {len(all_vacancies)} вакансий")
+    return all_vacancies
+
+
+def request_cost(client: HHClient) -> float:
+    """Сколько секунд закладывать на следующий запрос страницы"""
+    cost = client.policy('/vacancies').latency.percentile(0.95) or DEFAULT_REQUEST_COST
+    if client.rate_budget is not None:
+        cost += 1 / client.rate_budget.rate
+    return cost
+
+
+def get_vacancies_by_value(queries: List[str], areas: List[str], client: HHClient,
+                           deadline: Deadline, extra_params: Optional[Dict] = None,
+                           boundaries: Optional[Dict[Tuple[str, int], Optional[float]]] = None) -> List[Dict]:
+    """
+    Страницы всех запросов в порядке ценности, пока позволяет deadline
+
+    Выдача сортируется по дате публикации, поэтому первая страница каждого
+    запроса - самые свежие вакансии: они идут первыми. Затем сегменты,
+    пропущенные прошлым запуском, затем остальные страницы от мелких к
+    глубоким. Всё, на что не хватило времени (или запросов), попадает в
+    deadline.skipped.
+
+    В boundaries для каждой пропущенной страницы (запрос, страница)
+    записывается самая старая публикация с предыдущих страниц того же
+    запроса (None - их нет): новее неё на пропущенной странице ничего нет.
+    """
+    params = search_params(areas)
+    params.update(extra_params or {})
+    params['order_by'] = 'publication_time'
+    checked = {query: checked_params(dict(params, text=query)) for query in queries}
+    limit = page_limit(min(int(params['per_page']), MAX_PER_PAGE))
+
+    all_vacancies = []
+    pending = []
+    skipped_before = len(deadline.skipped)
+    oldest: Dict[str, Dict[int, float]] = {query: {} for query in queries}
+
+    def fetch(query: str, page: int) -> Optional[Dict]:
+        segment = {'query': query, 'page': page}
+        if not deadline.allows(request_cost(client)):
+            deadline.skip(segment)
+            return None
+        data = client.search_vacancies(dict(checked[query], page=str(page)))
+        if data is None:
+            deadline.skip(segment)
+            return None
+        all_vacancies.extend(data.get('items', []))
+        published = [parse_timestamp(item.get('published_at') or '') for item in data.get('items', [])]
+        published = [ts for ts in published if ts is not None]
+        if published:
+            oldest[query][page] = min(published)
+        return data
+
+    first_pages = sorted(queries, key=lambda q: not deadline.is_priority({'query': q, 'page': 0}))
+    for query in first_pages:
+        print(f"\n🔍 Поиск по запросу: '{query}'")
+        data = fetch(query, 0)
+        if data is None:
+            print("   ⏭️ Первая страница не получена")
+            continue
+        total_pages = min(data.get('pages', 0), limit)
+        print(f"   Найдено: {data.get('found', 0)} вакансий ({total_pages} страниц)")
+        pending.extend((not deadline.is_priority({'query': query, 'page': page}), page, query)
+                       for page in range(1, total_pages))
+
+    for _, page, query in sorted(pending, key=lambda s: (s[0], s[1])):
+        fetch(query, page)
+
+    if boundaries is not None:
+        for segment in deadline.skipped[skipped_before:]:
+            before = [ts for page, ts in oldest[segment['query']].items() if page < segment['page']]
+            boundaries[(segment['query'], segment['page'])] = min(before, default=None)
+
+    skipped = len(deadline.skipped) - skipped_before
+    left = f", осталось {max(0, deadline.remaining()):.0f} с" if deadline.seconds is not None else ""
+    print(f"\n⏱️ Собрано страниц: {len(queries) + len(pending) - skipped}, пропущено: {skipped}{left}")
+    return all_vacancies
+
+
+def clean_html(html_text: str) -> str:
+    """Очищает HTML теги из текста"""
+    if not html_text:
+        return ""
+    clean = re.sub('<.*?>', '', html_text)
+    clean = clean.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    clean = ' '.join(clean.split())
+    return clean
+
+
+def format_salary(salary_data: Dict) -> str:
+    """Форматирует информацию о зарплате"""
+    if not salary_data:
+        return "не указана"
+
+    try:
+        salary_from = salary_data.get('from')
+        salary_to = salary_data.get('to')
+        currency = salary_data.get('currency', 'RUR')
+        gross = salary_data.get('gross', False)
+
+        if salary_from:
+            salary_from = f"{salary_from:,}".replace(',', ' ')
+        if salary_to:
+            salary_to = f"{salary_to:,}".replace(',', ' ')
+
+        if salary_from and salary_to:
+            result = f"{salary_from} - {salary_to} {currency}"
+        elif salary_from:
+            result = f"от {salary_from} {currency}"
+        elif salary_to:
+            result = f"до {salary_to} {currency}"
+        else:
+            return "не указана"
+
+        if gross:
+            result += " до вычета налогов"
+        else:
+            result += " на руки"
+
+        return result
+    except Exception:
+        return "не указана"
+
+
+def safe_get(data: Optional[Dict], *keys) -> any:
+    """Безопасное получение вложенных значений из словаря"""
+    if data is None:
+        return None
+    result = data
+    for key in keys:
+        if isinstance(result, dict):
+            result = result.get(key)
+            if result is None:
+                return None
+        else:
+            return None
+    return result
+
+
+def parse_vacancy(item: Dict) -> Dict:
+    """Парсит данные вакансии с обработкой ошибок"""
+    try:
+        # Безопасное извлечение данных о работодателе
+        employer = item.get('employer') or {}
+
+        # Безопасное извлечение логотипа
+        logo_urls = employer.get('logo_urls') or {}
+        company_logo = logo_urls.get('original', '')
+
+        # Безопасное извлечение других полей
+        vacancy = {
+            'id': item.get('id', ''),
+            'name': item.get('name', ''),
+            'company': employer.get('name', ''),
+            'company_id': employer.get('id', ''),
+            'company_url': employer.get('alternate_url', ''),
+            'company_logo': company_logo,
+            'url': item.get('alternate_url', ''),
+            'published_at': item.get('published_at', ''),
+            'created_at': item.get('created_at', ''),
+            'area': safe_get(item, 'area', 'name') or '',
+            'salary': format_salary(item.get('salary')),
+            'salary_raw': item.get('salary'),
+            'experience': safe_get(item, 'experience', 'name') or '',
+            'schedule': safe_get(item, 'schedule', 'name') or '',
+            'employment': safe_get(item, 'employment', 'name') or '',
+            'requirement': clean_html(safe_get(item, 'snippet', 'requirement') or ''),
+            'responsibility': clean_html(safe_get(item, 'snippet', 'responsibility') or ''),
+            'type': safe_get(item, 'type', 'name') or '',
+            'professional_roles': [],
+            'has_test': item.get('has_test', False),
+            'premium': item.get('premium', False),
+            'accept_handicapped': item.get('accept_handicapped', False),
+            'accept_kids': item.get('accept_kids', False),
+            'accept_temporary': item.get('accept_temporary', False),
+            'lat': coordinate(safe_get(item, 'address', 'lat')),
+            'lng': coordinate(safe_get(item, 'address', 'lng'))
+        }
+
+        # Безопасное извлечение профессиональных ролей
+        roles = item.get('professional_roles', [])
+        if isinstance(roles, list):
+            vacancy['professional_roles'] = [role.get('name', '') for role in roles if isinstance(role, dict)]
+
+        return vacancy
+
+    except Exception as e:
+        print(f"   ⚠️ Ошибка при парсинге вакансии: {e}")
+        # Возвращаем минимальные данные
+        return {
+            'id': item.get('id', ''),
+            'name': item.get('name', 'Ошибка загрузки'),
+            'company': '',
+            'company_id': '',
+            'company_url': '',
+            'company_logo': '',
+            'url': item.get('alternate_url', ''),
+            'published_at': item.get('published_at', ''),
+            'created_at': '',
+            'area': '',
+            'salary': 'не указана',
+            'salary_raw': None,
+            'experience': '',
+            'schedule': '',
+            'employment': '',
+            'requirement': '',
+            'responsibility': '',
+            'type': '',
+            'professional_roles': [],
+            'has_test': False,
+            'premium': False,
+            'accept_handicapped': False,
+            'accept_kids': False,
+            'accept_temporary': False,
+            'lat': None,
+            'lng': None
+        }
+
+
+def collect_all_vacancies(areas: List[str] = DEFAULT_AREAS, query_mode: str = MODE_VERIFY,
+                          client: Optional[HHClient] = None,
+                          extra_params: Optional[Dict] = None,
+                          deadline: Optional[Deadline] = None,
+                          boundaries: Optional[Dict[Tuple[str, int], Optional[float]]] = None) -> List[Dict]:
+    """
+    Собирает все вакансии по всем ключевым словам
+
+    extra_params дополняют параметры поиска (например, date_from/date_to
+    для уровней tiered_refresh.py); с deadline страницы запрашиваются
+    в порядке ценности, пока хватает времени (get_vacancies_by_value,
+    там же заполняются boundaries)
+    """
+    print("=== СБОР ВСЕХ ВАКАНСИЙ ПО СИСТЕМНОМУ АДМИНИСТРИРОВАНИЮ ===")
+    print(f"Время начала: {datetime.now()}")
+    print(f"Ключевые слова для поиска: {', '.join(SEARCH_KEYWORDS)}")
+    print(f"Регионов: {len(areas)}, режим запросов: {query_mode}")
+
+    client = client or HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+    stats_before = client.fetch_stats()
+    queries = choose_queries(client, SEARCH_KEYWORDS, search_params(areas), query_mode, extra_params)
+
+    unique_vacancy_ids: Set[str] = set()
+    all_vacancies: List[Dict] = []
+
+    if deadline is None:
+        batches = (get_vacancies_by_keyword(query, areas, client, extra_params) for query in queries)
+    else:
+        batches = [get_vacancies_by_value(queries, areas, client, deadline, extra_params, boundaries)]
+
+    for vacancies in batches:
+        new_count = 0
+        for item in vacancies:
+            try:
+                vacancy_id = item.get('id')
+                if vacancy_id and vacancy_id not in unique_vacancy_ids:
+                    unique_vacancy_ids.add(vacancy_id)
+                    vacancy = parse_vacancy(item)
+                    all_vacancies.append(vacancy)
+                    new_count += 1
+
+                    if len(all_vacancies) % 25 == 0:
+                        print(f"   📊 Обработано вакансий: {len(all_vacancies)}")
+            except Exception as e:
+                print(f"   ⚠️ Пропущена вакансия из-за ошибки: {e}")
+                continue
+
+        print(f"   📌 Новых уникальных вакансий: {new_count}")
+
+    # Сортировка с обработкой ошибок (стабильная - для канонического файла)
+    try:
+        all_vacancies = sort_vacancies(all_vacancies)
+    except Exception as e:
+        print(f"   ⚠️ Не удалось отсортировать вакансии: {e}")
+
+    print(f"\n🔢 Запросов к API: {client.requests_made}")
+    print_fetch_stats(stats_since(stats_before, client.fetch_stats()))
+    return all_vacancies
+
+
+def snapshot_statistics(vacancies: List[Dict]) -> Dict:
+    """
+    Блок statistics снимка по размеченным вакансиям
+
+    Почти-дубли (duplicate_of) не учитываются в total и companies;
+    listings - все объявления вместе с дублями. skills - частота и
+    медиана зарплаты по навыку (skill_tagger.py).
+    """
+    distinct = [v for v in vacancies if not v.get('duplicate_of')]
+    return {
+        'total': len(distinct),
+        'listings': len(vacancies),
+        'near_duplicates': len(vacancies) - len(distinct),
+        'with_salary': sum(1 for v in distinct if v.get('salary', 'не указана') != 'не указана'),
+        'companies': len(set(v.get('company', '') for v in distinct if v.get('company'))),
+        'cities': len(set(v.get('area', '') for v in vacancies if v.get('area'))),
+        'premium': sum(1 for v in distinct if v.get('premium', False)),
+        'with_test': sum(1 for v in distinct if v.get('has_test', False)),
+        'skills': skill_statistics(distinct)
+    }
+
+
+def save_vacancies(vacancies: List[Dict], filename: str = DEFAULT_OUTPUT, source='hh.ru') -> bool:
+    """
+    Сохраняет вакансии в JSON файл; возвращает True, если содержимое изменилось
+
+    source - площадка или список площадок (для сбора через sources.py)
+
+    Перед записью размечаются почти-дубли (near_duplicates.py) и навыки
+    (skill_tagger.py), статистика - snapshot_statistics.
+    """
+    mark_near_duplicates(vacancies, filename=filename)
+    tag_vacancies(vacancies)
+    stats = snapshot_statistics(vacancies)
+
+    output = {
+        'source': source,
+        'search_keywords': SEARCH_KEYWORDS,
+        'search_params': {
+            'area': 'Россия',
+            'schedule': 'Удалённая работа',
+            'search_field': 'В названии вакансии'
+        },
+        'updated': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'statistics': stats,
+        'vacancies': vacancies
+    }
+
+    changed = write_snapshot(filename, output)
+    if changed:
+        print(f"\n✅ Файл {filename} успешно создан!")
+    else:
+        print(f"\n✅ Файл {filename} не изменился - коммит и выгрузка не нужны")
+    print("📊 Статистика:")
+    for key, value in stats.items():
+        if key == 'skills':
+            value = ', '.join(f"{skill} {row['count']}" for skill, row in list(value.items())[:10])
+        print(f"   - {key}: {value}")
+
+    return changed
+
+
+def build_parser(description: str = "Сбор вакансий системного администратора с HH.ru"):
+    """Общие аргументы сборщиков (используются и в tiered_refresh.py)"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--areas', default=','.join(DEFAULT_AREAS),
+                        help="регионы через запятую")
+    parser.add_argument('--shard', type=int,
+                        help="номер шарда из area_shards.json (с 1); заменяет --areas, если план есть")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="файл результата")
+    parser.add_argument('--query-mode', choices=QUERY_MODES, default=MODE_VERIFY,
+                        help="поиск по каждому слову, объединённым запросом или объединённым после проверки")
+    parser.add_argument('--deadline', type=float,
+                        help="секунд на весь запуск: сбор остановится вовремя, чтобы успеть сохранить файл")
+    parser.add_argument('--plan', action='store_true',
+                        help="перед сбором оценить число запросов и время (query_plan.py)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="только план: проверить запросы, узнать found и оценить стоимость, без сбора")
+    parser.add_argument('--plan-output', help="записать план в JSON")
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Аргументы командной строки"""
+    return build_parser().parse_args(argv)
+
+
+def resolve_areas(args) -> List[str]:
+    """Регионы из плана шардов или из --areas"""
+    if args.shard:
+        planned = load_shard_areas(args.shard - 1)
+        if planned:
+            print(f"🗺️ Регионы шарда {args.shard} из плана: {len(planned)}")
+            return planned
+        print(f"⚠️ Шард {args.shard} не найден в плане, используем --areas")
+    return [area for area in args.areas.split(',') if area]
+
+
+def plan_collection(areas: List[str], query_mode: str = MODE_VERIFY, client: Optional[HHClient] = None,
+                    windows: Optional[Dict[str, Dict]] = None, deadline_seconds: Optional[float] = None,
+                    output: Optional[str] = None) -> Dict:
+    """
+    План сбора: запросы x окна дат, их found, число запросов и время (query_plan.py)
+
+    windows - подпись -> date_from/date_to окна (уровни tiered_refresh.py);
+    по умолчанию одно окно без дат, как у обычного сбора
+    """
+    client = client or HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+    params = search_params(areas)
+    segments = [{'name': f"{query} [{label}]" if label else query, 'params': dict(params, text=query, **window)}
+                for query in planned_queries(SEARCH_KEYWORDS, params, query_mode)
+                for label, window in (windows or {'': {}}).items()]
+    plan = plan_segments(client, segments)
+    estimate_time(plan, client.rate_budget.rate if client.rate_budget else None, request_cost(client))
+    print_plan(plan, deadline_seconds)
+    if output:
+        save_plan(plan, output)
+    report_plan(plan)
+    return plan
+
+
+def carry_over(vacancies: List[Dict], output_file: str, skipped: List[Dict],
+               now: Optional[float] = None, previous: Optional[List[Dict]] = None,
+               boundaries: Optional[Dict[Tuple[str, int], Optional[float]]] = None) -> List[Dict]:
+    """
+    Добавляет вакансии прошлого снимка, которые могли быть в пропущенных сегментах
+
+    Выдача идёт по дате публикации, поэтому пропущенная страница запроса -
+    это вакансии не новее самой старой с его предыдущих страниц (boundaries
+    из get_vacancies_by_value). У каждого запроса граница своя, а чей
+    запрос нашёл вакансию прошлого снимка, неизвестно, поэтому берётся
+    самая поздняя из границ; более новые вакансии, которых нет в выдаче,
+    закрыты. Если у какой-то пропущенной страницы граница неизвестна
+    (например, пропущена первая), границы нет. В любом случае переносятся
+    только вакансии моложе CARRY_OVER_MAX_AGE часов - иначе закрытые
+    копились бы из запуска в запуск.
+
+    previous - вакансии прошлого снимка из памяти (collector_daemon.py);
+    без него снимок читается из output_file.
+    """
+    now = now or datetime.now().timestamp()
+    if previous is None:
+        previous = (read_snapshot(output_file) or {}).get('vacancies', [])
+    fetched = {v.get('id') for v in vacancies}
+    bounds = [(boundaries or {}).get((segment.get('query'), segment.get('page'))) for segment in skipped]
+    boundary = max(bounds) if bounds and None not in bounds else None
+
+    kept = []
+    for vacancy in previous:
+        published = parse_timestamp(vacancy.get('published_at') or '')
+        if vacancy.get('id') in fetched or published is None or now - published >= CARRY_OVER_MAX_AGE * 3600:
+            continue
+        if boundary is None or published <= boundary:
+            kept.append(vacancy)
+    if kept:
+        print(f"   ♻️ Из прошлого снимка оставлено {len(kept)} вакансий")
+    return sort_vacancies(vacancies + kept)
+
+
+def save_history(output_file: str, vacancies: List[Dict]):
+    """Дописывает изменения снимка в журнал history_store.py (ошибка не мешает сбору)"""
+    try:
+        record_history(output_file, vacancies)
+    except (OSError, ValueError) as e:
+        print(f"   ⚠️ Не удалось обновить историю: {e}")
+
+
+def run_collection(areas: List[str], output_file: str = DEFAULT_OUTPUT,
+                   query_mode: str = MODE_VERIFY, client: Optional[HHClient] = None,
+                   deadline_seconds: Optional[float] = None,
+                   previous: Optional[List[Dict]] = None) -> Dict:
+    """
+    Один полный цикл: сбор, сохранение и вывод итогов
+
+    С deadline_seconds сбор останавливается заранее; пропущенные сегменты
+    сохраняются для следующего запуска, а файл дополняется прошлым снимком
+    (previous - он же из памяти, иначе читается с диска)
+
+    Returns:
+        {'success': bool, 'changed': bool, 'vacancies': список вакансий}
+    """
+    result = {'success': False, 'changed': False, 'vacancies': []}
+    try:
+        deadline = None
+        boundaries = {}
+        if deadline_seconds is not None:
+            deadline = Deadline(deadline_seconds, priority=load_skipped(output_file))
+        vacancies = collect_all_vacancies(areas, query_mode, client, deadline=deadline, boundaries=boundaries)
+        if deadline is not None:
+            save_skipped(output_file, deadline.skipped)
+            if deadline.skipped:
+                vacancies = carry_over(vacancies, output_file, deadline.skipped, previous=previous,
+                                       boundaries=boundaries)
+
+        if not vacancies:
+            print("\n❌ Не удалось найти ни одной вакансии")
+            # Создаем пустой файл для избежания ошибок
+            empty_output = {
+                'source': 'hh.ru',
+                'search_keywords': SEARCH_KEYWORDS,
+                'search_params': {
+                    'area': 'Россия',
+                    'schedule': 'Удалённая работа',
+                    'search_field': 'В названии вакансии'
+                },
+                'updated': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'statistics': {
+                    'total': 0,
+                    'listings': 0,
+                    'near_duplicates': 0,
+                    'with_salary': 0,
+                    'companies': 0,
+                    'cities': 0,
+                    'premium': 0,
+                    'with_test': 0,
+                    'skills': {}
+                },
+                'vacancies': []
+            }
+            result['changed'] = write_snapshot(output_file, empty_output)
+            return result
+
+        result['changed'] = save_vacancies(vacancies, output_file)
+        result['vacancies'] = vacancies
+        if result['changed']:
+            save_history(output_file, vacancies)
+
+        # Топ компаний с обработкой ошибок
+        try:
+            companies = {}
+            for v in vacancies:
+                company = v.get('company', '')
+                if company:
+                    companies[company] = companies.get(company, 0) + 1
+
+            if companies:
+                top_companies = sorted(companies.items(), key=lambda x: x[1], reverse=True)[:5]
+                print("\n🏢 Топ-5 компаний:")
+                for company, count in top_companies:
+                    print(f"   - {company}: {count} вакансий")
+        except Exception as e:
+            print(f"\n⚠️ Не удалось вывести топ компаний: {e}")
+
+        print("\n✨ Готово!")
+        result['success'] = True
+        return result
+
+    except Exception as e:
+        print(f"\n❌ Произошла критическая ошибка: {e}")
+        import traceback
+        traceback.print_exc()
+
+        # Создаем файл с ошибкой
+        error_output = {
+            'source': 'hh.ru',
+            'error': str(e),
+            'updated': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'vacancies': []
+        }
+        result['changed'] = write_snapshot(output_file, error_output)
+
+        return result
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    args = parse_args(argv)
+    areas = resolve_areas(args)
+    client = HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+    if args.plan or args.dry_run:
+        plan = plan_collection(areas, args.query_mode, client, deadline_seconds=args.deadline,
+                               output=args.plan_output)
+        if args.dry_run:
+            return not plan['errors'] and not plan['over_cap']
+    result = run_collection(areas, args.output, args.query_mode, client, deadline_seconds=args.deadline)
+    return result['success']
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
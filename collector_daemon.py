@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Долгоживущий режим сборщика вместо трёх cron-workflow
+
+Все три задания (основное и два шарда регионов) выполняются одним
+процессом по внутреннему расписанию со случайным разбросом (jitter).
+Между циклами в памяти остаются HTTP-сессия, план шардов, индекс id
+и предыдущий снимок каждого задания (с --deadline им дополняются
+пропущенные сегменты без чтения файла), а с --tiered - кэши уровней
+tiered_refresh.py, поэтому нет накладных расходов на запуск Python,
+установку зависимостей и новые соединения. После
+каждого успешного цикла обновляется бинарный снимок <имя>.vsnap
+(binary_snapshot.py) - дописываются только изменившиеся вакансии.
+
+Состояние отдаётся по HTTP:
+    GET /health  - 200, если последние циклы прошли без ошибок
+    GET /status  - JSON с состоянием каждого задания
+
+Пример:
+    python collector_daemon.py --interval 900 --port 8080 \\
+        --on-change "sh deploy.sh {output}"
+    python collector_daemon.py --tiered --max-requests 100 --deadline 600
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+
+from area_planner import PLAN_FILE, load_shard_areas, read_legacy_shards
+from binary_snapshot import binary_path, sync_binary
+from collect_vacancies import DEFAULT_AREAS, HEADERS, REQUEST_DELAY, run_collection, save_history, save_vacancies
+from fetch_policy import stats_since
+from hh_client import HHClient
+from query_compiler import MODE_VERIFY, QUERY_MODES
+from tiered_refresh import DEFAULT_MAX_REQUESTS, refresh_tiers
+
+# Интервал между запусками одного задания и разброс (доля интервала)
+DEFAULT_INTERVAL = 3600
+DEFAULT_JITTER = 0.1
+
+# Задание считается нездоровым после стольких ошибок подряд
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class CollectJob:
+    """Одно задание сбора и его тёплое состояние между циклами"""
+
+    def __init__(self, name: str, output: str, areas: Optional[List[str]] = None,
+                 shard: Optional[int] = None):
+        self.name = name
+        self.output = output
+        self.static_areas = areas
+        self.shard = shard
+
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.last_run = None
+        self.last_duration = None
+        self.last_changed = None
+        self.last_error = None
+        self.last_fetch_stats: Dict[str, Dict] = {}
+
+        # Предыдущий снимок (для переноса пропущенных по --deadline) и индекс id
+        self.previous: List[Dict] = []
+        self.known_ids: Set[str] = set()
+        # Уровни tiered_refresh.py между циклами (--tiered)
+        self.tier_states: Dict[str, Optional[Dict]] = {}
+        self.last_new = 0
+        self.last_removed = 0
+
+    def areas(self, plan_areas: Dict[int, List[str]]) -> List[str]:
+        """Регионы задания: фиксированные или из плана шардов"""
+        if self.static_areas:
+            return self.static_areas
+        return plan_areas.get(self.shard) or []
+
+    def remember(self, vacancies: List[Dict]):
+        """Сохраняет снимок в памяти и считает новые/исчезнувшие вакансии"""
+        ids = {v['id'] for v in vacancies if v.get('id')}
+        if self.known_ids:
+            self.last_new = len(ids - self.known_ids)
+            self.last_removed = len(self.known_ids - ids)
+        self.known_ids = ids
+        self.previous = vacancies
+
+    def status(self) -> Dict:
+        return {
+            'output': self.output,
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_run': self.last_run,
+            'last_duration': self.last_duration,
+            'last_changed': self.last_changed,
+            'last_error': self.last_error,
+            'vacancies': len(self.previous),
+            'new': self.last_new,
+            'removed': self.last_removed,
+            'fetch': self.last_fetch_stats,
+            'next_run': datetime.fromtimestamp(self.next_run).isoformat(timespec='seconds')
+        }
+
+
+def default_jobs() -> List[CollectJob]:
+    """Те же задания, что выполнялись тремя workflow"""
+    return [
+        CollectJob('main', 'hh_vacancies.json', areas=DEFAULT_AREAS),
+        CollectJob('fullDay', 'hh_vacancies_fullDay.json', shard=1),
+        CollectJob('fullDay_2', 'hh_vacancies_fullDay_2.json', shard=2)
+    ]
+
+
+class CollectorDaemon:
+    """Планировщик заданий с общим HTTP-клиентом и тёплыми кэшами"""
+
+    def __init__(self, jobs: List[CollectJob], interval: float = DEFAULT_INTERVAL,
+                 jitter: float = DEFAULT_JITTER, query_mode: str = MODE_VERIFY,
+                 on_change: Optional[str] = None, deadline: Optional[float] = None,
+                 max_requests: Optional[int] = None):
+        self.jobs = jobs
+        self.interval = interval
+        self.jitter = jitter
+        self.query_mode = query_mode
+        self.on_change = on_change
+        self.deadline = deadline
+        # Бюджет запросов на цикл в режиме уровней; None - полный сбор
+        self.max_requests = max_requests
+        self.client = HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+
+        self._plan_mtime = None
+        self._plan_areas: Dict[int, List[str]] = {}
+
+        # Стартуем задания вразнобой по интервалу, как :00/:20/:40 в cron
+        now = time.time()
+        self.queue = []
+        for number, job in enumerate(jobs):
+            job.next_run = now + number * interval / max(len(jobs), 1)
+            heapq.heappush(self.queue, (job.next_run, number, job))
+
+    def _next_delay(self) -> float:
+        """Интервал до следующего запуска с разбросом ±jitter"""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _plan(self) -> Dict[int, List[str]]:
+        """План шардов из памяти; перечитывается только при изменении файла"""
+        try:
+            mtime = os.path.getmtime(PLAN_FILE)
+        except OSError:
+            mtime = None
+        if mtime is None and not self._plan_areas:
+            # Плана нет - берём списки регионов из старых сборщиков
+            self._plan_areas = {number: areas for number, areas
+                                in enumerate(read_legacy_shards(), 1)}
+        elif mtime is not None and mtime != self._plan_mtime:
+            self._plan_mtime = mtime
+            self._plan_areas = {}
+            shard = 0
+            while True:
+                areas = load_shard_areas(shard)
+                if not areas:
+                    break
+                self._plan_areas[shard + 1] = areas
+                shard += 1
+            print(f"🗺️ План шардов загружен: {len(self._plan_areas)} шардов")
+        return self._plan_areas
+
+    def run_job(self, job: CollectJob):
+        """Выполняет одно задание и обновляет его состояние"""
+        print(f"\n⏰ [{datetime.now():%H:%M:%S}] Задание '{job.name}'")
+        started = time.monotonic()
+        requests_before = self.client.requests_made
+        stats_before = self.client.fetch_stats()
+        try:
+            result = self._collect(job)
+            with self.lock:
+                job.runs += 1
+                job.last_changed = result['changed']
+                if result['success']:
+                    job.failures = 0
+                    job.last_error = None
+                    job.remember(result['vacancies'])
+                else:
+                    job.failures += 1
+                    job.last_error = 'пустой результат или ошибка сбора'
+            if result['success']:
+                self._sync_binary(job, result['vacancies'])
+        except Exception as e:
+            with self.lock:
+                job.runs += 1
+                job.failures += 1
+                job.last_error = str(e)
+            print(f"❌ Задание '{job.name}' завершилось с ошибкой: {e}")
+            result = {'changed': False}
+
+        with self.lock:
+            job.last_run = datetime.now().isoformat(timespec='seconds')
+            job.last_duration = round(time.monotonic() - started, 1)
+            job.last_fetch_stats = stats_since(stats_before, self.client.fetch_stats())
+        print(f"   ⏱️ {job.last_duration} с, запросов: {self.client.requests_made - requests_before}")
+
+        if result['changed'] and self.on_change:
+            self._run_hook(job)
+
+    def _collect(self, job: CollectJob) -> Dict:
+        """Полный сбор или обновление по уровням с состоянием задания из памяти"""
+        areas = job.areas(self._plan())
+        if self.max_requests is None:
+            return run_collection(areas, job.output, self.query_mode, self.client,
+                                  self.deadline, job.previous or None)
+
+        vacancies = refresh_tiers(areas, job.output, self.query_mode, self.max_requests,
+                                  self.client, self.deadline, job.tier_states)
+        changed = bool(vacancies) and save_vacancies(vacancies, job.output)
+        if changed:
+            save_history(job.output, vacancies)
+        return {'success': bool(vacancies), 'changed': changed, 'vacancies': vacancies}
+
+    def _sync_binary(self, job: CollectJob, vacancies: List[Dict]):
+        """Дописывает изменения в бинарный снимок задания"""
+        path = binary_path(job.output)
+        try:
+            stats = sync_binary(path, vacancies)
+        except OSError as e:
+            print(f"   ⚠️ Не удалось обновить {path}: {e}")
+            return
+        print(f"   📦 {path}: дописано {stats['appended']}, без изменений {stats['kept']}")
+
+    def _run_hook(self, job: CollectJob):
+        """Запускает внешнюю команду (коммит, выгрузка) для изменившегося файла"""
+        command = shlex.split(self.on_change.format(output=job.output, job=job.name))
+        try:
+            subprocess.run(command, check=True, timeout=self.interval)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"   ⚠️ Команда --on-change завершилась с ошибкой: {e}")
+
+    def healthy(self) -> bool:
+        with self.lock:
+            return all(job.failures < MAX_CONSECUTIVE_FAILURES for job in self.jobs)
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {
+                'started': self.started,
+                'healthy': all(job.failures < MAX_CONSECUTIVE_FAILURES for job in self.jobs),
+                'requests_made': self.client.requests_made,
+                'fetch': self.client.fetch_stats(),
+                'jobs': {job.name: job.status() for job in self.jobs}
+            }
+
+    def serve_forever(self):
+        """Главный цикл: ждёт ближайшее задание, выполняет, планирует заново"""
+        while not self.stop_event.is_set():
+            next_run, number, job = self.queue[0]
+            if self.stop_event.wait(max(0.0, next_run - time.time())):
+                break
+            heapq.heappop(self.queue)
+            self.run_job(job)
+            job.next_run = time.time() + self._next_delay()
+            heapq.heappush(self.queue, (job.next_run, number, job))
+
+    def stop(self):
+        self.stop_event.set()
+
+
+def start_status_server(daemon: CollectorDaemon, host: str, port: int) -> ThreadingHTTPServer:
+    """Поднимает HTTP-сервер /health и /status в фоновом потоке"""
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/health':
+                healthy = daemon.healthy()
+                code, body = (200 if healthy else 503), {'status': 'ok' if healthy else 'failing'}
+            elif self.path == '/status':
+                code, body = 200, daemon.status()
+            else:
+                code, body = 404, {'error': 'not found'}
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🩺 Статус: http://{host}:{port}/status")
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Сборщик вакансий в режиме демона")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help="интервал между запусками одного задания, секунд")
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER,
+                        help="случайный разброс интервала (доля)")
+    parser.add_argument('--query-mode', choices=QUERY_MODES, default=MODE_VERIFY)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--on-change',
+                        help="команда после изменения файла; подставляются {output} и {job}")
+    parser.add_argument('--deadline', type=float,
+                        help="секунд на один цикл задания (см. deadline.py)")
+    parser.add_argument('--tiered', action='store_true',
+                        help="обновлять по уровням возраста (tiered_refresh.py) вместо полного сбора")
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help="бюджет запросов на цикл задания с --tiered")
+    args = parser.parse_args(argv)
+
+    daemon = CollectorDaemon(default_jobs(), args.interval, args.jitter,
+                             args.query_mode, args.on_change, args.deadline,
+                             args.max_requests if args.tiered else None)
+    server = start_status_server(daemon, args.host, args.port)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\n⚠️ Демон остановлен пользователем")
+    finally:
+        daemon.stop()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Колоночная выгрузка снимка для аналитики (<имя>.columns.npz / .parquet)
+
+Чтобы посчитать что-то по hh_vacancies*.json в pandas, приходилось
+каждый раз разбирать весь JSON с вложенными записями и строковыми
+полями - секунды и сотни мегабайт. Теперь при записи снимка рядом
+кладутся типизированные колонки:
+    id                        - int64, числовая часть id;
+    source                    - площадка ('hh' или префикс 'trudvsem:' и т.п.);
+    company, area, experience,
+    schedule, employment,
+    salary_currency           - коды int32 в словарь <колонка>_values (-1 - пусто);
+    salary_from, salary_to    - float64 как в вакансии, NaN если не указано;
+    published_at, created_at  - int64, unix time, -1 если нет даты;
+    lat, lng                  - float64, NaN без адреса;
+    premium, has_test         - bool.
+Формат - NumPy .npz без сжатия (грузится за миллисекунды, память - ровно
+на колонки); если установлен pyarrow, рядом пишется и .parquet с
+dictionary-колонками. Без numpy выгрузка пропускается.
+
+В pandas:
+    columns = load_columns('hh_vacancies.columns.npz')
+    frame = pd.DataFrame({name: decode(columns, name) for name in columns if not name.endswith('_values')})
+
+Нужен numpy: pip install .[analytics]
+
+Пример:
+    python columnar_export.py hh_vacancies.json        # пересобрать выгрузку
+"""
+
+import argparse
+import os
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from vacancy_fields import parse_timestamp
+
+# Строковые колонки со словарём значений
+DICTIONARY_COLUMNS = ('source', 'company', 'area', 'experience', 'schedule', 'employment', 'salary_currency')
+
+DEFAULT_SOURCE = 'hh'
+
+
+def _split_id(value) -> tuple:
+    """'12345' -> ('hh', 12345); 'trudvsem:abc-1' -> ('trudvsem', -1)"""
+    source, _, number = str(value or '').rpartition(':')
+    return source or DEFAULT_SOURCE, int(number) if number.isdigit() else -1
+
+
+def _encode(values: List[str]) -> tuple:
+    """Коды int32 и словарь значений; пустые строки получают код -1"""
+    dictionary: Dict[str, int] = {}
+    codes = np.array([dictionary.setdefault(value, len(dictionary)) if value else -1 for value in values],
+                     dtype=np.int32)
+    return codes, np.array(list(dictionary), dtype=str)
+
+
+def _float(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _epoch(value: str) -> int:
+    timestamp = parse_timestamp(value or '')
+    return int(timestamp) if timestamp is not None else -1
+
+
+def build_columns(vacancies: List[Dict]) -> Dict[str, 'np.ndarray']:
+    """Колонки снимка: имя -> массив (для словарных ещё <имя>_values)"""
+    salaries = [v.get('salary_raw') or {} for v in vacancies]
+    sources, ids = zip(*(_split_id(v.get('id')) for v in vacancies)) if vacancies else ((), ())
+    strings = {
+        'source': list(sources),
+        'salary_currency': [salary.get('currency') or '' for salary in salaries],
+        **{name: [v.get(name) or '' for v in vacancies]
+           for name in ('company', 'area', 'experience', 'schedule', 'employment')}
+    }
+    columns = {'id': np.array(ids, dtype=np.int64)}
+    for name in DICTIONARY_COLUMNS:
+        columns[name], columns[f'{name}_values'] = _encode(strings[name])
+    columns.update({
+        'salary_from': np.array([_float(salary.get('from')) for salary in salaries], dtype=np.float64),
+        'salary_to': np.array([_float(salary.get('to')) for salary in salaries], dtype=np.float64),
+        'published_at': np.array([_epoch(v.get('published_at')) for v in vacancies], dtype=np.int64),
+        'created_at': np.array([_epoch(v.get('created_at')) for v in vacancies], dtype=np.int64),
+        'lat': np.array([_float(v.get('lat')) for v in vacancies], dtype=np.float64),
+        'lng': np.array([_float(v.get('lng')) for v in vacancies], dtype=np.float64),
+        'premium': np.array([bool(v.get('premium')) for v in vacancies], dtype=bool),
+        'has_test': np.array([bool(v.get('has_test')) for v in vacancies], dtype=bool),
+    })
+    return columns
+
+
+def columns_path(filename: str, ext: str = '.npz') -> str:
+    """hh_vacancies.json -> hh_vacancies.columns.npz"""
+    return f"{os.path.splitext(filename)[0]}.columns{ext}"
+
+
+def _write_parquet(path: str, columns: Dict[str, 'np.ndarray'], digest: Optional[str]):
+    arrays = {}
+    for name, values in columns.items():
+        if name.endswith('_values'):
+            continue
+        if name in DICTIONARY_COLUMNS:
+            codes = pyarrow.array(columns[name], mask=columns[name] < 0)
+            arrays[name] = pyarrow.DictionaryArray.from_arrays(codes, pyarrow.array(columns[f'{name}_values']))
+        elif name in ('published_at', 'created_at'):
+            arrays[name] = pyarrow.array(values, mask=values < 0).cast(pyarrow.timestamp('s', tz='UTC'))
+        else:
+            arrays[name] = pyarrow.array(values)
+    table = pyarrow.table(arrays).replace_schema_metadata({'sha256': digest or ''})
+    tmp_path = f"{path}.tmp"
+    pyarrow.parquet.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def export_columns(filename: str, vacancies: List[Dict], digest: Optional[str] = None,
+                   force: bool = True) -> List[str]:
+    """
+    Пишет колоночную выгрузку снимка (стадия экспорта snapshot_writer)
+
+    Returns:
+        Пути записанных файлов; пусто без numpy или если файл есть и force=False
+    """
+    path = columns_path(filename)
+    if np is None or (not force and os.path.exists(path)):
+        return []
+    columns = build_columns(vacancies)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, sha256=np.array(digest or ''), **columns)
+    os.replace(tmp_path, path)
+    written = [path]
+    if pyarrow is not None:
+        _write_parquet(columns_path(filename, '.parquet'), columns, digest)
+        written.append(columns_path(filename, '.parquet'))
+    return written
+
+
+def load_columns(path: str) -> Dict[str, 'np.ndarray']:
+    """Все колонки .npz в памяти (без sha256)"""
+    with np.load(path) as stored:
+        return {name: stored[name] for name in stored.files if name != 'sha256'}
+
+
+def decode(columns: Dict[str, 'np.ndarray'], name: str) -> 'np.ndarray':
+    """Словарную колонку - в строки (пустые - ''), остальные - как есть"""
+    if name not in DICTIONARY_COLUMNS:
+        return columns[name]
+    values = np.append(columns[f'{name}_values'], '')
+    return values[columns[name]]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    from snapshot_writer import read_manifest, read_snapshot
+
+    parser = argparse.ArgumentParser(description="Колоночная выгрузка снимков для аналитики")
+    parser.add_argument('files', nargs='+', help="JSON-снимки")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ Для колоночной выгрузки нужен numpy: pip install .[analytics]")
+        return False
+    for filename in args.files:
+        snapshot = read_snapshot(filename)
+        if snapshot is None:
+            print(f"❌ Не удалось прочитать {filename}")
+            return False
+        digest = (read_manifest(filename) or {}).get('sha256')
+        for path in export_columns(filename, snapshot.get('vacancies', []), digest):
+            print(f"🧱 {path}: {len(snapshot.get('vacancies', []))} строк, {os.path.getsize(path) // 1024} КБ")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
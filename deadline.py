@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бюджет времени запуска сборщика (--deadline)
+
+Задания GitHub Actions жёстко ограничены по времени, и убитый по таймауту
+скрипт не оставляет файла. С --deadline сборщик сам следит за остатком
+времени: перед каждым запросом проверяет, что после него ещё останется
+запас на разбор и запись (DEFAULT_RESERVE), а всё, что не успел,
+записывает как пропущенные сегменты. Следующий запуск берёт их первыми.
+
+Так же перед каждым запросом проверяется и бюджет запросов
+(--max-requests в tiered_refresh.py), если он задан.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from json_cache import cache_path, read_cache, write_cache
+
+# Запас на разбор, запись снимка и манифеста после последнего запроса (секунд)
+DEFAULT_RESERVE = 20.0
+
+# Пропущенные сегменты старше этого уже не приоритетны
+SKIPPED_TTL = 2 * 24 * 3600
+
+
+class Deadline:
+    """Остаток времени (и запросов) запуска и сегменты, на которые его не хватило"""
+
+    def __init__(self, seconds: Optional[float], reserve: float = DEFAULT_RESERVE,
+                 priority: Optional[List[Dict]] = None, max_requests: Optional[int] = None,
+                 requests_made: Optional[Callable[[], int]] = None):
+        self.seconds = seconds
+        self.reserve = reserve
+        self.started = time.monotonic()
+        # Бюджет запросов: requests_made - счётчик клиента (HHClient.requests_made)
+        self.max_requests = max_requests
+        self.requests_made = requests_made
+        self.requests_start = requests_made() if requests_made else 0
+        # Сегменты, пропущенные прошлым запуском, - их берём первыми
+        self.priority: List[Dict] = priority or []
+        # Метка текущей части работы (например, уровень tiered_refresh) для skip()
+        self.tag: Dict = {}
+        self.skipped: List[Dict] = []
+
+    def remaining(self) -> float:
+        if self.seconds is None:
+            return float('inf')
+        return self.seconds - (time.monotonic() - self.started)
+
+    def requests_left(self) -> float:
+        if self.max_requests is None or self.requests_made is None:
+            return float('inf')
+        return self.max_requests - (self.requests_made() - self.requests_start)
+
+    def allows(self, cost: float, requests: int = 1) -> bool:
+        """Успеем ли потратить cost секунд и requests запросов и всё ещё сохранить результат"""
+        return self.remaining() - self.reserve >= cost and self.requests_left() >= requests
+
+    def skip(self, segment: Dict):
+        self.skipped.append(dict(self.tag, **segment))
+
+    def is_priority(self, segment: Dict) -> bool:
+        return dict(self.tag, **segment) in self.priority
+
+
+def skipped_file(output: str) -> str:
+    stem = os.path.splitext(os.path.basename(output))[0]
+    return cache_path(f"skipped_{stem}.json")
+
+
+def load_skipped(output: str) -> List[Dict]:
+    """Сегменты, пропущенные прошлым запуском для этого файла"""
+    cached = read_cache(skipped_file(output), SKIPPED_TTL)
+    return (cached or {}).get('segments', [])
+
+
+def save_skipped(output: str, segments: List[Dict]):
+    write_cache(skipped_file(output), {'segments': segments})
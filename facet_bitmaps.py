@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Битовые индексы фасетов для фильтров вида "удалёнка + 1-3 года + от X ₽
++ Москва или Петербург + без теста" (<имя>.facets.json)
+
+Каждая запись снимка получает плотный номер (позиция в 'vacancies'), и
+для каждого значения фасета строится битовая карта номеров:
+    schedule, experience, employment, area - по значению поля;
+    premium, has_test                      - 'true' / 'false';
+    salary                                 - полоса верхней границы вилки
+                                             в рублях (SALARY_BANDS) или 'none'.
+Рядом - salary_top: верхняя граница вилки каждой записи в целых рублях
+(null - без зарплаты), чтобы порог внутри полосы проверялся точно.
+Фильтр - OR карт внутри фасета и AND между фасетами; счётчики всех
+значений всех фасетов считаются тем же проходом: для фасета берётся
+пересечение фильтров остальных фасетов (как в боковой панели поиска -
+выбор в фасете не обнуляет его соседние значения).
+
+В памяти карта - целое число Python (побитовые операции идут в C). В
+файле для сайта каждая карта записана в более коротком из двух видов:
+    {"a": [n0, d1, d2, ...]} - номера: первый и разности между соседними;
+    {"b": "<base64>"}        - биты little-endian: номер i - бит i % 8
+                               байта i // 8.
+Этот же индекс использует read_api.py.
+
+Пример:
+    python facet_bitmaps.py hh_vacancies.json                      # пересобрать facets
+    python facet_bitmaps.py hh_vacancies.json --filter schedule=Удаленная\\ работа --filter has_test=false
+"""
+
+import argparse
+import base64
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vacancy_fields import salary_rub_range
+
+STRING_FACETS = ('schedule', 'experience', 'employment', 'area')
+FLAG_FACETS = ('premium', 'has_test')
+FACETS = STRING_FACETS + FLAG_FACETS + ('salary',)
+
+# Границы полос зарплаты (верхняя граница вилки в рублях)
+SALARY_BANDS = (50_000, 100_000, 150_000, 200_000, 300_000)
+NO_SALARY = 'none'
+
+# Номера единичных битов в каждом байте
+_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+_popcount = getattr(int, 'bit_count', None) or (lambda bitmap: bin(bitmap).count('1'))
+
+
+def popcount(bitmap: int) -> int:
+    """Число единичных битов карты"""
+    return _popcount(bitmap)
+
+
+def from_ordinals(numbers: Iterable[int], size: int) -> int:
+    """Карта из номеров записей"""
+    data = bytearray((size + 7) // 8)
+    for number in numbers:
+        data[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(data, 'little')
+
+
+def ordinals(bitmap: int) -> List[int]:
+    """Номера единичных битов по возрастанию"""
+    result: List[int] = []
+    for index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')):
+        if byte:
+            base = index * 8
+            result.extend(base + bit for bit in _BITS[byte])
+    return result
+
+
+def band_labels() -> List[str]:
+    """Подписи полос зарплаты: '0-50000', ..., '300000+', 'none'"""
+    edges = (0,) + SALARY_BANDS
+    return [f"{low}-{high}" for low, high in zip(edges, edges[1:])] + [f"{SALARY_BANDS[-1]}+", NO_SALARY]
+
+
+def salary_band(top: Optional[float]) -> str:
+    """Полоса для верхней границы вилки (None - без зарплаты)"""
+    if top is None:
+        return NO_SALARY
+    labels = band_labels()
+    for number, edge in enumerate(SALARY_BANDS):
+        if top < edge:
+            return labels[number]
+    return labels[len(SALARY_BANDS)]
+
+
+def facet_value(vacancy: Dict, facet: str) -> str:
+    """Значение фасета у вакансии ('' - нет значения)"""
+    if facet in FLAG_FACETS:
+        return 'true' if vacancy.get(facet) else 'false'
+    return vacancy.get(facet) or ''
+
+
+class FacetIndex:
+    """Карты фасетов одного снимка"""
+
+    def __init__(self, size: int, bitmaps: Dict[str, Dict[str, int]], salary_top: Optional[List] = None):
+        self.size = size
+        self.all = (1 << size) - 1
+        self.bitmaps = bitmaps
+        # Значение фасета без учёта регистра -> как записано
+        self._names = {facet: {value.lower(): value for value in values} for facet, values in bitmaps.items()}
+        self.salary_top = salary_top
+
+    @classmethod
+    def from_vacancies(cls, vacancies: List[Dict]) -> 'FacetIndex':
+        members: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        salary_top = []
+        for number, vacancy in enumerate(vacancies):
+            for facet in STRING_FACETS + FLAG_FACETS:
+                value = facet_value(vacancy, facet)
+                if value:
+                    members[facet].setdefault(value, []).append(number)
+            bounds = salary_rub_range(vacancy)
+            salary_top.append(bounds[1] if bounds else None)
+            members['salary'].setdefault(salary_band(salary_top[-1]), []).append(number)
+        size = len(vacancies)
+        bitmaps = {facet: {value: from_ordinals(numbers, size) for value, numbers in values.items()}
+                   for facet, values in members.items()}
+        return cls(size, bitmaps, salary_top)
+
+    def value_bitmap(self, facet: str, value: str) -> int:
+        """Карта значения фасета без учёта регистра (0, если значения нет)"""
+        name = self._names.get(facet, {}).get(value.lower())
+        return self.bitmaps[facet][name] if name is not None else 0
+
+    def salary_at_least(self, threshold: float) -> int:
+        """
+        Вилка доходит до threshold: целые полосы выше порога и точная проверка в полосе порога
+
+        Без salary_top (индекс без верхних границ вилок) полоса порога
+        берётся целиком - это надмножество точного ответа.
+        """
+        edges = (0,) + SALARY_BANDS
+        labels = band_labels()
+        bitmap = 0
+        for number, low in enumerate(edges):
+            band = self.bitmaps['salary'].get(labels[number], 0)
+            if low >= threshold:
+                bitmap |= band
+            elif number == len(edges) - 1 or edges[number + 1] > threshold:
+                if self.salary_top is None:  # верхних границ нет: полоса порога целиком
+                    bitmap |= band
+                else:
+                    exact = [n for n in ordinals(band) if self.salary_top[n] >= threshold]
+                    bitmap |= from_ordinals(exact, self.size)
+        return bitmap
+
+    def _selections(self, filters: Dict[str, Iterable[str]]) -> Dict[str, int]:
+        """Фасет -> OR карт выбранных значений"""
+        return {facet: _or(self.value_bitmap(facet, value) for value in values)
+                for facet, values in filters.items() if facet in self.bitmaps and values}
+
+    def select(self, filters: Dict[str, Iterable[str]], extra: Iterable[int] = ()) -> int:
+        """AND выбранных фасетов (и дополнительных карт, например salary_at_least)"""
+        bitmap = self.all
+        for selection in list(self._selections(filters).values()) + list(extra):
+            bitmap &= selection
+        return bitmap
+
+    def query(self, filters: Dict[str, Iterable[str]], extra: Iterable[int] = ()) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Подходящие записи и счётчики всех фасетов за один проход
+
+        Счётчик значения фасета F - сколько записей прошло бы фильтры всех
+        фасетов, кроме F, и имеет это значение.
+        """
+        selections = self._selections(filters)
+        common = self.all
+        for bitmap in extra:
+            common &= bitmap
+        counts = {}
+        for facet, values in self.bitmaps.items():
+            base = common
+            for other, selection in selections.items():
+                if other != facet:
+                    base &= selection
+            counts[facet] = {value: popcount(base & bitmap) for value, bitmap in values.items()}
+        matched = common
+        for selection in selections.values():
+            matched &= selection
+        return matched, counts
+
+    def to_json(self) -> Dict:
+        """Данные <имя>.facets.json"""
+        return {
+            'count': self.size,
+            'salary_bands': list(SALARY_BANDS),
+            'salary_top': [None if top is None else math.floor(top) for top in self.salary_top or []],
+            'facets': {facet: {value: encode_bitmap(bitmap) for value, bitmap in sorted(values.items())}
+                       for facet, values in self.bitmaps.items()}
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'FacetIndex':
+        """Индекс из <имя>.facets.json"""
+        size = data['count']
+        bitmaps = {facet: {value: decode_bitmap(encoded, size) for value, encoded in values.items()}
+                   for facet, values in data['facets'].items()}
+        return cls(size, bitmaps, data.get('salary_top') or None)
+
+
+def _or(bitmaps: Iterable[int]) -> int:
+    result = 0
+    for bitmap in bitmaps:
+        result |= bitmap
+    return result
+
+
+def encode_bitmap(bitmap: int) -> Dict:
+    """Более короткий из видов: разности номеров или base64 битов"""
+    numbers = ordinals(bitmap)
+    deltas = [b - a for a, b in zip([0] + numbers, numbers)]
+    as_bits = base64.b64encode(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')).decode('ascii')
+    array_length = sum(len(str(delta)) + 1 for delta in deltas)
+    return {'a': deltas} if array_length <= len(as_bits) else {'b': as_bits}
+
+
+def decode_bitmap(encoded: Dict, size: int) -> int:
+    """Обратно к encode_bitmap"""
+    if 'b' in encoded:
+        return int.from_bytes(base64.b64decode(encoded['b']), 'little')
+    numbers, position = [], 0
+    for delta in encoded['a']:
+        position += delta
+        numbers.append(position)
+    return from_ordinals(numbers, size)
+
+
+def build_facets(vacancies: List[Dict]) -> Dict:
+    """Данные <имя>.facets.json"""
+    return FacetIndex.from_vacancies(vacancies).to_json()
+
+
+def parse_filters(pairs: List[str]) -> Dict[str, List[str]]:
+    """['area=Москва', 'area=Казань', 'has_test=false'] -> {'area': [...], 'has_test': [...]}"""
+    filters: Dict[str, List[str]] = {}
+    for pair in pairs:
+        facet, _, value = pair.partition('=')
+        filters.setdefault(facet, []).append(value)
+    return filters
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    from snapshot_writer import read_snapshot, write_exports
+
+    parser = argparse.ArgumentParser(description="Битовые индексы фасетов снимка")
+    parser.add_argument('files', nargs='+', help="JSON-снимки")
+    parser.add_argument('--filter', action='append', default=[], metavar='ФАСЕТ=ЗНАЧЕНИЕ',
+                        help="вместо пересборки - фильтр и счётчики (повтор фасета - ИЛИ)")
+    parser.add_argument('--salary-min', type=float)
+    args = parser.parse_args(argv)
+
+    for filename in args.files:
+        snapshot = read_snapshot(filename)
+        if snapshot is None:
+            print(f"❌ Не удалось прочитать {filename}")
+            return False
+        vacancies = snapshot.get('vacancies', [])
+        if not args.filter and args.salary_min is None:
+            for path in write_exports(filename, vacancies, only=['facets']):
+                print(f"🧮 {path}: {len(vacancies)} записей, фасетов {len(FACETS)}")
+            continue
+        index = FacetIndex.from_vacancies(vacancies)
+        extra = [index.salary_at_least(args.salary_min)] if args.salary_min is not None else []
+        matched, counts = index.query(parse_filters(args.filter), extra)
+        print(f"🧮 {filename}: подходит {popcount(matched)} из {index.size}")
+        for facet, values in counts.items():
+            top = sorted(values.items(), key=lambda item: -item[1])[:6]
+            print(f"   {facet}: " + ', '.join(f"{value} {count}" for value, count in top))
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Подсказки для фильтров сайта по компании, региону и роли (<имя>.suggest.json)
+
+Фильтры company, area и professional_roles на сайте просматривали все
+вакансии на каждое нажатие клавиши - на телефонах это тормозило. Теперь
+при записи снимка для каждого фасета строится префиксный индекс:
+    labels   - значения по убыванию числа вакансий (номер = место в рейтинге);
+    counts   - число вакансий у значения;
+    keys     - отсортированная таблица ключей: текст значения с начала
+               каждого слова (ООО «Ромашка» находится и по 'ром'), нижний
+               регистр, ё как е, не длиннее KEY_LENGTH символов;
+    refs     - номер значения для каждого ключа;
+    prefixes - отсортированные префиксы, под которыми больше TOP_K значений,
+    top      - и их TOP_K лучших номеров.
+Ответ на префикс: двоичный поиск в prefixes; если его там нет, под
+префиксом не больше TOP_K значений, и они берутся из диапазона keys,
+найденного тем же двоичным поиском. Так любой префикс - O(log n) без
+перебора записей.
+
+Пример:
+    python facet_suggest.py hh_vacancies.json                           # пересобрать suggest
+    python facet_suggest.py hh_vacancies.json --facet company --prefix ром
+"""
+
+import argparse
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# Подсказок на префикс
+TOP_K = 8
+
+# Ключи длиннее не нужны: после стольких букв вариантов уже единицы
+KEY_LENGTH = 24
+
+# Фасет -> поле вакансии (строка или список строк)
+FACETS = ('company', 'area', 'professional_roles')
+
+WORD_START_RE = re.compile(r'(?<!\w)\w')
+
+
+def normalize(text: str) -> str:
+    """Нижний регистр, ё как е (так же нормализует префикс сайт)"""
+    return text.lower().replace('ё', 'е')
+
+
+def facet_values(vacancy: Dict, facet: str) -> List[str]:
+    value = vacancy.get(facet)
+    values = value if isinstance(value, list) else [value]
+    return list(dict.fromkeys(v.strip() for v in values if isinstance(v, str) and v.strip()))
+
+
+def build_facet(vacancies: List[Dict], facet: str, top_k: int = TOP_K) -> Dict:
+    """Префиксный индекс одного фасета"""
+    counts: Dict[str, int] = {}
+    for vacancy in vacancies:
+        for label in facet_values(vacancy, facet):
+            counts[label] = counts.get(label, 0) + 1
+    labels = sorted(counts, key=lambda label: (-counts[label], normalize(label), label))
+
+    keys = []
+    # Префикс -> первые top_k + 1 номеров; номера идут по возрастанию, т.е. по рейтингу
+    leaders: Dict[str, List[int]] = {}
+    for number, label in enumerate(labels):
+        text = normalize(label)
+        for match in WORD_START_RE.finditer(text):
+            key = text[match.start():match.start() + KEY_LENGTH]
+            keys.append((key, number))
+            for length in range(len(key) + 1):
+                listed = leaders.setdefault(key[:length], [])
+                if len(listed) <= top_k and (not listed or listed[-1] != number):
+                    listed.append(number)
+    keys = sorted(set(keys))
+    heavy = sorted(prefix for prefix, listed in leaders.items() if len(listed) > top_k)
+    return {
+        'labels': labels,
+        'counts': [counts[label] for label in labels],
+        'keys': [key for key, _ in keys],
+        'refs': [number for _, number in keys],
+        'prefixes': heavy,
+        'top': [leaders[prefix][:top_k] for prefix in heavy]
+    }
+
+
+def build_suggest(vacancies: List[Dict]) -> Dict:
+    """Индексы всех FACETS для <имя>.suggest.json (без почти-дублей)"""
+    distinct = [v for v in vacancies if not v.get('duplicate_of')]
+    return {
+        'count': len(distinct),
+        'top_k': TOP_K,
+        'key_length': KEY_LENGTH,
+        'facets': {facet: build_facet(distinct, facet) for facet in FACETS}
+    }
+
+
+def complete(index: Dict, prefix: str, limit: int = TOP_K) -> List[Dict]:
+    """Подсказки по префиксу: [{'label', 'count'}] по убыванию числа вакансий"""
+    prefix = normalize(prefix.lstrip())[:KEY_LENGTH]
+    position = bisect_left(index['prefixes'], prefix)
+    if position < len(index['prefixes']) and index['prefixes'][position] == prefix:
+        numbers = index['top'][position]
+    else:
+        keys = index['keys']
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + '\U0010ffff', start)
+        numbers = sorted(set(index['refs'][start:end]))
+    return [{'label': index['labels'][n], 'count': index['counts'][n]} for n in numbers[:limit]]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    from snapshot_writer import read_snapshot, sidecar_path, write_exports
+
+    parser = argparse.ArgumentParser(description="Префиксные подсказки для фильтров сайта")
+    parser.add_argument('files', nargs='+', help="JSON-снимки")
+    parser.add_argument('--facet', choices=FACETS, default='company')
+    parser.add_argument('--prefix', help="вместо пересборки - подсказки по префиксу")
+    args = parser.parse_args(argv)
+
+    for filename in args.files:
+        snapshot = read_snapshot(filename)
+        if snapshot is None:
+            print(f"❌ Не удалось прочитать {filename}")
+            return False
+        vacancies = snapshot.get('vacancies', [])
+        if args.prefix is None:
+            for path in write_exports(filename, vacancies, only=['suggest']):
+                sizes = ', '.join(f"{facet} {len(data['labels'])}"
+                                  for facet, data in read_snapshot(path)['facets'].items())
+                print(f"🔤 {path}: {sizes}")
+            continue
+        index = read_snapshot(sidecar_path(filename, 'suggest')) or build_suggest(vacancies)
+        print(f"🔤 {filename}, {args.facet} '{args.prefix}':")
+        for row in complete(index['facets'][args.facet], args.prefix):
+            print(f"   {row['count']:5d}  {row['label']}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
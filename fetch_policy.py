@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Политики запросов к API: хеджирование медленных запросов и circuit breaker
+
+LatencyTracker хранит окно последних задержек по каждому эндпоинту.
+Если ответ не пришёл за наблюдаемый p95, HHClient отправляет дубликат
+запроса (hedge), и побеждает первый ответ. Доля дубликатов ограничена
+HEDGE_BUDGET, чтобы хвостовые задержки не удваивали нагрузку на API.
+
+CircuitBreaker размыкается после нескольких ошибок подряд (таймауты,
+5xx, 429) и какое-то время отклоняет запросы к эндпоинту, не тратя на
+них бюджет времени. После паузы пропускается один пробный запрос
+(half-open): успех замыкает цепь, ошибка размыкает её снова.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Окно задержек для расчёта p95 и минимум замеров до первого хеджа
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+
+# Не хеджируем раньше этой задержки и не чаще этой доли запросов
+HEDGE_MIN_DELAY = 0.2
+HEDGE_BUDGET = 0.1
+
+# Ошибок подряд до размыкания и пауза до пробного запроса
+BREAKER_FAILURES = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half-open'
+
+# Счётчики, которые сравниваются между запусками (stats_since)
+COUNTERS = ('requests', 'failures', 'hedged', 'hedge_wins', 'breaker_opened', 'breaker_rejected')
+
+
+class LatencyTracker:
+    """Окно последних задержек одного эндпоинта"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Перцентиль по окну или None, если замеров слишком мало"""
+        with self._lock:
+            if len(self.samples) < LATENCY_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Через сколько секунд отправлять дубликат или None, пока нет статистики"""
+        p95 = self.percentile(HEDGE_PERCENTILE)
+        if p95 is None:
+            return None
+        return max(p95, HEDGE_MIN_DELAY)
+
+
+class CircuitBreaker:
+    """Circuit breaker одного эндпоинта: closed -> open -> half-open -> closed"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURES,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Можно ли отправить запрос; в half-open пропускает один пробный"""
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    self.times_opened += 1
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == STATE_OPEN
+
+
+class EndpointPolicy:
+    """Задержки, счётчики и circuit breaker одного эндпоинта"""
+
+    def __init__(self):
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def may_hedge(self) -> bool:
+        """Не превышен ли бюджет дубликатов HEDGE_BUDGET"""
+        with self._lock:
+            return self.counters['hedged'] < max(1, self.counters['requests'] * HEDGE_BUDGET)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+        stats['breaker_opened'] = self.breaker.times_opened
+        stats['breaker_rejected'] = self.breaker.rejected
+        stats['breaker_state'] = self.breaker.state
+        p95 = self.latency.percentile(HEDGE_PERCENTILE)
+        stats['p95'] = round(p95, 3) if p95 is not None else None
+        return stats
+
+
+def stats_since(before: Dict[str, Dict], after: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Статистика за один запуск: разница счётчиков двух снимков HHClient.fetch_stats()"""
+    result = {}
+    for path, stats in after.items():
+        previous = before.get(path, {})
+        delta = {name: stats[name] - previous.get(name, 0) for name in COUNTERS}
+        if any(delta.values()):
+            delta['breaker_state'] = stats['breaker_state']
+            delta['p95'] = stats['p95']
+            result[path] = delta
+    return result
+
+
+def print_fetch_stats(stats: Dict[str, Dict]):
+    """Выводит статистику хеджирования и circuit breaker по эндпоинтам"""
+    for path, s in stats.items():
+        p95 = f"{s['p95']:.2f} с" if s['p95'] is not None else "-"
+        print(f"   {path}: запросов {s['requests']}, ошибок {s['failures']}, p95 {p95}, "
+              f"дубликатов {s['hedged']} (выиграли {s['hedge_wins']}), "
+              f"размыканий {s['breaker_opened']}, отклонено {s['breaker_rejected']}, "
+              f"цепь {s['breaker_state']}")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пространственный индекс вакансий по координатам адреса (<имя>.geo.json)
+
+Фильтр по area слишком груб для Москвы и Петербурга, где большая часть
+вакансий. parse_vacancy сохраняет address.lat/lng HH в поля lat/lng, а
+при записи снимка рядом кладётся сетка: ячейки CELL_DEG x CELL_DEG
+градусов -> индексы вакансий в 'vacancies'.
+
+Запрос "в радиусе R км от точки" или "в прямоугольнике" перебирает
+только ячейки, пересекающие область, и точно проверяет расстояние лишь
+у попавших в них вакансий - время зависит от площади запроса, а не от
+размера снимка. Тот же индекс строят в памяти read_api.py (параметры
+lat, lng, radius_km и bbox) и сайт - по ключам ячеек "строка:столбец",
+где строка = floor(lat / cell_deg), столбец = floor(lng / cell_deg).
+
+Пример:
+    python geo_index.py hh_vacancies.json                        # пересобрать geo рядом со снимком
+    python geo_index.py hh_vacancies.json --near 55.75,37.62 --radius 3
+"""
+
+import argparse
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vacancy_fields import vacancy_point
+
+# Размер ячейки в градусах (~5.5 км по широте)
+CELL_DEG = 0.05
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def cell_of(lat: float, lng: float, cell_deg: float = CELL_DEG) -> Tuple[int, int]:
+    return math.floor(lat / cell_deg), math.floor(lng / cell_deg)
+
+
+def cell_key(row: int, col: int) -> str:
+    return f"{row}:{col}"
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Расстояние по большому кругу (гаверсинус)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """Сетка по координатам: ячейка -> номера записей"""
+
+    def __init__(self, points: Iterable[Tuple[int, Optional[Tuple[float, float]]]], cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self.points: Dict[int, Tuple[float, float]] = {}
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for number, point in points:
+            if point is None:
+                continue
+            self.points[number] = point
+            self.cells.setdefault(cell_of(*point, cell_deg), []).append(number)
+
+    @classmethod
+    def from_vacancies(cls, vacancies: List[Dict], cell_deg: float = CELL_DEG) -> 'GeoIndex':
+        return cls(((number, vacancy_point(v)) for number, v in enumerate(vacancies)), cell_deg)
+
+    def _cells_in(self, south: float, west: float, north: float, east: float) -> Iterator[List[int]]:
+        """Списки номеров в ячейках, пересекающих прямоугольник (без перехода через 180°)"""
+        row_min, col_min = cell_of(south, west, self.cell_deg)
+        row_max, col_max = cell_of(north, east, self.cell_deg)
+        # Огромная область: дешевле пройти по занятым ячейкам
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self.cells):
+            for (row, col), numbers in self.cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    yield numbers
+            return
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_max + 1):
+                numbers = self.cells.get((row, col))
+                if numbers:
+                    yield numbers
+
+    def within_bbox(self, south: float, west: float, north: float, east: float) -> List[int]:
+        """Номера записей в прямоугольнике; west > east - прямоугольник через 180-й меридиан"""
+        spans = [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+        found = []
+        for span_west, span_east in spans:
+            for numbers in self._cells_in(south, span_west, north, span_east):
+                for number in numbers:
+                    lat, lng = self.points[number]
+                    if south <= lat <= north and span_west <= lng <= span_east:
+                        found.append(number)
+        return sorted(found)
+
+    def within_radius(self, lat: float, lng: float, radius_km: float) -> List[Tuple[float, int]]:
+        """(расстояние в км, номер) записей в радиусе, ближние первыми"""
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlng = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+        south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        if dlng >= 180:
+            west, east = -180.0, 180.0
+        else:
+            west, east = lng - dlng, lng + dlng
+            west = west + 360 if west < -180 else west
+            east = east - 360 if east > 180 else east
+        found = []
+        for number in self.within_bbox(south, west, north, east):
+            distance = distance_km(lat, lng, *self.points[number])
+            if distance <= radius_km:
+                found.append((distance, number))
+        found.sort()
+        return found
+
+
+def build_geo_index(vacancies: List[Dict]) -> Dict:
+    """Сетка для <имя>.geo.json: ключ ячейки -> индексы в 'vacancies' снимка"""
+    index = GeoIndex.from_vacancies(vacancies)
+    return {
+        'count': len(vacancies),
+        'located': len(index.points),
+        'cell_deg': index.cell_deg,
+        'cells': {cell_key(*cell): numbers for cell, numbers in sorted(index.cells.items())}
+    }
+
+
+def _pair(value: str) -> Tuple[float, float]:
+    lat, lng = value.split(',')
+    return float(lat), float(lng)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    from snapshot_writer import read_snapshot, write_exports
+
+    parser = argparse.ArgumentParser(description="Пространственный индекс вакансий по адресам")
+    parser.add_argument('files', nargs='+', help="JSON-снимки")
+    parser.add_argument('--near', type=_pair, help="точка 'широта,долгота': вместо пересборки - поиск рядом")
+    parser.add_argument('--radius', type=float, default=5.0, help="радиус поиска, км")
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for filename in args.files:
+        snapshot = read_snapshot(filename)
+        if snapshot is None:
+            print(f"❌ Не удалось прочитать {filename}")
+            return False
+        vacancies = snapshot.get('vacancies', [])
+        if args.near is None:
+            for path in write_exports(filename, vacancies, only=['geo']):
+                located = sum(1 for v in vacancies if vacancy_point(v))
+                print(f"🗺️ {path}: {located} из {len(vacancies)} вакансий с координатами")
+            continue
+        found = GeoIndex.from_vacancies(vacancies).within_radius(*args.near, args.radius)
+        print(f"📍 {filename}: {len(found)} вакансий в радиусе {args.radius:g} км")
+        for distance, number in found[:args.limit]:
+            vacancy = vacancies[number]
+            print(f"   {distance:5.1f} км  {vacancy.get('name', '')} - {vacancy.get('company', '')}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
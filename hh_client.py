@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общий HTTP-клиент для API HH.ru
+
+Держит одну сессию (keep-alive) и берёт токен из общего для всех
+процессов бюджета запросов (rate_budget.py), чтобы вспомогательные
+инструменты не открывали новое соединение на каждый запрос и вместе не
+превышали лимиты API. Медленные страницы поиска
+хеджируются, а эндпоинт с ошибками подряд отключается circuit breaker'ом
+(см. fetch_policy.py).
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from fetch_policy import EndpointPolicy
+from json_codec import loads
+from rate_budget import RateBudget, hh_budget, shared_budget
+
+# API HH.ru (переопределяется для локальных стабов)
+API_URL = os.environ.get('HH_API_URL', "https://api.hh.ru")
+
+# Заголовки для запросов
+HEADERS = {
+    'User-Agent': 'VacancyAggregator/2.0 (https://gradelift.ru)'
+}
+
+# Задержка между запросами (в секундах) для API без общего бюджета HH;
+# для самого HH темп задаёт rate_budget.HH_RATE
+REQUEST_DELAY = 0.3
+
+# Таймаут одного запроса (в секундах)
+REQUEST_TIMEOUT = 30
+
+# Потоки для хеджированных запросов (основной + дубликат)
+HEDGE_WORKERS = 8
+
+
+def is_failure(error: Exception) -> bool:
+    """
+    Считается ли ошибка сбоем эндпоинта для circuit breaker
+
+    Таймауты, обрывы соединения, 5xx и 429 - сбой. Остальные 4xx (например,
+    400 за пределом выдачи) означают, что API отвечает нормально.
+    """
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, requests.exceptions.RequestException)
+
+
+def default_budget(base_url: str, request_delay: float) -> Optional[RateBudget]:
+    """Бюджет HH для API HH, для других хостов - свой общий бюджет по request_delay"""
+    if base_url.rstrip('/') == API_URL.rstrip('/'):
+        return hh_budget()
+    if request_delay <= 0:
+        return None
+    return shared_budget(urlsplit(base_url).netloc, 1 / request_delay)
+
+
+def retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Пауза из заголовка Retry-After (в секундах) или None"""
+    try:
+        return float(response.headers['Retry-After'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class HHClient:
+    """Клиент API с общей сессией и общим для процессов бюджетом запросов"""
+
+    def __init__(self, base_url: str = API_URL, headers: Optional[Dict] = None,
+                 request_delay: float = REQUEST_DELAY, timeout: float = REQUEST_TIMEOUT,
+                 session: Optional[requests.Session] = None,
+                 rate_budget: Optional[RateBudget] = None):
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers or HEADERS
+        self.request_delay = request_delay
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.rate_budget = rate_budget or default_budget(self.base_url, request_delay)
+        self.requests_made = 0
+        self._lock = threading.Lock()
+        self._policies: Dict[str, EndpointPolicy] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+    def policy(self, path: str) -> EndpointPolicy:
+        """Задержки, счётчики и circuit breaker эндпоинта"""
+        with self._lock:
+            if path not in self._policies:
+                self._policies[path] = EndpointPolicy()
+            return self._policies[path]
+
+    def circuit_open(self, path: str) -> bool:
+        """Разомкнут ли circuit breaker эндпоинта"""
+        return self.policy(path).breaker.is_open
+
+    def last_status(self) -> Optional[int]:
+        """
+        HTTP-статус последнего get_json в этом потоке
+
+        None - ответа не было (сеть, таймаут, разомкнутый circuit breaker),
+        по нему нельзя судить о выдаче.
+        """
+        return getattr(self._local, 'status', None)
+
+    def fetch_stats(self) -> Dict[str, Dict]:
+        """Накопленная статистика по эндпоинтам (см. fetch_policy.stats_since)"""
+        with self._lock:
+            policies = dict(self._policies)
+        return {path: policy.stats() for path, policy in policies.items()}
+
+    def _wait_turn(self):
+        """
+        Берёт токен из общего бюджета запросов, при необходимости дожидаясь его
+
+        Бюджет общий для потоков и процессов, поэтому при параллельных
+        запросах суммарный темп не превышает лимит.
+        """
+        with self._lock:
+            self.requests_made += 1
+        if self.rate_budget is not None:
+            self.rate_budget.acquire()
+
+    def _send(self, path: str, params: Optional[Dict]) -> Dict:
+        """Один HTTP-запрос без паузы; успешная задержка попадает в статистику"""
+        started = time.monotonic()
+        response = self.session.get(f"{self.base_url}{path}", params=params,
+                                    headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        data = loads(response.content)
+        self.policy(path).latency.add(time.monotonic() - started)
+        return data
+
+    def _send_hedge(self, path: str, params: Optional[Dict]) -> Dict:
+        """Дубликат запроса - тоже соблюдает общий темп"""
+        self._wait_turn()
+        return self._send(path, params)
+
+    def _send_hedged(self, path: str, params: Optional[Dict]) -> Dict:
+        """
+        Запрос с хеджированием: если ответа нет дольше p95, отправляется
+        дубликат, и возвращается первый успешный ответ
+        """
+        policy = self.policy(path)
+        delay = policy.latency.hedge_delay()
+        if delay is None:
+            return self._send(path, params)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS,
+                                                    thread_name_prefix='hh-hedge')
+        primary = self._executor.submit(self._send, path, params)
+        done, _ = wait([primary], timeout=delay)
+        if done or not policy.may_hedge():
+            return primary.result()
+
+        policy.count('hedged')
+        backup = self._executor.submit(self._send_hedge, path, params)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    data = future.result()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    error = e
+                    continue
+                if future is backup:
+                    policy.count('hedge_wins')
+                return data
+        raise error
+
+    def get_json(self, path: str, params: Optional[Dict] = None,
+                 quiet: bool = False, hedge: bool = False) -> Optional[Dict]:
+        """
+        Выполняет GET-запрос к API и возвращает разобранный JSON
+
+        Args:
+            path: Путь относительно base_url, например '/vacancies'
+            params: Параметры запроса
+            quiet: Не печатать ожидаемые ошибки (например, 400 за пределом выдачи)
+            hedge: Отправлять дубликат, если ответ дольше наблюдаемого p95
+
+        Returns:
+            Словарь с данными или None в случае ошибки
+            (в том числе при разомкнутом circuit breaker)
+        """
+        policy = self.policy(path)
+        self._local.status = None
+        if not policy.breaker.allow():
+            if not quiet:
+                print(f"   ⛔ {path}: circuit breaker разомкнут, запрос пропущен")
+            return None
+
+        self._wait_turn()
+        policy.count('requests')
+
+        try:
+            data = self._send_hedged(path, params) if hedge else self._send(path, params)
+            policy.breaker.record_success()
+            self._local.status = 200
+            return data
+        except requests.exceptions.RequestException as e:
+            response = getattr(e, 'response', None)
+            if response is not None:
+                self._local.status = response.status_code
+            if response is not None and response.status_code == 429 and self.rate_budget is not None:
+                # Лимит превышен - пауза для всех процессов, а не только для этого
+                self.rate_budget.backoff(retry_after(response))
+            if is_failure(e):
+                policy.count('failures')
+                policy.breaker.record_failure()
+            else:
+                policy.breaker.record_success()
+            if not quiet:
+                print(f"   ❌ Ошибка запроса {path}: {e}")
+            return None
+        except ValueError as e:
+            policy.count('failures')
+            policy.breaker.record_failure()
+            print(f"   ❌ Ошибка при разборе JSON ({path}): {e}")
+            return None
+
+    def search_vacancies(self, params: Dict, quiet: bool = False) -> Optional[Dict]:
+        """Одна страница поиска вакансий /vacancies (с хеджированием)"""
+        return self.get_json('/vacancies', params, quiet, hedge=True)
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+История вакансий: журнал событий только на дописывание и его уплотнение
+
+Снимки перезаписывают друг друга, поэтому раньше историю можно было
+восстановить только по ежечасным коммитам полного JSON. Теперь каждый
+сохранённый снимок сравнивается с текущим состоянием, и в журнал
+history/<снимок>/ дописываются только события:
+    opened  - вакансия появилась (или вернулась), fields - все поля;
+    changed - изменились поля, fields - только новые значения;
+    closed  - вакансия пропала из выдачи.
+
+Журнал - сегмент на день: events-ГГГГ-ММ-ДД.jsonl.gz, по строке JSON на
+событие. Каждая запись дописывает новый член gzip, старые байты не
+трогаются.
+
+Уплотнение применяет завершённые дни к состоянию state.json.gz: по
+каждому id текущие поля, интервалы «открыта» и число изменений (индекс
+по id). Дневные сегменты прошлых месяцев сливаются в месячные
+events-ГГГГ-ММ.jsonl.gz. Чтобы ответить на вопрос о прошлом, достаточно
+состояния и сегментов, которые в него ещё не вошли, - переигрывать
+снимки не нужно.
+
+Пример:
+    python history_store.py record hh_vacancies.json
+    python history_store.py open-on hh_vacancies.json 2026-10-01
+    python history_store.py time-to-close hh_vacancies.json --top 10
+    python history_store.py show hh_vacancies.json 98765432
+"""
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from vacancy_fields import MSK
+
+# Каталог журналов (коммитится вместе со снимками)
+HISTORY_DIR = os.environ.get('VACANCY_HISTORY_DIR', 'history')
+
+EVENT_OPENED = 'opened'
+EVENT_CHANGED = 'changed'
+EVENT_CLOSED = 'closed'
+
+SEGMENT_PREFIX = 'events-'
+SEGMENT_EXT = '.jsonl.gz'
+STATE_FILE = 'state.json.gz'
+
+
+def history_dir(filename: str) -> str:
+    """hh_vacancies.json -> history/hh_vacancies"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(HISTORY_DIR, stem)
+
+
+def segment_name(period: str) -> str:
+    return f"{SEGMENT_PREFIX}{period}{SEGMENT_EXT}"
+
+
+def segment_period(name: str) -> str:
+    """events-2026-10-19.jsonl.gz -> 2026-10-19"""
+    return name[len(SEGMENT_PREFIX):-len(SEGMENT_EXT)]
+
+
+def day_of(ts: float) -> str:
+    return datetime.fromtimestamp(ts, MSK).strftime('%Y-%m-%d')
+
+
+def list_segments(directory: str) -> List[str]:
+    """Имена сегментов в порядке времени (месячные раньше дневных того же месяца, дни - по дате)"""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    segments = [n for n in names if n.startswith(SEGMENT_PREFIX) and n.endswith(SEGMENT_EXT)]
+    return sorted(segments, key=lambda n: (segment_period(n)[:7], len(n), n))
+
+
+def read_segment(path: str) -> Iterator[Dict]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class HistoryState:
+    """Состояние вакансий на момент последнего применённого события"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        # id -> {'fields': {...}, 'intervals': [[открыта, закрыта или None]], 'changes': n}
+        self.vacancies: Dict[str, Dict] = data.get('vacancies', {})
+        # Сегменты, целиком вошедшие в состояние
+        self.segments: List[str] = data.get('segments', [])
+        self.last_ts: float = data.get('last_ts', 0)
+
+    def apply(self, event: Dict):
+        record = self.vacancies.get(event['id'])
+        if event['type'] == EVENT_OPENED:
+            if record is None:
+                record = self.vacancies[event['id']] = {'fields': {}, 'intervals': [], 'changes': 0}
+            record['fields'] = event['fields']
+            record['intervals'].append([event['ts'], None])
+        elif record is not None and event['type'] == EVENT_CHANGED:
+            record['fields'].update(event['fields'])
+            record['changes'] += 1
+        elif record is not None and event['type'] == EVENT_CLOSED:
+            record['intervals'][-1][1] = event['ts']
+        self.last_ts = max(self.last_ts, event['ts'])
+
+    def is_open(self, vacancy_id: str) -> bool:
+        record = self.vacancies.get(vacancy_id)
+        return bool(record and record['intervals'] and record['intervals'][-1][1] is None)
+
+    def open_at(self, ts: float) -> List[str]:
+        """id вакансий, открытых в момент ts"""
+        return [vacancy_id for vacancy_id, record in self.vacancies.items()
+                if any(start <= ts and (end is None or ts < end) for start, end in record['intervals'])]
+
+    def to_dict(self) -> Dict:
+        return {'vacancies': self.vacancies, 'segments': self.segments, 'last_ts': self.last_ts}
+
+
+def _read_state(directory: str) -> HistoryState:
+    try:
+        with gzip.open(os.path.join(directory, STATE_FILE), 'rt', encoding='utf-8') as f:
+            return HistoryState(json.load(f))
+    except (OSError, ValueError):
+        return HistoryState()
+
+
+def _write_gzip(path: str, text: str):
+    """Атомарная запись сжатого файла"""
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def load_state(directory: str) -> HistoryState:
+    """Уплотнённое состояние плюс сегменты, которые в него ещё не вошли"""
+    state = _read_state(directory)
+    for name in list_segments(directory):
+        if name not in state.segments:
+            for event in read_segment(os.path.join(directory, name)):
+                state.apply(event)
+    return state
+
+
+def diff_events(state: HistoryState, vacancies: List[Dict], ts: float) -> List[Dict]:
+    """События, которые переводят state в состояние снимка"""
+    events = []
+    seen = set()
+    for vacancy in vacancies:
+        vacancy_id = vacancy.get('id')
+        if not vacancy_id or vacancy_id in seen:
+            continue
+        seen.add(vacancy_id)
+        fields = {key: value for key, value in vacancy.items() if key != 'id'}
+        if not state.is_open(vacancy_id):
+            events.append({'id': vacancy_id, 'ts': ts, 'type': EVENT_OPENED, 'fields': fields})
+            continue
+        previous = state.vacancies[vacancy_id]['fields']
+        changed = {key: fields.get(key) for key in set(fields) | set(previous)
+                   if fields.get(key) != previous.get(key)}
+        if changed:
+            events.append({'id': vacancy_id, 'ts': ts, 'type': EVENT_CHANGED, 'fields': changed})
+
+    for vacancy_id in state.vacancies:
+        if vacancy_id not in seen and state.is_open(vacancy_id):
+            events.append({'id': vacancy_id, 'ts': ts, 'type': EVENT_CLOSED})
+    return events
+
+
+def append_events(directory: str, events: List[Dict], ts: float):
+    """Дописывает события в сегмент дня новым членом gzip"""
+    if not events:
+        return
+    os.makedirs(directory, exist_ok=True)
+    lines = ''.join(json.dumps(event, ensure_ascii=False, sort_keys=True) + '\n' for event in events)
+    with gzip.open(os.path.join(directory, segment_name(day_of(ts))), 'at', encoding='utf-8') as f:
+        f.write(lines)
+
+
+def compact(directory: str, now: Optional[float] = None) -> Dict:
+    """
+    Применяет завершённые дни к состоянию и сливает дни прошлых месяцев
+
+    Сегмент текущего дня ещё дописывается, поэтому в состояние не входит.
+
+    Returns:
+        {'applied': сегментов применено, 'merged': дневных сегментов слито}
+    """
+    today = day_of(now or time.time())
+    state = _read_state(directory)
+    applied = 0
+    for name in list_segments(directory):
+        if name not in state.segments and segment_period(name) != today:
+            for event in read_segment(os.path.join(directory, name)):
+                state.apply(event)
+            state.segments.append(name)
+            applied += 1
+
+    # Дни прошлых месяцев -> один месячный сегмент
+    months: Dict[str, List[str]] = {}
+    for name in list_segments(directory):
+        month = segment_period(name)[:7]
+        if month != today[:7] and name in state.segments:
+            months.setdefault(month, []).append(name)
+    merged = 0
+    for month, names in months.items():
+        days = [name for name in names if len(segment_period(name)) > len(month)]
+        if not days:
+            continue
+        target = segment_name(month)
+        text = ''.join(json.dumps(event, ensure_ascii=False, sort_keys=True) + '\n'
+                       for name in names for event in read_segment(os.path.join(directory, name)))
+        _write_gzip(os.path.join(directory, target), text)
+        state.segments = [name for name in state.segments if name not in names] + [target]
+        merged += len(days)
+        # Состояние должно знать о месячном сегменте раньше, чем пропадут дневные
+        _write_gzip(os.path.join(directory, STATE_FILE), json.dumps(state.to_dict(), ensure_ascii=False))
+        for name in days:
+            os.remove(os.path.join(directory, name))
+
+    if applied:
+        _write_gzip(os.path.join(directory, STATE_FILE), json.dumps(state.to_dict(), ensure_ascii=False))
+    return {'applied': applied, 'merged': merged}
+
+
+def record_history(filename: str, vacancies: List[Dict], ts: Optional[float] = None) -> Dict:
+    """
+    Записывает изменения снимка в журнал и уплотняет завершённые дни
+
+    Returns:
+        Число событий по типам
+    """
+    ts = int(ts or time.time())
+    directory = history_dir(filename)
+    compact(directory, ts)
+    events = diff_events(load_state(directory), vacancies, ts)
+    append_events(directory, events, ts)
+    counts = dict.fromkeys((EVENT_OPENED, EVENT_CHANGED, EVENT_CLOSED), 0)
+    for event in events:
+        counts[event['type']] += 1
+    print(f"📜 История {directory}: появилось {counts[EVENT_OPENED]}, "
+          f"изменилось {counts[EVENT_CHANGED]}, закрыто {counts[EVENT_CLOSED]}")
+    return counts
+
+
+def time_to_close(state: HistoryState) -> Dict[str, List[float]]:
+    """Компания -> сколько дней были открыты её закрытые вакансии"""
+    by_company: Dict[str, List[float]] = {}
+    for record in state.vacancies.values():
+        company = record['fields'].get('company') or '—'
+        for start, end in record['intervals']:
+            if end is not None:
+                by_company.setdefault(company, []).append((end - start) / 86400)
+    return by_company
+
+
+def vacancy_events(directory: str, vacancy_id: str) -> Iterator[Dict]:
+    for name in list_segments(directory):
+        for event in read_segment(os.path.join(directory, name)):
+            if event['id'] == vacancy_id:
+                yield event
+
+
+def _format_ts(ts: Optional[float]) -> str:
+    return datetime.fromtimestamp(ts, MSK).strftime('%Y-%m-%d %H:%M') if ts else 'открыта'
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Журнал изменений вакансий")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="записать изменения JSON-снимков в журнал")
+    record.add_argument('files', nargs='+')
+
+    compact_cmd = commands.add_parser('compact', help="уплотнить журнал снимка")
+    compact_cmd.add_argument('snapshot')
+
+    open_on = commands.add_parser('open-on', help="вакансии, открытые в момент времени")
+    open_on.add_argument('snapshot')
+    open_on.add_argument('date', help="дата или время ISO")
+    open_on.add_argument('--limit', type=int, default=20)
+
+    closing = commands.add_parser('time-to-close', help="сколько дней вакансии компаний открыты до закрытия")
+    closing.add_argument('snapshot')
+    closing.add_argument('--top', type=int, default=20)
+
+    show = commands.add_parser('show', help="история одной вакансии")
+    show.add_argument('snapshot')
+    show.add_argument('id')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        for filename in args.files:
+            with open(filename, 'r', encoding='utf-8') as f:
+                record_history(filename, json.load(f).get('vacancies', []))
+        return True
+
+    directory = history_dir(args.snapshot)
+    if args.command == 'compact':
+        result = compact(directory)
+        print(f"🗜️ {directory}: применено сегментов {result['applied']}, "
+              f"дневных слито в месячные {result['merged']}")
+        return True
+
+    state = load_state(directory)
+    if args.command == 'open-on':
+        moment = datetime.fromisoformat(args.date)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=MSK)
+        ids = state.open_at(moment.timestamp())
+        print(f"📅 Открыто на {args.date}: {len(ids)} вакансий")
+        for vacancy_id in ids[:args.limit]:
+            fields = state.vacancies[vacancy_id]['fields']
+            print(f"   {vacancy_id}  {fields.get('name', '')} - {fields.get('company', '')}")
+        return True
+
+    if args.command == 'time-to-close':
+        by_company = time_to_close(state)
+        rows = sorted(by_company.items(), key=lambda item: len(item[1]), reverse=True)[:args.top]
+        print(f"{'компания':40s} {'закрыто':>8s} {'медиана, дн':>12s}")
+        for company, days in rows:
+            print(f"{company[:40]:40s} {len(days):8d} {statistics.median(days):12.1f}")
+        return True
+
+    record = state.vacancies.get(args.id)
+    if record is None:
+        print(f"❌ Вакансии {args.id} нет в истории")
+        return False
+    print(f"{record['fields'].get('name', '')} - {record['fields'].get('company', '')}")
+    for start, end in record['intervals']:
+        print(f"   открыта {_format_ts(start)} → {_format_ts(end)}")
+    for event in vacancy_events(directory, args.id):
+        if event['type'] == EVENT_CHANGED:
+            print(f"   {_format_ts(event['ts'])} изменено: {', '.join(sorted(event['fields']))}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
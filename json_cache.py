@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Простые файловые JSON-кэши с TTL для вспомогательных инструментов
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+# Каталог для кэшей (в GitHub Actions сохраняется через actions/cache)
+CACHE_DIR = os.environ.get('VACANCY_CACHE_DIR', '.cache')
+
+
+def cache_path(name: str) -> str:
+    """Путь к файлу кэша внутри CACHE_DIR"""
+    return os.path.join(CACHE_DIR, name)
+
+
+def read_cache(path: str, ttl: float) -> Optional[Dict]:
+    """Читает JSON-кэш, если он существует и не старше ttl секунд"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - cached.get('fetched_at', 0) > ttl:
+        return None
+    return cached
+
+
+def write_cache(path: str, data: Dict):
+    """Атомарно записывает JSON-кэш, проставляя fetched_at"""
+    data.setdefault('fetched_at', time.time())
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
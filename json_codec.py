@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Кодек JSON для страниц API и снимков: orjson, если установлен, иначе json
+
+Разбор страниц и запись снимков - самые частые операции с JSON. orjson
+разбирает прямо из байтов ответа (без промежуточной str) и кодирует в
+несколько раз быстрее стандартного json.
+
+Вывод обоих бэкендов совпадает байт в байт (ensure_ascii=False, отступ 2,
+разделители как у json). orjson расходится с json в двух местах, и в
+обоих случаях объект перекодируется через json:
+    - float в экспоненциальной форме (1e+16 у json против 1e16) - числа
+      в готовом выводе проверяются по тексту;
+    - NaN и ±Infinity: json пишет NaN / Infinity, orjson - null. Если в
+      выводе есть null, он разбирается обратно и сравнивается с исходным
+      объектом (сравнение идёт в C; кортежи при этом тоже уходят в json -
+      медленнее, но вывод тот же).
+Из-за этого манифест и хэш снимка не зависят от того, где шёл запуск.
+
+Бэкенд можно зафиксировать переменной VACANCY_JSON_CODEC=json.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get('VACANCY_JSON_CODEC') == 'json':
+    orjson = None
+
+BACKEND = 'orjson' if orjson else 'json'
+
+# Формы float, которые orjson пишет иначе, чем json: экспонента (1e16 против
+# 1e+16, 1e-7 против 1e-07) и малые числа (0.00001 против 1e-05). Цифры
+# маскируются в '0', и дальше хватает быстрого поиска подстроки.
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_SUSPICIOUS = (b'0e', b'0E', b'0.0000')
+_NUMBER_CHARS = frozenset(b'0123456789.-+eE')
+_BEFORE_NUMBER = frozenset(b' \n:,[')
+_AFTER_NUMBER = frozenset(b' \n,]}')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Разбирает JSON из байтов (предпочтительно) или строки"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+    return text.encode('utf-8')
+
+
+def _token_at(data: bytes, position: int) -> bytes:
+    """Числовой токен вокруг position или b'', если это текст внутри строки"""
+    start = end = position
+    while start > 0 and data[start - 1] in _NUMBER_CHARS:
+        start -= 1
+    while end < len(data) and data[end] in _NUMBER_CHARS:
+        end += 1
+    if (start and data[start - 1] not in _BEFORE_NUMBER) or (end < len(data) and data[end] not in _AFTER_NUMBER):
+        return b''
+    return data[start:end]
+
+
+def _floats_match(data: bytes) -> bool:
+    """Все float в выводе orjson записаны так же, как записал бы json"""
+    masked = data.translate(_DIGITS_TO_ZERO)
+    for pattern in _SUSPICIOUS:
+        position = masked.find(pattern)
+        while position != -1:
+            token = _token_at(data, position)
+            if token:
+                try:
+                    if repr(float(token)).encode() != token:
+                        return False
+                except ValueError:
+                    pass
+            position = masked.find(pattern, position + 1)
+    return True
+
+
+def _nulls_match(obj: Any, data: bytes) -> bool:
+    """Каждый null в выводе orjson - это None, а не NaN или ±Infinity"""
+    return b'null' not in data or orjson.loads(data) == obj
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Кодирует в UTF-8 байты
+
+    indent=True - отступ 2 (как json.dumps(indent=2)), иначе компактно
+    без пробелов (separators=(',', ':')).
+    """
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:  # нестроковые ключи, целые больше 64 бит
+            pass
+        else:
+            if _floats_match(data) and _nulls_match(obj, data):
+                return data
+    return _stdlib_dumps(obj, indent, sort_keys)
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """Каноническое представление снимка: отступ 2, ключи по алфавиту, перевод строки в конце"""
+    return dumps(obj, indent=True, sort_keys=True) + b'\n'
+
+
+def load_file(path: str) -> Any:
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump_file(path: str, obj: Any, indent: bool = True, sort_keys: bool = False):
+    with open(path, 'wb') as f:
+        f.write(dumps(obj, indent=indent, sort_keys=sort_keys))
@@ -6,6 +6,8 @@ import json
 import os
 from datetime import datetime
 
+from rate_budget import acquire_hh_token
+
 def get_vacancies():
     """Получение вакансий с минимальными параметрами"""
     
@@ -24,6 +26,7 @@ def get_vacancies():
     print("Запрашиваем вакансии с HeadHunter...")
     
     try:
+        acquire_hh_token()
         response = requests.get(url, params=params, headers=headers, timeout=30)
         
         print(f"Статус ответа: {response.status_code}")
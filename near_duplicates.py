@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Поиск почти-дублей вакансий: MinHash + LSH по названию и сниппетам
+
+Работодатели переиздают одну и ту же вакансию под новыми id и в разных
+регионах, и точная дедупликация по id этого не видит - раздуваются
+total и companies в статистике снимка.
+
+Для каждой вакансии по нормализованным name + requirement +
+responsibility строятся шинглы из SHINGLE_WORDS слов и MinHash-подпись
+из NUM_PERM хешей (64-битный blake2b шингла, «перестановки» - XOR со
+случайными масками: min считается встроенным map, без цикла Python).
+
+Подпись режется на BANDS полос по ROWS значений; вакансии одной компании,
+совпавшие хотя бы в одной полосе, попадают в общую корзину (порог около
+(1/BANDS)^(1/ROWS) ≈ 0.5), поэтому кандидаты ищутся за почти линейное
+время, а не перебором O(n²). Внутри корзины вакансия сверяется не со
+всеми, а с представителями корзины: совпала с одним (оценка сходства
+Жаккара не ниже THRESHOLD) - объединяется с ним, нет - сама становится
+представителем. Объединённые вакансии образуют кластеры; представитель
+кластера - самая свежая вакансия.
+
+Подписи кэшируются по id вместе с контрольной суммой текста, отдельно
+для каждого снимка (.cache/minhash_<снимок>.json - иначе workflow разных
+снимков вытесняли бы подписи друг друга), поэтому повторный запуск
+хеширует только новые и изменившиеся вакансии.
+
+В снимке представитель получает поле duplicates (id остальных), остальные -
+duplicate_of; вакансии не удаляются.
+
+Пример:
+    python near_duplicates.py hh_vacancies.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from json_cache import cache_path, read_cache, write_cache
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+THRESHOLD = 0.7
+SHINGLE_WORDS = 3
+
+# Фиксированные маски: подписи из кэша сравнимы между запусками
+MASKS = [random.Random(20240501 + i).getrandbits(64) for i in range(NUM_PERM)]
+
+# Кэш без привязки к снимку (для вызовов без имени файла)
+SIGNATURE_CACHE = cache_path('minhash_signatures.json')
+SIGNATURE_CACHE_TTL = 30 * 24 * 3600
+
+# Поля, которые проставляет этот модуль (снимаются перед новой разметкой)
+MARK_FIELDS = ('duplicates', 'duplicate_of')
+
+
+def normalize(text: str) -> str:
+    return ' '.join(re.sub(r'[^\w]+', ' ', (text or '').lower().replace('ё', 'е')).split())
+
+
+def vacancy_text(vacancy: Dict) -> str:
+    return normalize(' '.join(vacancy.get(field) or ''
+                              for field in ('name', 'requirement', 'responsibility')))
+
+
+def shingles(text: str) -> List[int]:
+    """64-битные хеши шинглов из SHINGLE_WORDS подряд идущих слов"""
+    words = text.split()
+    if len(words) <= SHINGLE_WORDS:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return [int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+            for gram in set(grams)]
+
+
+def minhash(hashes: List[int]) -> List[int]:
+    """MinHash-подпись непустого множества шинглов"""
+    return [min(map(mask.__xor__, hashes)) for mask in MASKS]
+
+
+def similarity(first: List[int], second: List[int]) -> float:
+    """Оценка сходства Жаккара по доле совпавших позиций подписи"""
+    return sum(1 for x, y in zip(first, second) if x == y) / NUM_PERM
+
+
+def signature_cache_file(filename: Optional[str]) -> str:
+    """hh_vacancies.json -> .cache/minhash_hh_vacancies.json"""
+    if not filename:
+        return SIGNATURE_CACHE
+    return cache_path(f"minhash_{os.path.splitext(os.path.basename(filename))[0]}.json")
+
+
+class SignatureCache:
+    """Подписи по id; пересчитываются, только если изменился текст"""
+
+    def __init__(self, path: str = SIGNATURE_CACHE):
+        self.path = path
+        cached = read_cache(path, SIGNATURE_CACHE_TTL) or {}
+        if cached.get('num_perm') != NUM_PERM:
+            cached = {}
+        self.entries: Dict[str, List] = cached.get('signatures', {})
+        self.computed = 0
+
+    def signature(self, vacancy: Dict) -> Optional[List[int]]:
+        """Подпись вакансии или None, если сравнивать нечего (пустой текст)"""
+        text = vacancy_text(vacancy)
+        if not text:
+            return None
+        checksum = zlib.crc32(text.encode('utf-8'))
+        entry = self.entries.get(vacancy['id'])
+        if entry is None or entry[0] != checksum:
+            entry = self.entries[vacancy['id']] = [checksum, minhash(shingles(text))]
+            self.computed += 1
+        return entry[1]
+
+    def save(self, keep_ids):
+        """Сохраняет подписи только текущих вакансий"""
+        signatures = {vacancy_id: self.entries[vacancy_id] for vacancy_id in keep_ids
+                      if vacancy_id in self.entries}
+        write_cache(self.path, {'num_perm': NUM_PERM, 'signatures': signatures})
+
+
+def lsh_buckets(signatures: List[Optional[List[int]]], companies: List[str]) -> Iterator[List[int]]:
+    """
+    Корзины LSH от двух вакансий: совпала полоса подписи и компания (None пропускаются)
+
+    Компания входит в ключ - вакансии разных компаний дублями не считаются
+    и в одну корзину не попадают.
+    """
+    for band in range(BANDS):
+        buckets: Dict[Tuple, List[int]] = {}
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            key = (companies[index], *signature[band * ROWS:(band + 1) * ROWS])
+            buckets.setdefault(key, []).append(index)
+        yield from (members for members in buckets.values() if len(members) > 1)
+
+
+def find_clusters(vacancies: List[Dict], cache: Optional[SignatureCache] = None) -> List[List[int]]:
+    """
+    Кластеры почти-дублей (индексы в vacancies), только размером от 2
+
+    Первый индекс кластера - представитель (самая свежая вакансия).
+    """
+    cache = cache or SignatureCache()
+    signatures = [cache.signature(v) for v in vacancies]
+    companies = [normalize(v.get('company')) for v in vacancies]
+    parent = list(range(len(vacancies)))
+
+    def root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Переизданная вакансия даёт корзину из k копий: сверка с представителями
+    # корзины (обычно один) вместо всех O(k²) пар
+    for members in lsh_buckets(signatures, companies):
+        representatives = [members[0]]
+        for index in members[1:]:
+            for representative in representatives:
+                if root(index) == root(representative):
+                    break
+                if similarity(signatures[index], signatures[representative]) >= THRESHOLD:
+                    parent[root(index)] = root(representative)
+                    break
+            else:
+                representatives.append(index)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(vacancies)):
+        groups.setdefault(root(index), []).append(index)
+    clusters = []
+    for members in groups.values():
+        if len(members) > 1:
+            members.sort(key=lambda i: (vacancies[i].get('published_at') or '', vacancies[i]['id']),
+                         reverse=True)
+            clusters.append(members)
+    clusters.sort(key=lambda members: vacancies[members[0]]['id'])
+    return clusters
+
+
+def mark_near_duplicates(vacancies: List[Dict], cache: Optional[SignatureCache] = None,
+                         filename: Optional[str] = None) -> int:
+    """
+    Размечает почти-дубли в списке вакансий (duplicates / duplicate_of)
+
+    filename - снимок, чей кэш подписей использовать
+
+    Returns:
+        Сколько вакансий помечено как дубли
+    """
+    cache = cache or SignatureCache(signature_cache_file(filename))
+    for vacancy in vacancies:
+        for field in MARK_FIELDS:
+            vacancy.pop(field, None)
+    with_id = [v for v in vacancies if v.get('id')]
+    clusters = find_clusters(with_id, cache)
+    cache.save(v['id'] for v in with_id)
+
+    marked = 0
+    for members in clusters:
+        canonical = with_id[members[0]]
+        canonical['duplicates'] = sorted(with_id[i]['id'] for i in members[1:])
+        for i in members[1:]:
+            with_id[i]['duplicate_of'] = canonical['id']
+        marked += len(members) - 1
+    if clusters:
+        print(f"🧬 Почти-дубли: {len(clusters)} кластеров, {marked} вакансий "
+              f"(подписей посчитано: {cache.computed})")
+    return marked
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Кластеры почти-дублей вакансий (MinHash + LSH)")
+    parser.add_argument('file', help="JSON-снимок")
+    parser.add_argument('--limit', type=int, default=20, help="сколько кластеров показать")
+    args = parser.parse_args(argv)
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        vacancies = [v for v in json.load(f).get('vacancies', []) if v.get('id')]
+    cache = SignatureCache(signature_cache_file(args.file))
+    clusters = find_clusters(vacancies, cache)
+    cache.save(v['id'] for v in vacancies)
+
+    duplicates = sum(len(members) - 1 for members in clusters)
+    print(f"📊 Вакансий: {len(vacancies)}, кластеров: {len(clusters)}, дублей: {duplicates} "
+          f"(подписей посчитано: {cache.computed})")
+    for members in sorted(clusters, key=len, reverse=True)[:args.limit]:
+        canonical = vacancies[members[0]]
+        print(f"\n   {canonical['id']}  {canonical.get('name', '')} - {canonical.get('company', '')}")
+        for i in members[1:]:
+            print(f"      ≈ {vacancies[i]['id']}  {vacancies[i].get('area', '')}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Экономный замер ограничений пагинации HH.ru
+
+Вместо перебора фиксированного списка страниц (как в
+precise_diagnostic.py) используется двоичный поиск:
+  - последняя непустая страница запроса - O(log pages) запросов;
+  - эффективный предел offset (сколько результатов вообще можно
+    получить) - двоичный поиск по per_page=1, O(log found).
+Независимые замеры (по регионам и по сегментам дат) идут параллельно,
+но через общий HHClient, который держит общий темп запросов.
+
+Результат сохраняется в кэш (.cache/page_limits.json), и сборщики
+берут из него число страниц вместо угаданного max_pages = 10.
+
+Пример:
+    python page_prober.py --areas 1,2,2019,145
+"""
+
+import argparse
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from hh_client import HHClient
+from json_cache import cache_path, read_cache, write_cache
+
+# Отчёт о пределах пагинации действует неделю
+REPORT_FILE = cache_path('page_limits.json')
+REPORT_TTL = 7 * 24 * 3600
+
+# Документированный предел HH - используется, пока замера нет
+DEFAULT_OFFSET_CAP = 2000
+
+# Параметры замеров, как в precise_diagnostic.py
+PROBE_QUERY = {
+    'text': 'системный администратор',
+    'search_field': 'name'
+}
+PROBE_PER_PAGE = 50
+DATE_SEGMENTS = [1, 3, 7, 30]
+
+# Для замера предела offset нужен запрос с большим found
+OFFSET_PROBE_QUERY = {'text': 'администратор', 'area': '113'}
+OFFSET_PROBE_LIMIT = 10000
+
+# Параллельные замеры (темп всё равно ограничен HHClient)
+PROBE_WORKERS = 4
+
+
+class ProbeError(RuntimeError):
+    """Запрос замера не удался - по нему нельзя судить, где кончается выдача"""
+
+
+def last_true(predicate: Callable[[int], bool], upper: int) -> int:
+    """
+    Двоичный поиск последнего индекса в [0, upper], для которого predicate истинен
+
+    Предполагается монотонность: истинно до некоторого индекса, дальше ложно.
+    Сначала проверяется upper - если он истинен, хватает двух запросов.
+
+    Returns:
+        Индекс или -1, если predicate(0) ложен
+    """
+    if upper < 0 or not predicate(0):
+        return -1
+    if predicate(upper):
+        return upper
+    low, high = 0, upper
+    while high - low > 1:
+        middle = (low + high) // 2
+        if predicate(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def page_has_items(client: HHClient, params: Dict, per_page: int,
+                   first_page: Optional[Dict] = None) -> Callable[[int], bool]:
+    """
+    Предикат 'страница непустая' с запоминанием уже запрошенных страниц
+
+    За пределом выдачи считается только ответ 200 без items или 400.
+    Сбой запроса (сеть, 5xx, разомкнутый circuit breaker) - ProbeError:
+    приняв его за пустую страницу, двоичный поиск занизил бы предел.
+    """
+    seen: Dict[int, bool] = {}
+    if first_page is not None:
+        seen[0] = bool(first_page.get('items'))
+
+    def has_items(page: int) -> bool:
+        if page not in seen:
+            data = client.search_vacancies(dict(params, per_page=per_page, page=page), quiet=True)
+            if data is None and client.last_status() != 400:
+                raise ProbeError(f"страница {page}: запрос не удался")
+            seen[page] = bool(data and data.get('items'))
+        return seen[page]
+
+    return has_items
+
+
+def probe_query(client: HHClient, name: str, params: Dict,
+                per_page: int = PROBE_PER_PAGE) -> Dict:
+    """
+    Находит последнюю непустую страницу одного запроса
+
+    Returns:
+        Словарь с found, pages (по версии API), last_page и accessible
+    """
+    first = client.search_vacancies(dict(params, per_page=per_page, page=0))
+    if first is None:
+        return {'name': name, 'params': params, 'error': 'первый запрос не удался'}
+
+    found = first.get('found', 0)
+    reported_pages = first.get('pages', 0)
+    has_items = page_has_items(client, params, per_page, first)
+    try:
+        last_page = last_true(has_items, reported_pages - 1)
+    except ProbeError as e:
+        return {'name': name, 'params': params, 'error': str(e)}
+    accessible = 0
+    if last_page >= 0:
+        accessible = min(found, (last_page + 1) * per_page)
+
+    return {
+        'name': name,
+        'params': params,
+        'per_page': per_page,
+        'found': found,
+        'pages': reported_pages,
+        'last_page': last_page,
+        'accessible': accessible,
+        'lost': max(found - accessible, 0)
+    }
+
+
+def probe_offset_cap(client: HHClient, params: Dict = OFFSET_PROBE_QUERY) -> Optional[int]:
+    """
+    Эффективный предел offset: сколько результатов можно получить постранично
+
+    Returns:
+        Количество доступных результатов или None, если найдено меньше,
+        чем позволяет предел (тогда предел не достигнут и неизвестен)
+
+    Raises:
+        ProbeError: запрос замера не удался
+    """
+    first = client.search_vacancies(dict(params, per_page=1, page=0))
+    if first is None:
+        raise ProbeError("первый запрос не удался")
+    found = first.get('found', 0)
+    upper = min(found, OFFSET_PROBE_LIMIT) - 1
+    last_index = last_true(page_has_items(client, params, 1, first), upper)
+    if last_index == upper:
+        return None
+    return last_index + 1
+
+
+def build_probes(areas: List[str], segment_area: str) -> List[Dict]:
+    """Замеры: по каждому региону и по сегментам дат для segment_area"""
+    probes = [{'name': f"area {area}", 'params': dict(PROBE_QUERY, area=area)} for area in areas]
+    now = datetime.now()
+    for days in DATE_SEGMENTS:
+        params = dict(PROBE_QUERY, area=segment_area,
+                      date_from=(now - timedelta(days=days)).strftime('%Y-%m-%d'),
+                      date_to=now.strftime('%Y-%m-%d'))
+        probes.append({'name': f"area {segment_area}, {days} дн.", 'params': params})
+    return probes
+
+
+def run_probes(client: HHClient, probes: List[Dict], workers: int = PROBE_WORKERS) -> List[Dict]:
+    """Выполняет замеры параллельно в пределах общего темпа клиента"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(probe_query, client, p['name'], p['params']) for p in probes]
+        return [future.result() for future in futures]
+
+
+def load_report() -> Optional[Dict]:
+    """Свежий отчёт о пределах пагинации или None"""
+    return read_cache(REPORT_FILE, REPORT_TTL)
+
+
+def page_limit(per_page: int = 100) -> int:
+    """
+    Сколько страниц по per_page имеет смысл запрашивать
+
+    Берётся из отчёта page_prober.py, а без него - из документированного
+    предела HH (2000 результатов).
+    """
+    report = load_report()
+    offset_cap = (report or {}).get('offset_cap') or DEFAULT_OFFSET_CAP
+    return max(1, offset_cap // per_page)
+
+
+def print_report(report: Dict):
+    """Выводит результаты замеров"""
+    print("\n📊 Результаты замеров:")
+    print("-" * 70)
+    for probe in report['probes']:
+        if 'error' in probe:
+            print(f"❌ {probe['name']}: {probe['error']}")
+            continue
+        flag = f" | потеряно {probe['lost']}" if probe['lost'] else ""
+        print(f"{probe['name']:28s} found {probe['found']:5d} | страниц {probe['pages']:3d} | "
+              f"последняя непустая {probe['last_page']:3d}{flag}")
+    cap = report.get('offset_cap')
+    print(f"\n🚫 Предел offset: {cap if cap else 'не достигнут (found меньше предела)'}")
+    print(f"🔢 Запросов к API: {report['requests']}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Замер ограничений пагинации HH.ru двоичным поиском")
+    parser.add_argument('--areas', default='1,2,2019,145', help="регионы для замеров")
+    parser.add_argument('--segment-area', default='1', help="регион для сегментов по датам")
+    parser.add_argument('--workers', type=int, default=PROBE_WORKERS)
+    parser.add_argument('--skip-offset', action='store_true', help="не замерять предел offset")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("ЗАМЕР ОГРАНИЧЕНИЙ ПАГИНАЦИИ HH.RU")
+    print(f"Время: {datetime.now()}")
+    print("=" * 70)
+
+    client = HHClient()
+    previous = load_report() or {}
+    offset_cap = previous.get('offset_cap')
+    offset_failed = False
+    if not args.skip_offset:
+        try:
+            offset_cap = probe_offset_cap(client) or offset_cap
+        except ProbeError as e:
+            # Замер прерван - остаётся прежний предел, а не заниженный сбоем
+            print(f"❌ Замер предела offset прерван: {e}")
+            offset_failed = True
+
+    probes = build_probes([a for a in args.areas.split(',') if a], args.segment_area)
+    results = run_probes(client, probes, args.workers)
+
+    report = {
+        'offset_cap': offset_cap,
+        'max_pages_per_100': math.floor((offset_cap or DEFAULT_OFFSET_CAP) / 100),
+        'probes': results,
+        'requests': client.requests_made
+    }
+    write_cache(REPORT_FILE, report)
+    print_report(report)
+    print(f"\n✅ Отчёт сохранён в {REPORT_FILE}")
+    return not offset_failed and all('error' not in probe for probe in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
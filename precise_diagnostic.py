@@ -1,8 +1,9 @@
 import requests
 import json
-import time
 from datetime import datetime
 
+from rate_budget import acquire_hh_token
+
 # API HH.ru
 BASE_URL = "https://api.hh.ru/vacancies"
 
@@ -33,6 +34,7 @@ def precise_page_limit_test():
     print("-" * 70)
     
     try:
+        acquire_hh_token()
         response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
         if response.status_code == 200:
             data = response.json()
@@ -70,6 +72,7 @@ def precise_page_limit_test():
         params['page'] = page
         
         try:
+            acquire_hh_token()
             response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
             
             if response.status_code == 200:
@@ -89,8 +92,6 @@ def precise_page_limit_test():
                 
         except Exception as e:
             print(f"❌ Страница {page:2d}: Ошибка {str(e)[:50]}")
-        
-        time.sleep(0.3)
     
     print(f"\n📊 Последняя страница с данными: {last_page_with_data}")
     print(f"📊 Всего страниц с данными: {actual_pages_with_data}")
@@ -112,6 +113,7 @@ def precise_page_limit_test():
         status = "?"
         
         try:
+            acquire_hh_token()
             response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
             if response.status_code == 200:
                 data = response.json()
@@ -126,7 +128,6 @@ def precise_page_limit_test():
             status = "❌ Ошибка"
         
         print(f"Offset {offset:4d} (page {page:2d}): {status}")
-        time.sleep(0.3)
     
     # Финальный анализ
     print("\n4. АНАЛИЗ РЕЗУЛЬТАТОВ")
@@ -202,6 +203,7 @@ def test_date_segmentation():
         }
         
         try:
+            acquire_hh_token()
             response = requests.get(BASE_URL, params=params, headers=HEADERS, timeout=30)
             if response.status_code == 200:
                 data = response.json()
@@ -220,8 +222,6 @@ def test_date_segmentation():
                     
         except Exception as e:
             print(f"❌ Ошибка: {e}")
-        
-        time.sleep(0.5)
     
     print(f"\n📊 Всего найдено через сегментацию: ~{total_found}")
     print("   (с учетом возможных дубликатов)")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Объединение ключевых слов в один запрос HH
+
+Вместо отдельного постраничного поиска по каждому ключевому слову
+строим один булев запрос вида
+    (системный администратор) OR (сисадмин) OR (system administrator)
+Скобки сохраняют семантику отдельного поиска: слова внутри ключевой
+фразы по-прежнему ищутся вместе, как при запросе по одной фразе.
+
+Перед использованием объединённый запрос проверяется на выборке
+(свежие вакансии за последние часы): множество id по объединённому
+запросу должно совпасть с объединением множеств по каждому слову.
+Результат проверки кэшируется на сутки. Кроме того, выдача объединённого
+запроса должна помещаться в предел пагинации (page_limit * per_page):
+иначе её хвост потерялся бы, а запросы по каждому слову могут в него
+поместиться.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from area_planner import FoundCache, query_key
+from hh_client import HHClient
+from json_cache import cache_path, read_cache, write_cache
+from page_prober import page_limit
+from query_plan import MAX_PER_PAGE, probe_segment_found
+
+# Режимы работы сборщика
+MODE_PER_KEYWORD = 'per-keyword'
+MODE_MERGED = 'merged'
+MODE_VERIFY = 'verify'
+QUERY_MODES = [MODE_PER_KEYWORD, MODE_MERGED, MODE_VERIFY]
+
+# Окно выборки для проверки (в часах) и предельный размер выборки
+SAMPLE_HOURS = 24
+SAMPLE_MAX_PAGES = 3
+SAMPLE_PER_PAGE = 100
+
+# Успешная проверка действует сутки
+VERIFY_CACHE_TTL = 24 * 3600
+
+
+def compile_keywords(keywords: List[str]) -> str:
+    """Объединяет ключевые слова в один запрос через OR"""
+    if len(keywords) == 1:
+        return keywords[0]
+    return ' OR '.join(f"({keyword})" for keyword in keywords)
+
+
+def _verify_cache_file(merged_text: str, base_params: Dict) -> str:
+    """Файл кэша проверки для конкретного запроса и набора параметров"""
+    key = repr((merged_text, sorted((k, str(v)) for k, v in base_params.items())))
+    return cache_path(f"query_verify_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}.json")
+
+
+def fetch_sample_ids(client: HHClient, text: str, base_params: Dict,
+                     date_from: str) -> Optional[Set[str]]:
+    """
+    Собирает id всех вакансий выборки по запросу
+
+    Returns:
+        Множество id или None, если выборка не поместилась
+        в SAMPLE_MAX_PAGES страниц или запрос не удался
+    """
+    ids = set()
+    params = dict(base_params, text=text, date_from=date_from, per_page=SAMPLE_PER_PAGE)
+    for page in range(SAMPLE_MAX_PAGES):
+        params['page'] = page
+        data = client.search_vacancies(params)
+        if data is None:
+            return None
+        ids.update(item['id'] for item in data.get('items', []) if item.get('id'))
+        if page + 1 >= data.get('pages', 0):
+            return ids
+    return None
+
+
+def verify_merged_query(client: HHClient, keywords: List[str], base_params: Dict,
+                        use_cache: bool = True) -> bool:
+    """
+    Проверяет, что объединённый запрос находит те же вакансии
+
+    Args:
+        client: Клиент API HH.ru
+        keywords: Ключевые слова
+        base_params: Остальные параметры поиска (area, schedule, search_field)
+        use_cache: Использовать результат недавней проверки
+
+    Returns:
+        True, если объединённым запросом можно заменить поиск по словам
+    """
+    merged_text = compile_keywords(keywords)
+    cache_file = _verify_cache_file(merged_text, base_params)
+    if use_cache:
+        cached = read_cache(cache_file, VERIFY_CACHE_TTL)
+        if cached is not None:
+            print(f"   🗂️ Проверка объединённого запроса из кэша: {'OK' if cached['ok'] else 'расхождение'}")
+            return cached['ok']
+
+    hours = SAMPLE_HOURS
+    while hours >= 1:
+        date_from = (datetime.now() - timedelta(hours=hours)).strftime('%Y-%m-%dT%H:%M:%S')
+        merged_ids = fetch_sample_ids(client, merged_text, base_params, date_from)
+        if merged_ids is not None:
+            break
+        hours //= 2
+    else:
+        print("   ⚠️ Не удалось получить выборку для проверки объединённого запроса")
+        return False
+
+    union_ids = set()
+    for keyword in keywords:
+        keyword_ids = fetch_sample_ids(client, keyword, base_params, date_from)
+        if keyword_ids is None:
+            print(f"   ⚠️ Не удалось получить выборку по слову '{keyword}'")
+            return False
+        union_ids |= keyword_ids
+
+    ok = merged_ids == union_ids
+    print(f"   🔬 Выборка за {hours} ч: объединённый запрос {len(merged_ids)}, "
+          f"по словам {len(union_ids)} -> {'совпадает' if ok else 'РАСХОЖДЕНИЕ'}")
+    if not ok:
+        print(f"      только в объединённом: {len(merged_ids - union_ids)}, "
+              f"только по словам: {len(union_ids - merged_ids)}")
+
+    write_cache(cache_file, {'ok': ok, 'sample_hours': hours,
+                             'merged': len(merged_ids), 'union': len(union_ids)})
+    return ok
+
+
+def pagination_cap(params: Dict) -> int:
+    """Сколько результатов одного запроса можно получить постранично (page_prober.py)"""
+    per_page = min(int(params.get('per_page', MAX_PER_PAGE)), MAX_PER_PAGE)
+    return page_limit(per_page) * per_page
+
+
+def merged_fits(client: HHClient, merged_text: str, params: Dict) -> bool:
+    """
+    Помещается ли выдача объединённого запроса в предел пагинации
+
+    found узнаётся одной вакансией на страницу (с кэшем FoundCache);
+    если узнать не удалось, считается, что не помещается.
+    """
+    cache = FoundCache()
+    found = probe_segment_found(client, dict(params, text=merged_text), cache)
+    cache.save()
+    if found is None:
+        print("   ⚠️ Не удалось узнать found объединённого запроса")
+        return False
+    cap = pagination_cap(params)
+    if found > cap:
+        print(f"   🚫 Объединённый запрос находит {found}, а пагинация отдаёт не больше {cap}")
+        return False
+    return True
+
+
+def choose_queries(client: HHClient, keywords: List[str], base_params: Dict,
+                   mode: str = MODE_VERIFY, extra_params: Optional[Dict] = None) -> List[str]:
+    """
+    Возвращает список поисковых запросов для сборщика в выбранном режиме
+
+    В режиме verify объединённый запрос используется только после
+    успешной проверки и если его выдача помещается в предел пагинации
+    (с extra_params - например, окном дат уровня), иначе - поиск по
+    каждому слову отдельно.
+    """
+    if mode == MODE_PER_KEYWORD or len(keywords) < 2:
+        return list(keywords)
+    merged_text = compile_keywords(keywords)
+    if mode == MODE_MERGED:
+        return [merged_text]
+
+    print("\n🧪 Проверка объединённого запроса...")
+    if (verify_merged_query(client, keywords, base_params)
+            and merged_fits(client, merged_text, dict(base_params, **(extra_params or {})))):
+        return [merged_text]
+    print("   ↩️ Возвращаемся к поиску по каждому ключевому слову")
+    return list(keywords)
+
+
+def planned_queries(keywords: List[str], base_params: Dict, mode: str = MODE_VERIFY) -> List[str]:
+    """
+    Запросы, которые выберет choose_queries, без обращения к API (для плана)
+
+    В режиме verify без свежей проверки в кэше (или если по кэшу found
+    выдача объединённого запроса больше предела пагинации) берётся поиск
+    по каждому слову - это верхняя оценка числа запросов.
+    """
+    if mode == MODE_PER_KEYWORD or len(keywords) < 2:
+        return list(keywords)
+    merged_text = compile_keywords(keywords)
+    if mode == MODE_MERGED:
+        return [merged_text]
+    cached = read_cache(_verify_cache_file(merged_text, base_params), VERIFY_CACHE_TTL)
+    found = FoundCache().get(query_key(dict(base_params, text=merged_text)), '*')
+    fits = found is not None and found <= pagination_cap(base_params)
+    return [merged_text] if cached and cached['ok'] and fits else list(keywords)
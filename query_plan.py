@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+План запросов сборщика: проверка параметров и оценка стоимости (--plan, --dry-run)
+
+До запуска было непонятно, во что обойдётся шард: сколько запросов уйдёт
+из общего бюджета HH, сколько это минут и не упрётся ли какой-то запрос
+в предел пагинации. План отвечает на это до траты бюджета:
+    - каждый запрос приводится (normalize_query; так же и запросы самого
+      сбора в collect_vacancies.py) к виду, который принимает HH: per_page не
+      больше MAX_PER_PAGE, area / schedule / search_field - списки
+      строк без повторов, date_from / date_to разбираются и идут по
+      порядку, period - от 1 до MAX_PERIOD_DAYS; неисправимое - ошибка;
+    - по каждому сегменту (запрос x окно дат) found узнаётся одной
+      вакансией на страницу (с кэшем FoundCache, как в area_planner.py);
+    - из found - страницы (не глубже page_limit из page_prober.py),
+      запросы, время при темпе общего бюджета и с учётом задержек ответа,
+      и сегменты, у которых часть выдачи за пределом пагинации.
+План печатается, пишется в JSON (--plan-output) и в outputs шага
+GitHub Actions (planned_requests, planned_seconds).
+"""
+
+import math
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from area_planner import FoundCache, query_key
+from hh_client import HHClient
+from json_codec import dump_file
+from page_prober import page_limit
+from vacancy_fields import parse_timestamp
+
+# Больше HH на страницу не отдаёт
+MAX_PER_PAGE = 100
+
+# Допустимые значения параметров-справочников HH
+SCHEDULES = ('fullDay', 'shift', 'flexible', 'remote', 'flyInFlyOut')
+SEARCH_FIELDS = ('name', 'company_name', 'description')
+MAX_PERIOD_DAYS = 30
+
+# Параметры, которые HH принимает повторёнными (area=1&area=2)
+LIST_PARAMS = ('area', 'schedule', 'search_field')
+
+
+def _as_list(value) -> List[str]:
+    """'1,2' / ['1', 2] / 1 -> ['1', '2'] без пустых и повторов"""
+    if isinstance(value, str):
+        values = value.split(',')
+    elif isinstance(value, (list, tuple)):
+        values = value
+    else:
+        values = [value]
+    return list(dict.fromkeys(str(v).strip() for v in values if v is not None and str(v).strip()))
+
+
+def normalize_query(params: Dict) -> Tuple[Dict, List[str], List[str]]:
+    """
+    Приводит параметры поиска к виду, который примет HH
+
+    Исправимое (per_page больше предела, повторы регионов) исправляется
+    с предупреждением, остальное попадает в ошибки.
+
+    Returns:
+        (параметры без page, предупреждения, ошибки)
+    """
+    normalized = {key: value for key, value in params.items() if key != 'page' and value is not None}
+    warnings: List[str] = []
+    errors: List[str] = []
+
+    if not str(normalized.get('text') or '').strip():
+        errors.append("пустой text")
+
+    try:
+        per_page = int(normalized.get('per_page', MAX_PER_PAGE))
+    except (TypeError, ValueError):
+        errors.append(f"per_page не число: {normalized.get('per_page')!r}")
+        per_page = MAX_PER_PAGE
+    if not 1 <= per_page <= MAX_PER_PAGE:
+        warnings.append(f"per_page {per_page} вне 1..{MAX_PER_PAGE}, исправлено")
+        per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    normalized['per_page'] = per_page
+
+    for name in LIST_PARAMS:
+        if name not in normalized:
+            continue
+        values = _as_list(normalized[name])
+        original = normalized[name]
+        if isinstance(original, (list, tuple)) and len(values) < len(original):
+            warnings.append(f"{name}: убраны повторы ({len(original) - len(values)})")
+        normalized[name] = values
+    unknown = {
+        'area': [a for a in normalized.get('area', []) if not a.isdigit()],
+        'schedule': [s for s in normalized.get('schedule', []) if s not in SCHEDULES],
+        'search_field': [f for f in normalized.get('search_field', []) if f not in SEARCH_FIELDS],
+    }
+    errors.extend(f"{name}: неизвестные значения {', '.join(values)}" for name, values in unknown.items() if values)
+
+    bounds = {}
+    for name in ('date_from', 'date_to'):
+        if name in normalized:
+            bounds[name] = parse_timestamp(str(normalized[name]))
+            if bounds[name] is None:
+                errors.append(f"{name} не разобран: {normalized[name]!r}")
+    if bounds.get('date_from') and bounds.get('date_to') and bounds['date_from'] > bounds['date_to']:
+        errors.append("date_from позже date_to")
+    if bounds.get('date_from') and bounds['date_from'] > datetime.now().timestamp():
+        warnings.append("date_from в будущем - выдача будет пустой")
+    if 'period' in normalized:
+        try:
+            period = int(normalized['period'])
+        except (TypeError, ValueError):
+            period = 0
+        if not 1 <= period <= MAX_PERIOD_DAYS:
+            errors.append(f"period должен быть от 1 до {MAX_PERIOD_DAYS} дней")
+        elif 'date_from' in normalized:
+            warnings.append("period вместе с date_from: HH учитывает date_from")
+    return normalized, warnings, errors
+
+
+def probe_segment_found(client: HHClient, params: Dict, cache: FoundCache) -> Optional[int]:
+    """found сегмента одной вакансией на страницу (или из свежего кэша)"""
+    key = query_key(params)
+    cached = cache.get(key, '*')
+    if cached is not None:
+        return cached
+    data = client.search_vacancies(dict(params, per_page=1, page=0), quiet=True)
+    if data is None:
+        return None
+    cache.put(key, '*', data.get('found', 0))
+    return data.get('found', 0)
+
+
+def plan_segments(client: HHClient, segments: List[Dict], cache: Optional[FoundCache] = None) -> Dict:
+    """
+    Проверяет сегменты и оценивает стоимость их сбора
+
+    Args:
+        client: Клиент API HH.ru (для замеров found)
+        segments: [{'name': подпись, 'params': параметры поиска}]
+        cache: Кэш found (по умолчанию - общий с area_planner.py)
+
+    Returns:
+        {'segments': [...], 'requests', 'probe_requests', 'over_cap', 'errors'}
+    """
+    cache = cache or FoundCache()
+    requests_before = client.requests_made
+    rows = []
+    for segment in segments:
+        params, warnings, errors = normalize_query(segment['params'])
+        row = {'name': segment['name'], 'params': params, 'warnings': warnings, 'errors': errors,
+               'found': None, 'pages': 0, 'lost': 0}
+        if not errors:
+            found = probe_segment_found(client, params, cache)
+            if found is None:
+                row['errors'].append("не удалось узнать found")
+            else:
+                cap = page_limit(params['per_page']) * params['per_page']
+                row.update(found=found, pages=math.ceil(min(found, cap) / params['per_page']),
+                           lost=max(0, found - cap))
+        rows.append(row)
+    cache.save()
+    return {
+        'segments': rows,
+        # Пустой выдаче всё равно нужен запрос первой страницы
+        'requests': sum(max(row['pages'], 1) for row in rows if not row['errors']),
+        'probe_requests': client.requests_made - requests_before,
+        'over_cap': [row['name'] for row in rows if row['lost']],
+        'errors': [f"{row['name']}: {error}" for row in rows for error in row['errors']]
+    }
+
+
+def estimate_time(plan: Dict, rate: Optional[float], seconds_per_request: float):
+    """Добавляет в план время: при темпе бюджета (нижняя граница) и с задержками ответа"""
+    plan['rate'] = rate
+    plan['seconds_at_rate'] = round(plan['requests'] / rate, 1) if rate else None
+    plan['seconds'] = round(plan['requests'] * seconds_per_request, 1)
+
+
+def print_plan(plan: Dict, deadline: Optional[float] = None):
+    """Сводка плана по сегментам"""
+    print("\n🧭 План запросов:")
+    print("-" * 60)
+    for row in plan['segments']:
+        if row['errors']:
+            print(f"❌ {row['name']}: {'; '.join(row['errors'])}")
+            continue
+        flag = f" | 🚫 за пределом пагинации {row['lost']}" if row['lost'] else ""
+        print(f"{row['name']:40s} found {row['found']:6d} | страниц {row['pages']:3d}{flag}")
+        for warning in row['warnings']:
+            print(f"   ⚠️ {warning}")
+
+    at_rate = f"{plan['seconds_at_rate']:.0f} с при {plan['rate']:g} запр/с, " if plan.get('seconds_at_rate') else ""
+    print(f"\n🔢 Запросов на сбор: {plan['requests']} (на план потрачено {plan['probe_requests']})")
+    print(f"⏱️ Время: {at_rate}~{plan['seconds']:.0f} с с учётом задержек ответа")
+    if deadline is not None and plan['seconds'] > deadline:
+        print(f"⏳ В --deadline {deadline:.0f} с не уложится: часть страниц уйдёт в следующий запуск")
+    if plan['over_cap']:
+        print(f"✂️ Делить по регионам (area_planner.py) или по датам: {', '.join(plan['over_cap'])}")
+
+
+def save_plan(plan: Dict, filename: str):
+    """План в JSON"""
+    dump_file(filename, dict(plan, generated=datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')))
+    print(f"\n💾 План сохранён в {filename}")
+
+
+def report_plan(plan: Dict):
+    """Передаёт оценку в шаги GitHub Actions (outputs.planned_requests, outputs.planned_seconds)"""
+    output = os.environ.get('GITHUB_OUTPUT')
+    if output:
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(f"planned_requests={plan['requests']}\nplanned_seconds={plan['seconds']:.0f}\n")
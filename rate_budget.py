@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общий для всех процессов бюджет запросов к API (token bucket на файле)
+
+Сборщики, демон, диагностика и тестовые скрипты запускаются параллельно,
+и каждый раньше считал, что весь лимит HH принадлежит ему. Теперь
+каждый запрос берёт токен из общего ведра: состояние лежит в
+.cache/rate_budget_<имя>.json и меняется под эксклюзивной блокировкой
+fcntl.flock, поэтому суммарный темп всех процессов не превышает rate.
+
+Токен резервируется сразу (ведро может уйти в минус), а ждать процесс
+идёт уже без блокировки - очередь получается справедливой, и процессы
+не будят друг друга впустую. Ответ 429 объявляет паузу для всех
+процессов (backoff).
+
+Без fcntl (Windows) бюджет действует только внутри процесса.
+
+Пример:
+    python rate_budget.py            # состояние бюджета HH
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from json_cache import cache_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Безопасный темп HH на всех клиентов вместе (переопределяется окружением)
+HH_RATE = float(os.environ.get('HH_RATE_PER_SECOND', '3'))
+HH_BURST = float(os.environ.get('HH_RATE_BURST', '3'))
+
+# Пауза после 429, если API не прислал Retry-After
+DEFAULT_BACKOFF = 5.0
+
+
+class RateBudget:
+    """Token bucket, общий для всех процессов с одинаковым именем"""
+
+    def __init__(self, name: str, rate: float, burst: float = 1.0,
+                 path: Optional[str] = None):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.path = path or cache_path(f"rate_budget_{name}.json")
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._local_state: Dict = {}
+
+    def _update(self, change) -> Dict:
+        """Читает состояние, применяет change(state) и записывает под блокировкой"""
+        with self._lock:
+            if fcntl is None:
+                change(self._local_state)
+                return dict(self._local_state)
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a+', encoding='utf-8') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or '{}')
+                    except ValueError:
+                        state = {}
+                    change(state)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            return state
+
+    def _refill(self, state: Dict, now: float):
+        """Пополняет ведро до now; во время паузы 'updated' в будущем и ведро не растёт"""
+        last = state.get('updated', now)
+        tokens = state.get('tokens', self.burst)
+        state['tokens'] = min(self.burst, tokens + max(0.0, now - last) * self.rate)
+        state['updated'] = max(now, last)
+
+    def acquire(self) -> float:
+        """
+        Берёт один токен, при необходимости дожидаясь его
+
+        Returns:
+            Сколько секунд пришлось ждать
+        """
+        reserved = {}
+
+        def take(state: Dict):
+            now = time.time()
+            self._refill(state, now)
+            state['tokens'] -= 1
+            state['requests'] = state.get('requests', 0) + 1
+            # Токен появится через -tokens / rate после 'updated' (после паузы - её конца)
+            ready = state['updated'] - state['tokens'] / self.rate if state['tokens'] < 0 else state['updated']
+            reserved['wait'] = max(0.0, ready - now, state.get('blocked_until', 0) - now)
+
+        self._update(take)
+        wait = reserved['wait']
+        if wait > 0:
+            self.waited += wait
+            time.sleep(wait)
+        return wait
+
+    def backoff(self, seconds: Optional[float] = None):
+        """
+        Пауза для всех процессов (например, после ответа 429)
+
+        Ведро начинает пополняться только с конца паузы и без запаса, поэтому
+        ждавшие паузу запросы выходят из неё через 1/rate, а не пачкой.
+        """
+        seconds = DEFAULT_BACKOFF if seconds is None else seconds
+
+        def block(state: Dict):
+            now = time.time()
+            self._refill(state, now)
+            state['blocked_until'] = max(state.get('blocked_until', 0), now + seconds)
+            state['updated'] = max(state['updated'], state['blocked_until'])
+            state['tokens'] = min(state['tokens'], 0.0)
+            state['backoffs'] = state.get('backoffs', 0) + 1
+
+        self._update(block)
+
+    def state(self) -> Dict:
+        """Текущее состояние ведра (с учётом пополнения)"""
+        return self._update(lambda state: self._refill(state, time.time()))
+
+
+_budgets: Dict[str, RateBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def shared_budget(name: str, rate: float, burst: float = 1.0) -> RateBudget:
+    """Один объект бюджета на имя в пределах процесса"""
+    with _budgets_lock:
+        if name not in _budgets:
+            _budgets[name] = RateBudget(name, rate, burst)
+        return _budgets[name]
+
+
+def hh_budget() -> RateBudget:
+    """Общий бюджет запросов к API HH.ru"""
+    return shared_budget('hh', HH_RATE, HH_BURST)
+
+
+def acquire_hh_token() -> float:
+    """Токен HH для скриптов, которые ходят в API напрямую через requests"""
+    return hh_budget().acquire()
+
+
+def main():
+    """Основная функция"""
+    budget = hh_budget()
+    state = budget.state()
+    blocked = max(0.0, state.get('blocked_until', 0) - time.time())
+    print(f"Бюджет HH: {budget.rate:g} запр/с, запас до {budget.burst:g}")
+    print(f"   Токенов сейчас: {state['tokens']:.2f}")
+    print(f"   Запросов всего: {state.get('requests', 0)}, пауз после 429: {state.get('backoffs', 0)}")
+    if blocked:
+        print(f"   ⏸️ Пауза ещё {blocked:.1f} с")
+    print(f"   Файл: {budget.path}{'' if fcntl else ' (без fcntl - только внутри процесса)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Локальный API чтения поверх собранных вакансий
+
+Загружает последние снимки hh_vacancies*.json в индексы в памяти
+и отдаёт их по HTTP без внешних зависимостей (asyncio):
+
+    GET /vacancies?area=&experience=&salary_min=&q=&sort=date|salary&page=&per_page=
+                   &schedule=&employment=&premium=&has_test=&salary=
+                   &lat=&lng=&radius_km=   (в радиусе от точки, geo_index.py)
+                   &bbox=юг,запад,север,восток
+                   &facets=1               (счётчики всех фасетов)
+    GET /health
+
+Ответы сжимаются gzip (если клиент поддерживает), ETag строгий и
+зависит от хэша снимка и параметров запроса, так что повторный запрос
+с If-None-Match получает 304. При изменении файлов снимков новый
+индекс строится в отдельном потоке и подменяется атомарно - текущие
+запросы дорабатывают со старым.
+
+Фильтры фасетов (area, experience, schedule, employment, premium,
+has_test, salary - полосы зарплаты) - битовые карты facet_bitmaps.py:
+несколько значений через запятую объединяются по ИЛИ, фасеты - по И.
+
+Пример:
+    python read_api.py --port 8081
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from facet_bitmaps import FACETS, FacetIndex, from_ordinals, ordinals
+from geo_index import GeoIndex
+from snapshot_writer import sort_vacancies
+from vacancy_fields import salary_rub_mid
+
+# Снимки, которые обслуживает API
+SNAPSHOT_FILES = ['hh_vacancies.json', 'hh_vacancies_fullDay.json', 'hh_vacancies_fullDay_2.json']
+
+# Пагинация
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+# Как часто проверять, не изменились ли файлы (в секундах)
+RELOAD_INTERVAL = 5
+
+# Сколько готовых ответов держать на один снимок
+RESPONSE_CACHE_SIZE = 2048
+
+# Меньшие ответы не сжимаем
+GZIP_MIN_SIZE = 512
+
+# Поддерживаемые порядки сортировки
+SORT_ORDERS = ('date', 'salary')
+
+WORD_RE = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> Set[str]:
+    """Слова текста в нижнем регистре (для поиска по q)"""
+    return {word for word in WORD_RE.findall(text.lower()) if len(word) > 1}
+
+
+def snapshot_version(paths: List[str]) -> str:
+    """Хэш набора снимков по их содержимому"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:20]
+
+
+class SnapshotIndex:
+    """Неизменяемый индекс одного снимка: фильтры, сортировки, кэш ответов"""
+
+    def __init__(self, vacancies: List[Dict], version: str):
+        self.version = version
+        self.records = sort_vacancies(vacancies)
+        self.by_token: Dict[str, Set[int]] = {}
+
+        for ordinal, vacancy in enumerate(self.records):
+            text = f"{vacancy.get('name') or vacancy.get('title') or ''} {vacancy.get('company') or ''}"
+            for token in tokenize(text):
+                self.by_token.setdefault(token, set()).add(ordinal)
+        self.facets = FacetIndex.from_vacancies(self.records)
+
+        # Порядки сортировки считаются один раз на снимок
+        mids = [salary_rub_mid(v) for v in self.records]
+        self.orders = {
+            'date': list(range(len(self.records))),
+            'salary': sorted(range(len(self.records)),
+                             key=lambda i: (mids[i] is None, -(mids[i] or 0), i))
+        }
+        self.geo = GeoIndex.from_vacancies(self.records)
+        self._responses: OrderedDict = OrderedDict()
+
+    @classmethod
+    def from_files(cls, paths: List[str]) -> 'SnapshotIndex':
+        """Загружает и объединяет снимки (дубликаты по id отбрасываются)"""
+        seen = set()
+        vacancies = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for vacancy in data.get('vacancies', []):
+                vacancy_id = vacancy.get('id')
+                if vacancy_id and vacancy_id not in seen:
+                    seen.add(vacancy_id)
+                    vacancies.append(vacancy)
+        return cls(vacancies, snapshot_version(paths))
+
+    def _filters(self, params: Dict[str, str]) -> Tuple[Dict[str, List[str]], List[int]]:
+        """Значения фасетов и дополнительные битовые карты (q, гео, salary_min)"""
+        filters = {facet: [value for value in params[facet].split(',') if value]
+                   for facet in FACETS if params.get(facet)}
+        size = len(self.records)
+        sets = []
+        for token in tokenize(params.get('q', '')):
+            sets.append(self.by_token.get(token, set()))
+        if params.get('radius_km'):
+            if not (params.get('lat') and params.get('lng')):
+                raise ValueError("radius_km требует lat и lng")
+            found = self.geo.within_radius(float(params['lat']), float(params['lng']), float(params['radius_km']))
+            sets.append({ordinal for _, ordinal in found})
+        if params.get('bbox'):
+            bounds = [float(part) for part in params['bbox'].split(',')]
+            if len(bounds) != 4:
+                raise ValueError("bbox должен быть вида юг,запад,север,восток")
+            sets.append(set(self.geo.within_bbox(*bounds)))
+
+        extra = [from_ordinals(numbers, size) for numbers in sets]
+        if params.get('salary_min'):
+            extra.append(self.facets.salary_at_least(float(params['salary_min'])))
+        return filters, extra
+
+    def query(self, params: Dict[str, str]) -> Dict:
+        """Выполняет запрос /vacancies"""
+        page = max(int(params.get('page') or 0), 0)
+        per_page = min(max(int(params.get('per_page') or DEFAULT_PER_PAGE), 1), MAX_PER_PAGE)
+        order = self.orders.get(params.get('sort') or 'date')
+        if order is None:
+            raise ValueError(f"sort должен быть одним из: {', '.join(SORT_ORDERS)}")
+
+        filters, extra = self._filters(params)
+        counts = None
+        if params.get('facets'):
+            matched, counts = self.facets.query(filters, extra)
+        else:
+            matched = self.facets.select(filters, extra) if filters or extra else None
+
+        start, end = page * per_page, (page + 1) * per_page
+        if matched is None:
+            found = len(order)
+            selected = order[start:end]
+        elif order is self.orders['date']:
+            # Номера и есть порядок по дате - страница берётся прямо из карты
+            candidates = ordinals(matched)
+            found = len(candidates)
+            selected = candidates[start:end]
+        else:
+            candidates = set(ordinals(matched))
+            found = len(candidates)
+            selected = []
+            position = 0
+            for ordinal in order:
+                if ordinal in candidates:
+                    if position >= start:
+                        selected.append(ordinal)
+                        if len(selected) == per_page:
+                            break
+                    position += 1
+
+        response = {
+            'found': found,
+            'page': page,
+            'pages': math.ceil(found / per_page),
+            'per_page': per_page,
+            'snapshot': self.version,
+            'items': [self.records[i] for i in selected]
+        }
+        if counts is not None:
+            response['facets'] = counts
+        return response
+
+    def render(self, params: Dict[str, str], use_gzip: bool) -> Tuple[str, bytes, bool]:
+        """
+        Готовый ответ (ETag, тело, сжато ли) с кэшированием по параметрам
+
+        Снимок неизменяем, поэтому ответ на одинаковые параметры
+        вычисляется один раз.
+        """
+        key = urlencode(sorted(params.items()))
+        cached = self._responses.get(key)
+        if cached is None:
+            body = json.dumps(self.query(params), ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+            compressed = gzip.compress(body, 5, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+            etag = hashlib.sha1(f"{self.version}?{key}".encode('utf-8')).hexdigest()[:24]
+            cached = (etag, body, compressed)
+            self._responses[key] = cached
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        else:
+            self._responses.move_to_end(key)
+
+        etag, body, compressed = cached
+        if use_gzip and compressed is not None:
+            return f'"{etag}-gz"', compressed, True
+        return f'"{etag}"', body, False
+
+
+class ReadAPIServer:
+    """HTTP/1.1 сервер на asyncio с горячей подменой снимка"""
+
+    def __init__(self, paths: List[str], reload_interval: float = RELOAD_INTERVAL):
+        self.paths = paths
+        self.reload_interval = reload_interval
+        self._mtimes = self._current_mtimes()
+        self.index = SnapshotIndex.from_files(self._existing())
+        print(f"📚 Загружено вакансий: {len(self.index.records)} (снимок {self.index.version})")
+
+    def _existing(self) -> List[str]:
+        return [path for path in self.paths if os.path.exists(path)]
+
+    def _current_mtimes(self) -> Tuple:
+        return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in self.paths)
+
+    async def watch_snapshots(self):
+        """Следит за файлами и подменяет индекс после их изменения"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            mtimes = self._current_mtimes()
+            if mtimes == self._mtimes:
+                continue
+            try:
+                index = await loop.run_in_executor(None, SnapshotIndex.from_files, self._existing())
+            except (OSError, ValueError) as e:
+                # Файл мог быть записан не до конца - попробуем в следующий раз
+                print(f"⚠️ Не удалось перечитать снимки: {e}")
+                continue
+            self._mtimes = mtimes
+            self.index = index
+            print(f"🔄 Новый снимок {index.version}: {len(index.records)} вакансий")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслуживает keep-alive соединение"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    self._write(writer, 400, b'{"error":"bad request"}')
+                    break
+
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._respond(writer, method, target, headers, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, writer: asyncio.StreamWriter, method: str, target: str,
+                 headers: Dict[str, str], keep_alive: bool):
+        """Маршрутизация и формирование ответа"""
+        if method != 'GET':
+            self._write(writer, 405, b'{"error":"method not allowed"}', keep_alive=keep_alive)
+            return
+
+        url = urlsplit(target)
+        if url.path == '/health':
+            body = json.dumps({'status': 'ok', 'snapshot': self.index.version,
+                               'vacancies': len(self.index.records)}).encode('utf-8')
+            self._write(writer, 200, body, keep_alive=keep_alive)
+            return
+        if url.path != '/vacancies':
+            self._write(writer, 404, b'{"error":"not found"}', keep_alive=keep_alive)
+            return
+
+        # Ссылка на индекс берётся один раз - подмена снимка не затронет запрос
+        index = self.index
+        params = dict(parse_qsl(url.query))
+        use_gzip = 'gzip' in headers.get('accept-encoding', '')
+        try:
+            etag, body, compressed = index.render(params, use_gzip)
+        except ValueError as e:
+            body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+            self._write(writer, 400, body, keep_alive=keep_alive)
+            return
+
+        if headers.get('if-none-match') == etag:
+            self._write(writer, 304, b'', etag=etag, keep_alive=keep_alive)
+            return
+        self._write(writer, 200, body, etag=etag, gzipped=compressed, keep_alive=keep_alive)
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, body: bytes, etag: Optional[str] = None,
+               gzipped: bool = False, keep_alive: bool = False):
+        reasons = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request',
+                   404: 'Not Found', 405: 'Method Not Allowed'}
+        lines = [
+            f"HTTP/1.1 {status} {reasons.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache",
+            "Vary: Accept-Encoding",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        if gzipped:
+            lines.append("Content-Encoding: gzip")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"🌐 API чтения: http://{host}:{port}/vacancies")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.watch_snapshots())
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Локальный API чтения вакансий")
+    parser.add_argument('--files', nargs='+', default=SNAPSHOT_FILES, help="файлы снимков")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL)
+    args = parser.parse_args(argv)
+
+    server = ReadAPIServer(args.files, args.reload_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n\n⚠️ Сервер остановлен")
+
+
+if __name__ == "__main__":
+    main()
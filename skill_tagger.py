@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Теги технологий в вакансиях: словарь навыков и автомат Ахо-Корасик
+
+Для вакансий сисадмина главное - стек (Linux, Windows Server, AD,
+VMware, Cisco, 1С, Zabbix...), а он спрятан в тексте requirement /
+responsibility. Словарь SKILLS (навык -> варианты написания) плюс
+необязательный skills.json с дополнениями компилируется в автомат
+Ахо-Корасик, и каждая вакансия размечается одним проходом по тексту:
+время линейно по длине текста и не растёт с размером словаря, в отличие
+от цикла re.search по сотням шаблонов.
+
+Совпадение засчитывается только целым словом (до и после - не буква и
+не цифра), поэтому 'ad' не находится внутри 'admin'.
+
+Вакансия получает поле skills (отсортированные названия), а статистика
+снимка - блок skills: число вакансий и медиана зарплаты по навыку.
+
+Пример:
+    python skill_tagger.py hh_vacancies.json --top 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from vacancy_fields import salary_rub_mid
+
+# Навык -> варианты написания (в нижнем регистре, ё как е)
+SKILLS: Dict[str, List[str]] = {
+    'Linux': ['linux', 'линукс', 'unix', 'centos', 'debian', 'ubuntu', 'red hat', 'redhat', 'rhel',
+              'astra linux', 'астра линукс', 'alt linux', 'альт линукс', 'ред ос', 'red os'],
+    'Windows Server': ['windows server', 'win server', 'windows 2012', 'windows 2016', 'windows 2019',
+                       'windows 2022', 'ms windows server'],
+    'Active Directory': ['active directory', 'ad', 'ldap', 'group policy', 'групповые политики', 'gpo'],
+    'Exchange': ['exchange', 'ms exchange'],
+    'DNS/DHCP': ['dns', 'dhcp'],
+    'VMware': ['vmware', 'vsphere', 'esxi', 'vcenter'],
+    'Hyper-V': ['hyper-v', 'hyperv', 'hyper v'],
+    'Proxmox': ['proxmox'],
+    'KVM': ['kvm', 'qemu'],
+    'Docker': ['docker', 'docker-compose', 'docker compose', 'контейнеризация'],
+    'Kubernetes': ['kubernetes', 'k8s', 'openshift'],
+    'Ansible': ['ansible'],
+    'Terraform': ['terraform'],
+    'Git': ['git', 'gitlab', 'github'],
+    'CI/CD': ['ci/cd', 'ci cd', 'jenkins', 'gitlab ci'],
+    'Bash': ['bash', 'shell'],
+    'PowerShell': ['powershell', 'power shell'],
+    'Python': ['python', 'питон'],
+    'Cisco': ['cisco', 'циско', 'ccna', 'ccnp'],
+    'MikroTik': ['mikrotik', 'микротик', 'routeros'],
+    'Juniper': ['juniper'],
+    'Huawei': ['huawei'],
+    'TCP/IP': ['tcp/ip', 'tcp ip', 'модель osi', 'osi'],
+    'VPN': ['vpn', 'ipsec', 'openvpn', 'wireguard'],
+    'VLAN': ['vlan', 'vlans'],
+    'Маршрутизация': ['ospf', 'bgp', 'маршрутизация', 'routing'],
+    'Firewall': ['firewall', 'межсетевой экран', 'iptables', 'fortigate', 'usergate', 'check point',
+                 'checkpoint', 'pfsense'],
+    '1С': ['1с', '1c', '1с предприятие', '1с:предприятие'],
+    'Zabbix': ['zabbix', 'заббикс'],
+    'Prometheus': ['prometheus'],
+    'Grafana': ['grafana'],
+    'ELK': ['elk', 'elasticsearch', 'kibana', 'logstash', 'opensearch'],
+    'Nginx': ['nginx'],
+    'Apache': ['apache'],
+    'PostgreSQL': ['postgresql', 'postgres', 'postgre', 'постгрес'],
+    'MySQL': ['mysql', 'mariadb'],
+    'MS SQL': ['ms sql', 'mssql', 'sql server'],
+    'Oracle': ['oracle'],
+    'Резервное копирование': ['резервное копирование', 'backup', 'бэкап', 'бекап', 'veeam', 'bacula',
+                              'кибер бэкап', 'cyber backup'],
+    'СХД': ['схд', 'san', 'nas', 'raid', 'iscsi', 'netapp'],
+    'Серверное оборудование': ['hpe', 'hp proliant', 'dell poweredge', 'supermicro', 'idrac', 'ilo'],
+    'IP-телефония': ['ip-телефония', 'ip телефония', 'asterisk', 'voip', 'sip'],
+    'Wi-Fi': ['wi-fi', 'wifi', 'беспроводные сети'],
+    'СКС': ['скс', 'структурированные кабельные системы'],
+    'Информационная безопасность': ['информационная безопасность', 'иб', 'siem', 'dlp', 'kaspersky',
+                                    'касперский', 'антивирус', 'dr web', 'dr.web'],
+    'ITIL': ['itil', 'service desk', 'servicedesk', 'helpdesk', 'help desk'],
+    'Microsoft 365': ['office 365', 'microsoft 365', 'ms office', 'sharepoint'],
+    'Terminal Server': ['rdp', 'rds', 'терминальный сервер', 'терминальные серверы', 'citrix'],
+    'AWS': ['aws', 'amazon web services'],
+    'Yandex Cloud': ['yandex cloud', 'яндекс облако', 'yandex.cloud'],
+    'English': ['английский', 'english'],
+}
+
+# Дополнения словаря без правки кода: {"Навык": ["вариант", ...]}
+SKILLS_FILE = os.environ.get('VACANCY_SKILLS_FILE', 'skills.json')
+
+TEXT_FIELDS = ('name', 'requirement', 'responsibility')
+
+
+def normalize(text: str) -> str:
+    return (text or '').lower().replace('ё', 'е')
+
+
+def load_skills(path: str = SKILLS_FILE) -> Dict[str, List[str]]:
+    """SKILLS, дополненный файлом path, если он есть"""
+    skills = {name: list(aliases) for name, aliases in SKILLS.items()}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            extra = json.load(f)
+    except (OSError, ValueError):
+        return skills
+    for name, aliases in extra.items():
+        skills.setdefault(name, []).extend(aliases)
+    return skills
+
+
+class SkillMatcher:
+    """Автомат Ахо-Корасик по всем вариантам написания навыков"""
+
+    def __init__(self, skills: Optional[Dict[str, List[str]]] = None):
+        skills = skills if skills is not None else load_skills()
+        self.names: List[str] = sorted(skills)
+        # Узлы автомата: переходы, суффиксная ссылка и совпадения (навык, длина)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, int]]] = [[]]
+        for skill_index, name in enumerate(self.names):
+            for alias in {normalize(name), *map(normalize, skills[name])}:
+                if alias:
+                    self._add(alias, skill_index)
+        self._link()
+
+    def _add(self, pattern: str, skill_index: int):
+        node = 0
+        for char in pattern:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append((skill_index, len(pattern)))
+
+    def _link(self):
+        """Суффиксные ссылки обходом в ширину; совпадения наследуются по ссылке"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> Set[str]:
+        """Навыки, встреченные в тексте целым словом"""
+        text = normalize(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        found: Set[int] = set()
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for skill_index, length in output[node]:
+                start, end = position - length + 1, position + 1
+                if ((start == 0 or not text[start - 1].isalnum())
+                        and (end == len(text) or not text[end].isalnum())):
+                    found.add(skill_index)
+        return {self.names[index] for index in found}
+
+
+_default_matcher: Optional[SkillMatcher] = None
+
+
+def default_matcher() -> SkillMatcher:
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SkillMatcher()
+    return _default_matcher
+
+
+def vacancy_text(vacancy: Dict) -> str:
+    return '\n'.join(vacancy.get(field) or '' for field in TEXT_FIELDS)
+
+
+def tag_vacancies(vacancies: Iterable[Dict], matcher: Optional[SkillMatcher] = None):
+    """Проставляет каждой вакансии поле skills"""
+    matcher = matcher or default_matcher()
+    for vacancy in vacancies:
+        vacancy['skills'] = sorted(matcher.find(vacancy_text(vacancy)))
+
+
+def skill_statistics(vacancies: Iterable[Dict]) -> Dict[str, Dict]:
+    """Навык -> {'count': вакансий, 'salary_median': медиана середины вилки в рублях или None}"""
+    counts: Dict[str, int] = {}
+    salaries: Dict[str, List[float]] = {}
+    for vacancy in vacancies:
+        mid = salary_rub_mid(vacancy)
+        for skill in vacancy.get('skills', []):
+            counts[skill] = counts.get(skill, 0) + 1
+            if mid is not None:
+                salaries.setdefault(skill, []).append(mid)
+    return {
+        skill: {'count': count,
+                'salary_median': round(statistics.median(salaries[skill])) if skill in salaries else None}
+        for skill, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Навыки в вакансиях: частота и медиана зарплаты")
+    parser.add_argument('file', help="JSON-снимок")
+    parser.add_argument('--top', type=int, default=30)
+    args = parser.parse_args(argv)
+
+    with open(args.file, 'r', encoding='utf-8') as f:
+        vacancies = [v for v in json.load(f).get('vacancies', []) if not v.get('duplicate_of')]
+    tag_vacancies(vacancies)
+    stats = skill_statistics(vacancies)
+    tagged = sum(1 for v in vacancies if v['skills'])
+    print(f"📊 Вакансий: {len(vacancies)}, с навыками: {tagged}\n")
+    print(f"{'навык':30s} {'вакансий':>9s} {'медиана, ₽':>11s}")
+    for skill, row in list(stats.items())[:args.top]:
+        median = f"{row['salary_median']:,}".replace(',', ' ') if row['salary_median'] else '—'
+        print(f"{skill:30s} {row['count']:9d} {median:>11s}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
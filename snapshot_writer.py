@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Каноническая запись снимков вакансий с манифестом по хэшу содержимого
+
+Раньше каждый запуск записывал новое время в 'updated', и файл менялся
+каждый час, даже если вакансии остались прежними. Теперь:
+  - JSON пишется канонически (sort_keys, стабильный порядок вакансий)
+    через json_codec - байты одинаковы с orjson и без него;
+  - время запуска и прочие изменчивые поля уходят в <имя>.meta.json;
+  - рядом лежит <имя>.manifest.json с sha256 содержимого, а 'updated'
+    в самом файле - это время последнего реального изменения.
+Если содержимое не изменилось, файл и манифест получаются побайтно
+теми же, и workflow пропускает коммит и выгрузку на FTP.
+
+Производные файлы для сайта (<имя>.<вид>.json) строятся по вакансиям
+снимка стадиями EXPORT_STAGES - только когда снимок изменился или файла
+ещё нет. В каждом записан sha256 снимка, из которого он построен.
+Стадии FILE_EXPORTS пишут файлы в своём формате сами (колоночная
+выгрузка для аналитики).
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from facet_bitmaps import build_facets
+from facet_suggest import build_suggest
+from geo_index import build_geo_index
+from json_codec import canonical_bytes, dumps, load_file
+from sorted_views import build_views
+
+# Поля, которые меняются при каждом запуске и не входят в хэш
+VOLATILE_FIELDS = ('updated',)
+
+# Стадии экспорта: вид -> функция(вакансии снимка) -> данные <имя>.<вид>.json
+EXPORT_STAGES: Dict[str, Callable[[List[Dict]], Dict]] = {
+    'views': build_views,
+    'geo': build_geo_index,
+    'suggest': build_suggest,
+    'facets': build_facets,
+}
+
+def _export_columns(filename: str, vacancies: List[Dict], digest: Optional[str] = None,
+                    force: bool = True) -> List[str]:
+    """Колоночная выгрузка: numpy импортируется только при записи, не при каждом импорте модуля"""
+    from columnar_export import export_columns
+    return export_columns(filename, vacancies, digest, force)
+
+
+# Стадии со своим форматом: вид -> функция(снимок, вакансии, sha256, force) -> записанные пути
+FILE_EXPORTS: Dict[str, Callable[[str, List[Dict], Optional[str], bool], List[str]]] = {
+    'columns': _export_columns,
+}
+
+
+def content_hash(data: bytes) -> str:
+    """sha256 канонических байтов"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sort_vacancies(vacancies: List[Dict]) -> List[Dict]:
+    """Стабильный порядок: сначала новые, при равной дате - по id"""
+    by_id = sorted(vacancies, key=lambda v: str(v.get('id') or ''))
+    return sorted(by_id, key=lambda v: v.get('published_at') or '', reverse=True)
+
+
+def sidecar_path(filename: str, kind: str) -> str:
+    """hh_vacancies.json -> hh_vacancies.<kind>.json"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{kind}{ext or '.json'}"
+
+
+def read_manifest(filename: str) -> Optional[Dict]:
+    """Манифест артефакта или None, если его ещё нет"""
+    try:
+        return load_file(sidecar_path(filename, 'manifest'))
+    except (OSError, ValueError):
+        return None
+
+
+def read_snapshot(filename: str) -> Optional[Dict]:
+    """Прошлый снимок или None, если его нет или он повреждён"""
+    try:
+        return load_file(filename)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_bytes(path: str, data: bytes):
+    """Атомарная запись файла"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def write_exports(filename: str, vacancies: List[Dict], digest: Optional[str] = None,
+                  only: Optional[Iterable[str]] = None, force: bool = True) -> List[str]:
+    """
+    Строит производные файлы стадий EXPORT_STAGES (компактный JSON) и FILE_EXPORTS
+
+    force=False пропускает стадии, чей файл уже есть. Ошибка стадии не
+    прерывает остальные: она печатается, а устаревший файл стадии
+    удаляется, чтобы следующий запуск построил его заново.
+
+    Returns:
+        Пути записанных файлов
+    """
+    if digest is None:
+        manifest = read_manifest(filename) or {}
+        digest = manifest.get('sha256')
+    written = []
+    for kind, build in EXPORT_STAGES.items():
+        path = sidecar_path(filename, kind)
+        if (only is not None and kind not in only) or (not force and os.path.exists(path)):
+            continue
+        try:
+            _write_bytes(path, dumps(dict(build(vacancies), sha256=digest)))
+        except Exception as e:
+            _export_failed(kind, path, e)
+            continue
+        written.append(path)
+    for kind, export in FILE_EXPORTS.items():
+        if only is None or kind in only:
+            try:
+                written.extend(export(filename, vacancies, digest, force))
+            except Exception as e:
+                _export_failed(kind, None, e)
+    return written
+
+
+def _export_failed(kind: str, path: Optional[str], error: Exception):
+    """Ошибка стадии экспорта: снимок уже записан, пропадает только производный файл"""
+    print(f"   ⚠️ Стадия экспорта {kind} не удалась: {error!r}")
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def report_change(changed: bool):
+    """Передаёт признак изменения в шаги GitHub Actions (outputs.changed)"""
+    output = os.environ.get('GITHUB_OUTPUT')
+    if output:
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(f"changed={'true' if changed else 'false'}\n")
+
+
+def write_snapshot(filename: str, payload: Dict) -> bool:
+    """
+    Записывает снимок канонически вместе с манифестом и meta-файлом
+
+    Args:
+        filename: Имя файла снимка
+        payload: Данные снимка; изменчивые поля (VOLATILE_FIELDS) из него
+            переносятся в meta-файл
+
+    Returns:
+        True, если содержимое изменилось по сравнению с прошлым манифестом
+    """
+    now = datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+    stable = {key: value for key, value in payload.items() if key not in VOLATILE_FIELDS}
+    volatile = {key: payload[key] for key in VOLATILE_FIELDS if key in payload}
+
+    digest = content_hash(canonical_bytes(stable))
+    previous = read_manifest(filename)
+    changed = not previous or previous.get('sha256') != digest or not os.path.exists(filename)
+    content_updated = now if changed else previous['content_updated']
+
+    # 'updated' оставляем в файле для фронтенда, но это время изменения содержимого
+    data = canonical_bytes(dict(stable, updated=content_updated))
+    _write_bytes(filename, data)
+
+    manifest = {
+        'artifact': os.path.basename(filename),
+        'sha256': digest,
+        'size': len(data),
+        'vacancies': len(stable.get('vacancies', [])),
+        'content_updated': content_updated
+    }
+    _write_bytes(sidecar_path(filename, 'manifest'), canonical_bytes(manifest))
+
+    meta = dict(volatile, changed=changed, sha256=digest)
+    _write_bytes(sidecar_path(filename, 'meta'), canonical_bytes(meta))
+    report_change(changed)
+
+    # Снимок и манифест уже на диске: ошибки стадий их не затрагивают
+    write_exports(filename, stable.get('vacancies', []), digest, force=changed)
+    return changed
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Готовые порядки сортировки снимка для сайта (<имя>.views.json)
+
+Снимок отсортирован только по дате, и сайт пересортировывал весь массив
+при каждом выборе порядка. Теперь при записи снимка рядом кладутся
+перестановки - массивы индексов в 'vacancies' для частых порядков:
+    salary_desc - по середине вилки в рублях, без зарплаты в конце;
+    newest      - сначала новые;
+    company     - по компании А-Я, без компании в конце;
+    area        - по региону А-Я.
+Каждый порядок - одна сортировка декорированных ключей; при равных
+ключах сохраняется порядок снимка. Сайт листает любой порядок страницами
+без сортировки: vacancies[views.salary_desc[i]].
+
+Пример:
+    python sorted_views.py hh_vacancies.json      # пересобрать views рядом со снимком
+"""
+
+import argparse
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from vacancy_fields import parse_timestamp, salary_rub_mid
+
+
+def _text_key(value: Optional[str]) -> Tuple[bool, str]:
+    """Пустые в конец, остальное без учёта регистра (ё как е) и без кавычек в начале"""
+    text = re.sub(r'^\W+', '', (value or '').casefold().replace('ё', 'е'))
+    return not text, text
+
+
+def _salary_key(vacancy: Dict) -> Tuple[bool, float]:
+    mid = salary_rub_mid(vacancy)
+    return mid is None, -(mid or 0)
+
+
+def _newest_key(vacancy: Dict) -> Tuple[bool, float]:
+    published = parse_timestamp(vacancy.get('published_at') or '')
+    return published is None, -(published or 0)
+
+
+VIEWS: Dict[str, Callable[[Dict], Tuple]] = {
+    'salary_desc': _salary_key,
+    'newest': _newest_key,
+    'company': lambda v: _text_key(v.get('company')),
+    'area': lambda v: _text_key(v.get('area')),
+}
+
+
+def sorted_view(vacancies: List[Dict], key: Callable[[Dict], Tuple]) -> List[int]:
+    """Перестановка индексов: одна сортировка пар (ключ, индекс)"""
+    decorated = [(key(vacancy), index) for index, vacancy in enumerate(vacancies)]
+    decorated.sort()
+    return [index for _, index in decorated]
+
+
+def build_views(vacancies: List[Dict]) -> Dict:
+    """Все порядки VIEWS для списка вакансий снимка"""
+    return {
+        'count': len(vacancies),
+        'views': {name: sorted_view(vacancies, key) for name, key in VIEWS.items()}
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    from snapshot_writer import read_snapshot, write_exports
+
+    parser = argparse.ArgumentParser(description="Перестановки для сортировки снимка на сайте")
+    parser.add_argument('files', nargs='+', help="JSON-снимки")
+    args = parser.parse_args(argv)
+
+    for filename in args.files:
+        snapshot = read_snapshot(filename)
+        if snapshot is None:
+            print(f"❌ Не удалось прочитать {filename}")
+            return False
+        for path in write_exports(filename, snapshot.get('vacancies', []), only=['views']):
+            print(f"📑 {path}: {len(snapshot.get('vacancies', []))} вакансий, порядков {len(VIEWS)}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Сбор вакансий с нескольких площадок через адаптеры источников
+
+Каждый источник (VacancySource) задаёт:
+  - пагинацию: параметры страницы и разбор ответа (элементы, число страниц);
+  - политику запросов: свой HHClient с базовым URL, заголовками и паузой;
+  - приведение элемента к формату collect_vacancies.parse_vacancy.
+Первый адаптер - HH (та же логика, что в collect_vacancies.py), за ним
+Trudvsem (opendata.trudvsem.ru) и SuperJob.
+
+Источники опрашиваются параллельно; результаты сливаются в один поток в
+порядке списка источников. Внутри источника дубли отсеиваются по id,
+между источниками - по URL и по названию + компании + региону (остаётся
+запись из источника, указанного раньше).
+
+Базовые URL переопределяются переменными окружения (HH_API_URL,
+TRUDVSEM_API_URL, SUPERJOB_API_URL), поэтому всё проверяется на
+локальных стабах: python benchmarks/stub_sources.py
+
+Пример:
+    python sources.py --sources hh,trudvsem,superjob --output vacancies_all.json
+"""
+
+import argparse
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from collect_vacancies import (DEFAULT_AREAS, HEADERS, REQUEST_DELAY, SEARCH_KEYWORDS,
+                               clean_html, format_salary, parse_vacancy, safe_get,
+                               save_vacancies, search_params)
+from fetch_policy import print_fetch_stats
+from hh_client import API_URL, HHClient
+from page_prober import page_limit
+from query_compiler import MODE_VERIFY, QUERY_MODES, choose_queries
+from snapshot_writer import sort_vacancies
+from vacancy_fields import HH_TIME_FORMAT, MSK
+
+TRUDVSEM_API_URL = os.environ.get('TRUDVSEM_API_URL', "http://opendata.trudvsem.ru/api/v1")
+SUPERJOB_API_URL = os.environ.get('SUPERJOB_API_URL', "https://api.superjob.ru/2.0")
+
+# Ключ приложения SuperJob; без него источник пропускается
+SUPERJOB_API_KEY = os.environ.get('SUPERJOB_API_KEY', '')
+
+DEFAULT_OUTPUT = 'vacancies_all.json'
+
+
+class VacancySource:
+    """
+    Адаптер площадки вакансий
+
+    Наследники переопределяют page_params, parse_page и to_vacancy;
+    при необходимости - queries и max_pages.
+    """
+
+    name = ''
+    base_url = ''
+    path = ''
+    request_delay = REQUEST_DELAY
+
+    def __init__(self, base_url: Optional[str] = None, client: Optional[HHClient] = None):
+        self.client = client or HHClient(base_url or self.base_url, headers=self.headers(),
+                                         request_delay=self.request_delay)
+
+    def available(self) -> bool:
+        """Можно ли опрашивать источник (например, есть ли ключ API)"""
+        return True
+
+    def headers(self) -> Dict:
+        return HEADERS
+
+    def queries(self) -> List[str]:
+        """Поисковые запросы этого источника"""
+        return SEARCH_KEYWORDS
+
+    def max_pages(self) -> Optional[int]:
+        """Предел глубины выдачи в страницах или None"""
+        return None
+
+    def page_params(self, query: str, page: int) -> Dict:
+        raise NotImplementedError
+
+    def parse_page(self, data: Dict) -> Tuple[List[Dict], Optional[int]]:
+        """Элементы страницы и общее число страниц (None, если неизвестно)"""
+        raise NotImplementedError
+
+    def to_vacancy(self, item: Dict) -> Dict:
+        """Элемент ответа -> запись в формате parse_vacancy"""
+        raise NotImplementedError
+
+    def fetch_items(self, query: str) -> Iterator[Dict]:
+        """Все элементы одного запроса постранично"""
+        limit = self.max_pages()
+        page = 0
+        total_pages = None
+        while limit is None or page < limit:
+            data = self.client.get_json(self.path, self.page_params(query, page), hedge=True)
+            if data is None:
+                break
+            items, pages = self.parse_page(data)
+            if total_pages is None:
+                total_pages = pages
+            yield from items
+
+            page += 1
+            if not items or (total_pages is not None and page >= total_pages):
+                break
+
+    def fetch(self) -> List[Dict]:
+        """Все вакансии источника в общем формате"""
+        vacancies = []
+        for query in self.queries():
+            for item in self.fetch_items(query):
+                try:
+                    vacancy = self.to_vacancy(item)
+                except Exception as e:
+                    print(f"   ⚠️ [{self.name}] Пропущена вакансия из-за ошибки: {e}")
+                    continue
+                vacancy['source'] = self.name
+                vacancies.append(vacancy)
+        print(f"   ✅ [{self.name}] Собрано: {len(vacancies)} вакансий, "
+              f"запросов: {self.client.requests_made}")
+        return vacancies
+
+
+class HHSource(VacancySource):
+    """api.hh.ru: те же параметры, запросы и разбор, что в collect_vacancies.py"""
+
+    name = 'hh.ru'
+    base_url = API_URL
+    path = '/vacancies'
+
+    def __init__(self, areas: List[str] = DEFAULT_AREAS, query_mode: str = MODE_VERIFY,
+                 base_url: Optional[str] = None, client: Optional[HHClient] = None):
+        super().__init__(base_url, client)
+        self.areas = areas
+        self.query_mode = query_mode
+
+    def queries(self) -> List[str]:
+        return choose_queries(self.client, SEARCH_KEYWORDS, search_params(self.areas),
+                              self.query_mode)
+
+    def max_pages(self) -> Optional[int]:
+        return page_limit(int(search_params(self.areas)['per_page']))
+
+    def page_params(self, query: str, page: int) -> Dict:
+        return dict(search_params(self.areas), text=query, page=str(page))
+
+    def parse_page(self, data: Dict) -> Tuple[List[Dict], Optional[int]]:
+        return data.get('items', []), data.get('pages', 0)
+
+    def to_vacancy(self, item: Dict) -> Dict:
+        return parse_vacancy(item)
+
+
+def _salary_raw(low: Optional[int], high: Optional[int]) -> Optional[Dict]:
+    """Вилка в формате salary HH (рубли, на руки); нули означают 'не указано'"""
+    if not (low or high):
+        return None
+    return {'from': low or None, 'to': high or None, 'currency': 'RUR', 'gross': False}
+
+
+def _vacancy_record(**fields) -> Dict:
+    """Запись с полным набором полей parse_vacancy; недостающие - пустые"""
+    vacancy = {
+        'id': '', 'name': '', 'company': '', 'company_id': '', 'company_url': '',
+        'company_logo': '', 'url': '', 'published_at': '', 'created_at': '', 'area': '',
+        'salary': 'не указана', 'salary_raw': None, 'experience': '', 'schedule': '',
+        'employment': '', 'requirement': '', 'responsibility': '', 'type': '',
+        'professional_roles': [], 'has_test': False, 'premium': False,
+        'accept_handicapped': False, 'accept_kids': False, 'accept_temporary': False,
+        'lat': None, 'lng': None
+    }
+    vacancy.update(fields)
+    if vacancy['salary_raw']:
+        vacancy['salary'] = format_salary(vacancy['salary_raw'])
+    return vacancy
+
+
+class TrudvsemSource(VacancySource):
+    """
+    opendata.trudvsem.ru ("Работа России")
+
+    Пагинация: offset - номер страницы, limit - размер; число страниц
+    считается по meta.total. Без region_code ищет по всей России.
+    """
+
+    name = 'trudvsem.ru'
+    base_url = TRUDVSEM_API_URL
+    per_page = 100
+
+    def __init__(self, region_code: Optional[str] = None, base_url: Optional[str] = None,
+                 client: Optional[HHClient] = None):
+        super().__init__(base_url, client)
+        self.path = f"/vacancies/region/{region_code}" if region_code else '/vacancies'
+
+    def page_params(self, query: str, page: int) -> Dict:
+        return {'text': query, 'offset': page, 'limit': self.per_page}
+
+    def parse_page(self, data: Dict) -> Tuple[List[Dict], Optional[int]]:
+        items = [entry.get('vacancy') or {} for entry in safe_get(data, 'results', 'vacancies') or []]
+        total = safe_get(data, 'meta', 'total')
+        pages = -(-int(total) // self.per_page) if total is not None else None
+        return items, pages
+
+    def to_vacancy(self, item: Dict) -> Dict:
+        created = item.get('creation-date') or ''
+        published = f"{created}T00:00:00+0300" if created else ''
+        years = safe_get(item, 'requirement', 'experience')
+        experience = '' if years is None else ('Нет опыта' if int(years) == 0 else f"От {years} г.")
+        return _vacancy_record(
+            id=f"trudvsem:{item.get('id', '')}",
+            name=item.get('job-name', ''),
+            company=safe_get(item, 'company', 'name') or '',
+            company_id=str(safe_get(item, 'company', 'companycode') or ''),
+            company_url=safe_get(item, 'company', 'url') or '',
+            url=item.get('vac_url', ''),
+            published_at=published,
+            created_at=published,
+            area=safe_get(item, 'region', 'name') or '',
+            salary_raw=_salary_raw(item.get('salary_min'), item.get('salary_max')),
+            experience=experience,
+            schedule=item.get('schedule', ''),
+            employment=item.get('employment', ''),
+            requirement=clean_html(safe_get(item, 'requirement', 'qualification') or ''),
+            responsibility=clean_html(item.get('duty', ''))
+        )
+
+
+class SuperJobSource(VacancySource):
+    """
+    api.superjob.ru
+
+    Пагинация: page/count, число страниц по total, последняя страница -
+    more = false; API отдаёт не больше 500 результатов на запрос. Нужен ключ SUPERJOB_API_KEY.
+    """
+
+    name = 'superjob.ru'
+    base_url = SUPERJOB_API_URL
+    path = '/vacancies/'
+    per_page = 100
+    max_results = 500
+
+    def __init__(self, api_key: str = SUPERJOB_API_KEY, base_url: Optional[str] = None,
+                 client: Optional[HHClient] = None):
+        self.api_key = api_key
+        super().__init__(base_url, client)
+
+    def available(self) -> bool:
+        return bool(self.api_key)
+
+    def headers(self) -> Dict:
+        return dict(HEADERS, **{'X-Api-App-Id': self.api_key})
+
+    def max_pages(self) -> Optional[int]:
+        return self.max_results // self.per_page
+
+    def page_params(self, query: str, page: int) -> Dict:
+        return {'keyword': query, 'page': page, 'count': self.per_page}
+
+    def parse_page(self, data: Dict) -> Tuple[List[Dict], Optional[int]]:
+        items = data.get('objects') or []
+        if not data.get('more'):
+            return items, 0
+        total = data.get('total')
+        return items, -(-int(total) // self.per_page) if total is not None else None
+
+    def to_vacancy(self, item: Dict) -> Dict:
+        published = ''
+        if item.get('date_published'):
+            published = datetime.fromtimestamp(item['date_published'], MSK).strftime(HH_TIME_FORMAT)
+        return _vacancy_record(
+            id=f"superjob:{item.get('id', '')}",
+            name=item.get('profession', ''),
+            company=item.get('firm_name', ''),
+            company_id=str(safe_get(item, 'client', 'id') or ''),
+            company_url=safe_get(item, 'client', 'link') or '',
+            company_logo=item.get('client_logo') or '',
+            url=item.get('link', ''),
+            published_at=published,
+            created_at=published,
+            area=safe_get(item, 'town', 'title') or '',
+            salary_raw=_salary_raw(item.get('payment_from'), item.get('payment_to')),
+            experience=safe_get(item, 'experience', 'title') or '',
+            schedule=safe_get(item, 'place_of_work', 'title') or '',
+            employment=safe_get(item, 'type_of_work', 'title') or '',
+            requirement=clean_html(item.get('candidat') or ''),
+            responsibility=clean_html(item.get('work') or '')
+        )
+
+
+SOURCES = {
+    'hh': HHSource,
+    'trudvsem': TrudvsemSource,
+    'superjob': SuperJobSource
+}
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(re.sub(r'[^\w]+', ' ', (text or '').lower()).split())
+
+
+def dedup_keys(vacancy: Dict) -> List[Tuple]:
+    """Ключи дедупликации между площадками: URL без схемы/параметров и название + компания + регион"""
+    keys = []
+    url = vacancy.get('url')
+    if url:
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        keys.append(('url', host + parts.path.rstrip('/')))
+    name, company = _normalize(vacancy.get('name')), _normalize(vacancy.get('company'))
+    if name and company:
+        keys.append(('title', name, company, _normalize(vacancy.get('area'))))
+    return keys
+
+
+def merge_vacancies(streams: Iterable[List[Dict]]) -> Iterator[Dict]:
+    """
+    Сливает потоки источников без дублей
+
+    Внутри одного источника дубли - только одинаковый id (у HH одна вакансия
+    в нескольких городах - разные вакансии с одним названием); ключи
+    dedup_keys сравниваются лишь с вакансиями других источников.
+    """
+    foreign = set()
+    for vacancies in streams:
+        ids = set()
+        own = set()
+        for vacancy in vacancies:
+            vacancy_id = vacancy.get('id')
+            if vacancy_id and vacancy_id in ids:
+                continue
+            keys = dedup_keys(vacancy)
+            if any(key in foreign for key in keys):
+                continue
+            ids.add(vacancy_id)
+            own.update(keys)
+            yield vacancy
+        foreign |= own
+
+
+def fetch_all(sources: List[VacancySource]) -> List[Dict]:
+    """Опрашивает источники параллельно и возвращает общий список без дублей"""
+    sources = [source for source in sources if source.available()]
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+        futures = [executor.submit(source.fetch) for source in sources]
+        streams = []
+        for source, future in zip(sources, futures):
+            try:
+                streams.append(future.result())
+            except Exception as e:
+                print(f"   ❌ [{source.name}] Источник завершился с ошибкой: {e}")
+                streams.append([])
+
+    total = sum(len(stream) for stream in streams)
+    merged = list(merge_vacancies(streams))
+    print(f"\n🔀 Источников: {len(sources)}, вакансий: {total}, без дублей: {len(merged)}")
+    for source in sources:
+        print_fetch_stats({f"{source.name}{path}": stats
+                           for path, stats in source.client.fetch_stats().items()})
+    return merged
+
+
+def build_sources(names: List[str], areas: List[str], query_mode: str) -> List[VacancySource]:
+    """Адаптеры по именам из --sources"""
+    sources = []
+    for name in names:
+        sources.append(HHSource(areas, query_mode) if name == 'hh' else SOURCES[name]())
+        if not sources[-1].available():
+            print(f"⚠️ Источник {name} недоступен (нет ключа API) и будет пропущен")
+    return sources
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Сбор вакансий с нескольких площадок")
+    parser.add_argument('--sources', default=','.join(SOURCES),
+                        help=f"источники через запятую: {', '.join(SOURCES)}")
+    parser.add_argument('--areas', default=','.join(DEFAULT_AREAS), help="регионы HH через запятую")
+    parser.add_argument('--query-mode', choices=QUERY_MODES, default=MODE_VERIFY)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="файл результата")
+    args = parser.parse_args(argv)
+
+    names = [name for name in args.sources.split(',') if name]
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        parser.error(f"неизвестные источники: {', '.join(unknown)}")
+
+    print("=== СБОР ВАКАНСИЙ С НЕСКОЛЬКИХ ПЛОЩАДОК ===")
+    print(f"Время начала: {datetime.now()}")
+    sources = build_sources(names, [a for a in args.areas.split(',') if a], args.query_mode)
+    vacancies = sort_vacancies(fetch_all(sources))
+    if not vacancies:
+        print("\n❌ Не удалось найти ни одной вакансии")
+        return False
+
+    save_vacancies(vacancies, args.output, source=[s.name for s in sources if s.available()])
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -5,6 +5,8 @@ import requests
 import json
 from datetime import datetime
 
+from rate_budget import acquire_hh_token
+
 def test_hh_api():
     """Простой тест API HeadHunter"""
     
@@ -26,6 +28,7 @@ def test_hh_api():
     print(f"Параметры: {params}")
     
     try:
+        acquire_hh_token()
         response = requests.get(url, params=params, headers=headers, timeout=30)
         
         print(f"Статус: {response.status_code}")
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Дописывание изменений и пересборка бинарного снимка (binary_snapshot.py)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import binary_snapshot  # noqa: E402
+from vacancy_fields import parse_timestamp  # noqa: E402
+
+
+def _vacancy(vacancy_id: str, day: int, title: str = 'Системный администратор') -> dict:
+    return {'id': vacancy_id, 'name': title, 'published_at': f'2026-09-{day:02d}T12:00:00+0300'}
+
+
+def test_sync_appends_only_changes(tmp_path):
+    path = str(tmp_path / 'hh.vsnap')
+    vacancies = [_vacancy(str(i), 1 + i % 20) for i in range(1, 51)]
+    assert binary_snapshot.sync_binary(path, vacancies)['compacted']
+
+    with binary_snapshot.BinarySnapshot(path) as old_reader:
+        size = os.path.getsize(path)
+        updated = [v for v in vacancies if v['id'] != '7']
+        updated[0] = _vacancy('1', 2, 'Сисадмин')
+        updated.append(_vacancy('100', 25))
+        stats = binary_snapshot.sync_binary(path, updated)
+        assert stats == {'appended': 2, 'kept': 48, 'compacted': False}
+        assert os.path.getsize(path) > size
+        # Открытый раньше читатель видит свою версию
+        assert old_reader.get('1')['name'] == 'Системный администратор'
+        assert old_reader.get('7') is not None
+
+    with binary_snapshot.BinarySnapshot(path) as reader:
+        assert len(reader) == 50
+        assert reader.get('1')['name'] == 'Сисадмин'
+        assert reader.get('7') is None
+        assert reader.get('100') == _vacancy('100', 25)
+        start, end = parse_timestamp('2026-09-02T00:00:00+0300'), parse_timestamp('2026-09-03T00:00:00+0300')
+        in_range = [v for v in updated if start <= parse_timestamp(v['published_at']) < end]
+        assert reader.count_range(start, end) == len(in_range)
+        assert sorted(v['id'] for v in reader.iter_range(start, end)) == sorted(v['id'] for v in in_range)
+
+    assert binary_snapshot.sync_binary(path, updated) == {'appended': 0, 'kept': 50, 'compacted': False}
+
+
+def test_sync_compacts_when_mostly_garbage(tmp_path, monkeypatch):
+    monkeypatch.setattr(binary_snapshot, 'COMPACT_MIN_BYTES', 0)
+    path = str(tmp_path / 'hh.vsnap')
+    vacancies = [_vacancy(str(i), 1 + i % 20) for i in range(1, 21)]
+    binary_snapshot.sync_binary(path, vacancies)
+
+    renamed = [dict(v, name=f"Инженер {v['id']}") for v in vacancies]
+    stats = binary_snapshot.sync_binary(path, renamed)
+    assert stats['compacted']
+
+    fresh = str(tmp_path / 'fresh.vsnap')
+    binary_snapshot.write_binary(fresh, renamed)
+    with open(path, 'rb') as compacted, open(fresh, 'rb') as written:
+        assert compacted.read() == written.read()
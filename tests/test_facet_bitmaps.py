@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Карты фасетов: кодирование для facets.json и порог зарплаты (facet_bitmaps.py)"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import facet_bitmaps  # noqa: E402
+from vacancy_fields import salary_rub_range  # noqa: E402
+
+THRESHOLDS = [0, 1, 49_999, 50_000, 50_001, 120_000, 150_000, 299_999, 300_000, 1_000_000]
+
+
+def _vacancies(count: int, seed: int = 49) -> list:
+    rng = random.Random(seed)
+    vacancies = []
+    for number in range(count):
+        vacancy = {
+            'id': str(number),
+            'schedule': rng.choice(['Удаленная работа', 'Полный день', 'Гибкий график']),
+            'experience': rng.choice(['Нет опыта', 'От 1 года до 3 лет', 'От 3 до 6 лет']),
+            'area': rng.choice(['Москва', 'Санкт-Петербург', 'Казань', '']),
+            'has_test': rng.random() < 0.2,
+            'premium': rng.random() < 0.05,
+        }
+        if rng.random() < 0.7:
+            low = rng.choice([None, rng.randint(20, 300) * 1000])
+            high = rng.choice([None, rng.randint(40, 400) * 1000, 50_000, 300_000])
+            vacancy['salary_raw'] = {'from': low, 'to': high, 'currency': rng.choice(['RUR', 'RUR', 'USD', 'KZT'])}
+        vacancies.append(vacancy)
+    return vacancies
+
+
+@pytest.mark.parametrize('numbers', [[], [0], [5, 6, 7, 1000], list(range(0, 3000, 2)), list(range(3000))])
+def test_bitmap_round_trip(numbers):
+    bitmap = facet_bitmaps.from_ordinals(numbers, 3000)
+    assert facet_bitmaps.ordinals(bitmap) == numbers
+    encoded = facet_bitmaps.encode_bitmap(bitmap)
+    assert facet_bitmaps.decode_bitmap(json.loads(json.dumps(encoded)), 3000) == bitmap
+
+
+def test_dense_bitmap_uses_bits_and_sparse_uses_deltas():
+    assert 'b' in facet_bitmaps.encode_bitmap(facet_bitmaps.from_ordinals(range(3000), 3000))
+    assert 'a' in facet_bitmaps.encode_bitmap(facet_bitmaps.from_ordinals([10, 2000], 3000))
+
+
+def test_index_from_json_matches_index_from_vacancies():
+    vacancies = _vacancies(700)
+    built = facet_bitmaps.FacetIndex.from_vacancies(vacancies)
+    loaded = facet_bitmaps.FacetIndex.from_json(json.loads(json.dumps(built.to_json())))
+    assert loaded.bitmaps == built.bitmaps
+
+    filters = {'schedule': ['удаленная работа'], 'area': ['Москва', 'Казань'], 'has_test': ['false']}
+    assert loaded.query(filters) == built.query(filters)
+    matched = facet_bitmaps.ordinals(built.select(filters))
+    expected = [n for n, v in enumerate(vacancies)
+                if v['schedule'] == 'Удаленная работа' and v['area'] in ('Москва', 'Казань') and not v['has_test']]
+    assert matched == expected
+
+
+@pytest.mark.parametrize('threshold', THRESHOLDS)
+def test_salary_at_least_is_exact(threshold):
+    vacancies = _vacancies(700)
+    expected = [n for n, v in enumerate(vacancies)
+                if salary_rub_range(v) is not None and salary_rub_range(v)[1] >= threshold]
+    built = facet_bitmaps.FacetIndex.from_vacancies(vacancies)
+    loaded = facet_bitmaps.FacetIndex.from_json(json.loads(json.dumps(built.to_json())))
+    assert facet_bitmaps.ordinals(built.salary_at_least(threshold)) == expected
+    assert facet_bitmaps.ordinals(loaded.salary_at_least(threshold)) == expected
+
+
+def test_salary_at_least_without_tops_is_superset():
+    data = facet_bitmaps.build_facets(_vacancies(300))
+    data.pop('salary_top')
+    exact = facet_bitmaps.FacetIndex.from_vacancies(_vacancies(300))
+    coarse = facet_bitmaps.FacetIndex.from_json(data)
+    for threshold in THRESHOLDS:
+        assert coarse.salary_at_least(threshold) & exact.salary_at_least(threshold) == exact.salary_at_least(threshold)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Порядок сегментов журнала при переигрывании (history_store.py)"""
+
+import os
+import random
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_store  # noqa: E402
+from vacancy_fields import MSK  # noqa: E402
+
+
+def _ts(day: int) -> float:
+    return datetime(2026, 9, day, 12, tzinfo=MSK).timestamp()
+
+
+def _record_days(directory: str):
+    """Вакансия 1 открыта 1-го и закрыта 2-го, вакансия 2 открыта 5-го"""
+    snapshots = {1: [{'id': '1'}], 2: [], 3: [{'id': '2'}], 5: [{'id': '2'}, {'id': '3'}]}
+    state = history_store.HistoryState()
+    for day, vacancies in snapshots.items():
+        events = history_store.diff_events(state, vacancies, _ts(day))
+        for event in events:
+            state.apply(event)
+        history_store.append_events(directory, events, _ts(day))
+
+
+def test_replay_shuffled_daily_segments(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    _record_days(directory)
+    listdir = os.listdir
+    for seed in range(5):
+        def shuffled(path, seed=seed):
+            names = listdir(path)
+            random.Random(seed).shuffle(names)
+            return names
+
+        monkeypatch.setattr(history_store.os, 'listdir', shuffled)
+        state = history_store.load_state(directory)
+        assert state.vacancies['1']['intervals'] == [[_ts(1), _ts(2)]]
+        assert state.is_open('2') and state.is_open('3')
+
+    history_store.compact(directory, now=_ts(1) + 40 * 86400)
+    os.remove(os.path.join(directory, history_store.STATE_FILE))
+    events = list(history_store.read_segment(os.path.join(directory, history_store.segment_name('2026-09'))))
+    assert [event['ts'] for event in events] == sorted(event['ts'] for event in events)
+    assert history_store.load_state(directory).vacancies['1']['intervals'] == [[_ts(1), _ts(2)]]
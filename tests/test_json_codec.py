@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Вывод json_codec совпадает с json байт в байт при любом бэкенде"""
+
+import json
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec  # noqa: E402
+
+TRICKY = [
+    {'salary': 1e16, 'small': 1e-7, 'tiny': 0.00001, 'big': 1.5e300, 'negative': -2.5e-10},
+    {'nan': math.nan},
+    {'values': [1.0, math.inf, None, -math.inf]},
+    {'text': 'вакансия 1e16 и 0.00001 в тексте', 'null': None, 'nested': {'a': [None, 0.1]}},
+    {'id': '1', 'coordinates': (55.75, 37.62), 'skills': []},
+]
+
+
+def stdlib(obj, indent: bool, sort_keys: bool) -> bytes:
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=sort_keys)
+    return text.encode('utf-8')
+
+
+@pytest.mark.parametrize('obj', TRICKY)
+@pytest.mark.parametrize('indent', [False, True])
+@pytest.mark.parametrize('sort_keys', [False, True])
+def test_tricky_values_match_stdlib(obj, indent, sort_keys):
+    assert json_codec.dumps(obj, indent=indent, sort_keys=sort_keys) == stdlib(obj, indent, sort_keys)
+
+
+def test_random_floats_match_stdlib():
+    rng = random.Random(41)
+    for _ in range(2000):
+        obj = {'salary': rng.choice([rng.uniform(-1e20, 1e20), rng.random() * 10 ** rng.randint(-12, 20),
+                                     float(rng.randint(0, 10 ** 6)), None]),
+               'id': str(rng.randint(1, 10 ** 9))}
+        assert json_codec.canonical_bytes(obj) == stdlib(obj, True, True) + b'\n'
+
+
+def test_nan_and_infinity_round_trip_as_stdlib():
+    data = json_codec.dumps({'a': math.nan, 'b': math.inf})
+    assert data == b'{"a":NaN,"b":Infinity}'
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Сбой запроса при замере пагинации - ошибка, а не пустая страница (page_prober.py)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import page_prober  # noqa: E402
+
+
+class FakeClient:
+    """Выдача до offset cap, дальше 400; страницы из failed не отвечают"""
+
+    def __init__(self, cap: int, failed=()):
+        self.cap = cap
+        self.failed = set(failed)
+        self.status = None
+
+    def last_status(self):
+        return self.status
+
+    def search_vacancies(self, params, quiet=False):
+        page, per_page = params['page'], params['per_page']
+        if page in self.failed:
+            self.status = None
+            return None
+        if page * per_page >= self.cap:
+            self.status = 400
+            return None
+        self.status = 200
+        return {'found': 5000, 'pages': 5000 // per_page, 'items': [{'id': str(page)}]}
+
+
+def test_offset_cap_past_limit_is_400():
+    assert page_prober.probe_offset_cap(FakeClient(2000)) == 2000
+
+
+def test_failed_request_aborts_offset_probe():
+    with pytest.raises(page_prober.ProbeError):
+        page_prober.probe_offset_cap(FakeClient(2000, failed={1249}))
+
+
+def test_failed_request_is_probe_error():
+    result = page_prober.probe_query(FakeClient(2000, failed={39}), 'x', {}, 50)
+    assert 'error' in result
+    assert page_prober.probe_query(FakeClient(2000), 'x', {}, 50)['last_page'] == 39
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Темп token bucket и пауза после 429 (rate_budget.py) на поддельных часах"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_budget  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_budget.time, 'time', fake.time)
+    monkeypatch.setattr(rate_budget.time, 'sleep', fake.sleep)
+    return fake
+
+
+def _starts(budget, clock, count):
+    """Моменты выхода запросов относительно начала (каждый после своего ожидания)"""
+    start = clock.now
+    starts = []
+    for _ in range(count):
+        budget.acquire()
+        starts.append(round(clock.now - start, 6))
+    return starts
+
+
+def test_burst_then_steady_rate(tmp_path, clock):
+    budget = rate_budget.RateBudget('test', rate=2, burst=2, path=str(tmp_path / 'budget.json'))
+    assert _starts(budget, clock, 5) == [0, 0, 0.5, 1.0, 1.5]
+    assert budget.waited == pytest.approx(1.5)
+
+
+def test_refill_is_capped_by_burst(tmp_path, clock):
+    budget = rate_budget.RateBudget('test', rate=2, burst=2, path=str(tmp_path / 'budget.json'))
+    _starts(budget, clock, 2)
+    clock.now += 100
+    assert _starts(budget, clock, 3) == [0, 0, 0.5]
+
+
+def test_backoff_spaces_requests_after_pause(tmp_path, clock):
+    budget = rate_budget.RateBudget('test', rate=2, burst=2, path=str(tmp_path / 'budget.json'))
+    _starts(budget, clock, 2)
+    start = clock.now
+    budget.backoff(10)
+    assert budget.state()['blocked_until'] == start + 10
+    assert _starts(budget, clock, 4) == [10.5, 11.0, 11.5, 12.0]
+
+
+def test_state_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / 'budget.json')
+    first = rate_budget.RateBudget('test', rate=1, burst=1, path=path)
+    second = rate_budget.RateBudget('test', rate=1, burst=1, path=path)
+    first.acquire()
+    assert second.acquire() == pytest.approx(1.0)
+    assert first.state()['requests'] == 2
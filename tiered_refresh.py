@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Обновление вакансий по уровням возраста вместо полного сбора каждый час
+
+Пространство поиска делится по дате публикации на уровни:
+    hot   - последние 24 часа, обновляется каждый запуск (раз в час);
+    warm  - от 1 до 7 дней, раз в 6 часов;
+    cold  - от 7 до 30 дней, раз в сутки.
+Старые вакансии меняются редко, поэтому глубокие страницы запрашиваются
+реже, а свежие остаются актуальными до минут.
+
+Каждый уровень собирается с date_from/date_to и хранится в своём кэше
+(.cache/tiers_<снимок>_<уровень>.json). При обновлении уровня вакансии,
+которые за это время «состарились» за его границу, передаются
+следующему уровню (если у него ещё нет кэша - он заводится и сразу
+«пора обновлять») - до его собственного обновления они не теряются.
+Пропавшие из выдачи внутри окна уровня считаются закрытыми.
+
+За запуск тратится не больше --max-requests запросов: уровни идут по
+приоритету (hot первым), и уровень, который по оценке прошлого раза не
+помещается в остаток бюджета, откладывается до следующего запуска, а
+внутри уровня бюджет проверяется перед каждой страницей (deadline.py).
+Результат всех уровней сливается в один снимок того же формата, что у
+collect_vacancies.py.
+
+С --deadline уровень, который по оценке прошлого раза не успеет, тоже
+откладывается. Недособранный уровень (не хватило времени или запросов)
+дополняется своим прежним кэшем и остаётся «пора обновлять» - следующий
+запуск начнёт с пропущенных страниц.
+
+Пример:
+    python tiered_refresh.py --shard 1 --output hh_vacancies_fullDay.json
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from collect_vacancies import (HEADERS, REQUEST_DELAY, build_parser, collect_all_vacancies, plan_collection,
+                               request_cost, resolve_areas, save_history, save_vacancies)
+from deadline import Deadline, load_skipped, save_skipped
+from fetch_policy import stats_since
+from hh_client import HHClient
+from json_cache import cache_path, read_cache, write_cache
+from query_compiler import MODE_VERIFY
+from snapshot_writer import sort_vacancies
+from vacancy_fields import HH_TIME_FORMAT, MSK, parse_timestamp
+
+# Бюджет запросов на один запуск по умолчанию
+DEFAULT_MAX_REQUESTS = 100
+
+# Запуск по cron немного «плавает» - уровень считается пора обновлять чуть раньше
+DUE_SLACK = 10 * 60
+
+# Кэш уровня, не обновлявшийся дольше, не используется
+TIER_CACHE_TTL = 30 * 24 * 3600
+
+
+class Tier:
+    """Уровень: вакансии возрастом [min_age, max_age) часов, обновляются раз в cadence часов"""
+
+    def __init__(self, name: str, min_age: float, max_age: float, cadence: float):
+        self.name = name
+        self.min_age = min_age
+        self.max_age = max_age
+        self.cadence = cadence
+
+    def search_params(self, now: datetime) -> Dict:
+        """date_from/date_to окна уровня на момент now"""
+        params = {'date_from': (now - timedelta(hours=self.max_age)).strftime(HH_TIME_FORMAT)}
+        if self.min_age:
+            params['date_to'] = (now - timedelta(hours=self.min_age)).strftime(HH_TIME_FORMAT)
+        return params
+
+    def is_due(self, state: Optional[Dict], now: float) -> bool:
+        return not state or now - state['fetched_at'] >= self.cadence * 3600 - DUE_SLACK
+
+
+TIERS = [
+    Tier('hot', 0, 24, 1),
+    Tier('warm', 24, 7 * 24, 6),
+    Tier('cold', 7 * 24, 30 * 24, 24)
+]
+
+
+def tier_cache_file(output: str, tier: Tier) -> str:
+    stem = os.path.splitext(os.path.basename(output))[0]
+    return cache_path(f"tiers_{stem}_{tier.name}.json")
+
+
+def overdue(tier: Tier, now: float) -> float:
+    """fetched_at, с которым уровню уже пора обновляться, а кэш ещё не устарел (не 0)"""
+    return now - tier.cadence * 3600
+
+
+def age_hours(vacancy: Dict, now: float) -> Optional[float]:
+    published = parse_timestamp(vacancy.get('published_at') or '')
+    return None if published is None else (now - published) / 3600
+
+
+def load_tier(output: str, tier: Tier, areas: List[str]) -> Optional[Dict]:
+    """Кэш уровня или None, если его нет или он собран для других регионов"""
+    state = read_cache(tier_cache_file(output, tier), TIER_CACHE_TTL)
+    if state is None or state.get('areas') != areas:
+        return None
+    return state
+
+
+def hand_down(states: Dict[str, Optional[Dict]], tier_index: int, vacancies: List[Dict],
+              areas: List[str], now: float):
+    """
+    Передаёт состарившиеся вакансии следующему уровню (из последнего они просто уходят)
+
+    Без кэша у следующего уровня заводится состояние, которому сразу пора
+    обновляться, - иначе переданные вакансии пропали бы до его первого сбора.
+    """
+    tier = TIERS[tier_index + 1]
+    target = states.get(tier.name)
+    if target is None:
+        target = states[tier.name] = {'areas': areas, 'fetched_at': overdue(tier, now), 'requests': 0,
+                                      'vacancies': []}
+    known = {v.get('id') for v in target['vacancies']}
+    target['vacancies'].extend(v for v in vacancies if v.get('id') not in known)
+
+
+def refresh_tiers(areas: List[str], output: str, query_mode: str = MODE_VERIFY,
+                  max_requests: int = DEFAULT_MAX_REQUESTS,
+                  client: Optional[HHClient] = None,
+                  deadline_seconds: Optional[float] = None,
+                  states: Optional[Dict[str, Optional[Dict]]] = None) -> List[Dict]:
+    """
+    Обновляет уровни, которым пора, в пределах бюджета и сливает все уровни
+
+    deadline_seconds ограничивает время запуска (см. deadline.py).
+    states - уровни в памяти между запусками (collector_daemon.py):
+    обновляются на месте, а с диска читаются только недостающие.
+
+    Returns:
+        Вакансии всех уровней без дублей (свежий уровень важнее)
+    """
+    client = client or HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+    now_dt = datetime.now(MSK)
+    now = now_dt.timestamp()
+    states = {} if states is None else states
+    for tier in TIERS:
+        if (states.get(tier.name) or {}).get('areas') != areas:
+            states[tier.name] = load_tier(output, tier, areas)
+    requests_start = client.requests_made
+    touched = set()
+    # Время и запросы проверяются перед каждой страницей, не только перед уровнем
+    deadline = Deadline(deadline_seconds, priority=load_skipped(output), max_requests=max_requests,
+                        requests_made=lambda: client.requests_made)
+
+    for index, tier in enumerate(TIERS):
+        state = states[tier.name]
+        if not tier.is_due(state, now):
+            age = (now - state['fetched_at']) / 3600
+            print(f"\n💤 Уровень {tier.name}: обновлён {age:.1f} ч назад (раз в {tier.cadence} ч)")
+            continue
+
+        spent = client.requests_made - requests_start
+        estimate = (state or {}).get('requests', 0)
+        # Без оценки уровню нужен хотя бы один запрос
+        if spent and spent + max(estimate, 1) > max_requests:
+            print(f"\n⏭️ Уровень {tier.name}: ~{estimate} запросов не помещаются в бюджет "
+                  f"({spent}/{max_requests}), откладываем")
+            continue
+        if not deadline.allows(estimate * request_cost(client), requests=0):
+            print(f"\n⏭️ Уровень {tier.name}: ~{estimate} запросов не успеть "
+                  f"за {max(0, deadline.remaining()):.0f} с, откладываем")
+            deadline.skip({'tier': tier.name})
+            continue
+
+        print(f"\n🔄 Уровень {tier.name}: вакансии возрастом {tier.min_age}-{tier.max_age} ч")
+        requests_before = client.requests_made
+        stats_before = client.fetch_stats()
+        deadline.tag = {'tier': tier.name}
+        skipped_before = len(deadline.skipped)
+        fetched = collect_all_vacancies(areas, query_mode, client, tier.search_params(now_dt), deadline)
+        partial = len(deadline.skipped) > skipped_before
+        failures = sum(s['failures'] for s in stats_since(stats_before, client.fetch_stats()).values())
+        if failures and not partial:
+            print(f"   ⚠️ Уровень {tier.name}: {failures} ошибок запросов, оставляем прежние данные")
+            continue
+        if partial:
+            # Недособранный уровень: прежние вакансии окна остаются, срок обновления - тоже
+            print(f"   ⏱️ Уровень {tier.name} собран не полностью, дополняем прежними данными")
+            known = {v.get('id') for v in fetched}
+            fetched += [v for v in (state or {}).get('vacancies', [])
+                        if v.get('id') not in known and (age_hours(v, now) or 0) < tier.max_age]
+
+        if state and index + 1 < len(TIERS):
+            hand_down(states, index,
+                      [v for v in state['vacancies'] if (age_hours(v, now) or 0) >= tier.max_age], areas, now)
+            touched.add(TIERS[index + 1].name)
+        requests = client.requests_made - requests_before
+        states[tier.name] = {
+            'areas': areas,
+            'fetched_at': state['fetched_at'] if partial and state else (overdue(tier, now) if partial else now),
+            'requests': max(requests, estimate) if partial else requests,
+            'vacancies': fetched
+        }
+        touched.add(tier.name)
+
+    save_skipped(output, deadline.skipped)
+    for tier in TIERS:
+        if tier.name in touched and states[tier.name] is not None:
+            write_cache(tier_cache_file(output, tier), states[tier.name])
+
+    # Сливаем от старых уровней к свежим: версия из более свежего уровня побеждает
+    merged: Dict[str, Dict] = {}
+    for tier in reversed(TIERS):
+        for vacancy in (states[tier.name] or {}).get('vacancies', []):
+            age = age_hours(vacancy, now)
+            if vacancy.get('id') and (age is None or age < TIERS[-1].max_age):
+                merged[vacancy['id']] = vacancy
+
+    print(f"\n🔢 Запросов за запуск: {client.requests_made - requests_start} из {max_requests}")
+    return sort_vacancies(list(merged.values()))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = build_parser("Сбор вакансий по уровням возраста (hot/warm/cold)")
+    parser.add_argument('--max-requests', type=int, default=DEFAULT_MAX_REQUESTS,
+                        help="бюджет запросов к API на один запуск")
+    args = parser.parse_args(argv)
+    areas = resolve_areas(args)
+    client = HHClient(headers=HEADERS, request_delay=REQUEST_DELAY)
+
+    if args.plan or args.dry_run:
+        # Оценка на запуск, в который обновляются все уровни (раз в сутки)
+        now = datetime.now(MSK)
+        plan = plan_collection(areas, args.query_mode, client, {tier.name: tier.search_params(now) for tier in TIERS},
+                               args.deadline, args.plan_output)
+        if plan['requests'] > args.max_requests:
+            print(f"💸 Все уровни сразу не помещаются в --max-requests {args.max_requests}")
+        if args.dry_run:
+            return not plan['errors'] and not plan['over_cap']
+
+    vacancies = refresh_tiers(areas, args.output, args.query_mode, args.max_requests, client,
+                              deadline_seconds=args.deadline)
+    if save_vacancies(vacancies, args.output) and vacancies:
+        save_history(args.output, vacancies)
+    if not vacancies:
+        print("\n❌ Не удалось найти ни одной вакансии")
+    return bool(vacancies)
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Тренды по истории снимков: колонки NumPy вместо json.load каждой версии
+
+Месяцы почасовых версий hh_vacancies*.json лежат в git, но смотреть их
+можно было только по одной. Теперь снимки потоком читаются из истории
+git (git cat-file --batch, без checkout) или из каталога с копиями и
+раскладываются в колонки:
+    snap      - номер снимка (время - в snap_time);
+    vid       - код id вакансии;
+    published - published_at, unix time;
+    area      - код региона;
+    company   - код компании;
+    salary    - середина вилки в рублях (NaN без зарплаты).
+Коды - индексы в словарях ids/areas/companies. Колонки копятся в
+.cache/trends_<источник>.npz, и повторный запуск разбирает только
+снимки, которых там ещё нет.
+
+По последнему снимку каждого дня (МСК) считается векторно:
+    active        - вакансий в снимке;
+    new           - впервые увиденных за день (скорость публикации);
+    closed        - пропавших со вчерашнего снимка;
+    salary_median - медиана зарплаты;
+и по компаниям за весь период - открытые и закрытые вакансии (churn).
+
+Нужен numpy: pip install .[analytics]
+
+Пример:
+    python trend_analytics.py --git hh_vacancies.json --since 2026-06-01
+    python trend_analytics.py --dir snapshots/ --area Москва --json trends.json
+"""
+
+import argparse
+import glob
+import os
+import re
+import subprocess
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from json_cache import cache_path
+from json_codec import dump_file, loads
+from vacancy_fields import parse_timestamp, salary_rub_mid
+
+# Сутки считаются по московскому времени
+DAY_OFFSET = 3 * 3600
+
+COLUMNS = ('snap', 'vid', 'published', 'area', 'company', 'salary')
+DICTIONARIES = ('ids', 'areas', 'companies')
+
+
+def git_snapshots(path: str, since: Optional[str] = None) -> Iterator[Tuple[str, Optional[float], bytes]]:
+    """(ключ, время коммита, содержимое) всех версий файла в git, от старых к новым"""
+    command = ['git', 'log', '--reverse', '--format=%H %ct']
+    if since:
+        command.append(f'--since={since}')
+    log = subprocess.run(command + ['--', path], capture_output=True, text=True, check=True).stdout.split()
+    commits = list(zip(log[::2], log[1::2]))
+    if not commits:
+        return
+    reader = subprocess.Popen(['git', 'cat-file', '--batch'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        for sha, committed in commits:
+            reader.stdin.write(f"{sha}:{path}\n".encode())
+            reader.stdin.flush()
+            header = reader.stdout.readline().split()
+            if len(header) != 3:  # "<объект> missing"
+                continue
+            data = reader.stdout.read(int(header[2]))
+            reader.stdout.read(1)
+            yield sha, float(committed), data
+    finally:
+        reader.stdin.close()
+        reader.wait()
+
+
+def directory_snapshots(directory: str) -> Iterator[Tuple[str, Optional[float], bytes]]:
+    """
+    (ключ, None, содержимое) JSON-снимков каталога: время возьмётся из 'updated'
+
+    Файлы <снимок>.<вид>.json рядом с <снимок>.json - производные
+    (manifest, meta, views, geo, suggest, facets...), а не снимки.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, '*.json')))
+    stems = {path[:-len('.json')] for path in paths}
+    for path in paths:
+        stem, dot, _ = path[:-len('.json')].rpartition('.')
+        if dot and stem in stems:
+            continue
+        stat = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        yield f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}", None, data
+
+
+class TrendColumns:
+    """Колонки всех разобранных снимков с дозагрузкой новых"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.keys: List[str] = []
+        self.snap_time: List[float] = []
+        self.chunks: Dict[str, List] = {name: [] for name in COLUMNS}
+        self.codes: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARIES}
+        if os.path.exists(path):
+            with np.load(path) as stored:
+                self.keys = stored['keys'].tolist()
+                self.snap_time = stored['snap_time'].tolist()
+                for name in COLUMNS:
+                    self.chunks[name].append(stored[name])
+                for name in DICTIONARIES:
+                    self.codes[name] = {value: code for code, value in enumerate(stored[name].tolist())}
+        self._known = set(self.keys)
+
+    def _code(self, dictionary: str, value: str) -> int:
+        codes = self.codes[dictionary]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def ingest(self, key: str, snapshot_time: Optional[float], data: bytes) -> bool:
+        """
+        Раскладывает снимок в колонки; False, если он уже разобран, повреждён
+        или это не снимок (нет списка 'vacancies')
+
+        snapshot_time=None - время снимка берётся из его поля 'updated';
+        без разборчивого 'updated' снимок пропускается, а не ложится в 1970-01-01.
+        """
+        if key in self._known:
+            return False
+        try:
+            snapshot = loads(data)
+        except ValueError:
+            return False
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get('vacancies'), list):
+            return False
+        if snapshot_time is None:
+            snapshot_time = parse_timestamp(snapshot.get('updated') or '')
+            if snapshot_time is None:
+                return False
+        vacancies = [v for v in snapshot['vacancies'] if v.get('id') and not v.get('duplicate_of')]
+        number = len(self.keys)
+        self.keys.append(key)
+        self._known.add(key)
+        self.snap_time.append(snapshot_time)
+
+        self.chunks['snap'].append(np.full(len(vacancies), number, dtype=np.int32))
+        self.chunks['vid'].append(np.array([self._code('ids', str(v['id'])) for v in vacancies], dtype=np.int32))
+        self.chunks['published'].append(np.array(
+            [parse_timestamp(v.get('published_at') or '') or np.nan for v in vacancies], dtype=np.float64))
+        self.chunks['area'].append(np.array([self._code('areas', v.get('area') or '') for v in vacancies],
+                                            dtype=np.int32))
+        self.chunks['company'].append(np.array([self._code('companies', v.get('company') or '')
+                                                for v in vacancies], dtype=np.int32))
+        salaries = [salary_rub_mid(v) for v in vacancies]
+        self.chunks['salary'].append(np.array([np.nan if s is None else s for s in salaries], dtype=np.float64))
+        return True
+
+    def update(self, snapshots: Iterator[Tuple[str, Optional[float], bytes]]) -> int:
+        """Разбирает новые снимки; возвращает их число"""
+        return sum(1 for key, snapshot_time, data in snapshots if self.ingest(key, snapshot_time, data))
+
+    def column(self, name: str) -> 'np.ndarray':
+        chunks = self.chunks[name]
+        if len(chunks) != 1:
+            dtype = np.float64 if name in ('published', 'salary') else np.int32
+            chunks[:] = [np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)]
+        return chunks[0]
+
+    def dictionary(self, name: str) -> List[str]:
+        return list(self.codes[name])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(tmp_path, keys=np.array(self.keys, dtype=str), snap_time=np.array(self.snap_time),
+                 **{name: self.column(name) for name in COLUMNS},
+                 **{name: np.array(self.dictionary(name), dtype=str) for name in DICTIONARIES})
+        os.replace(tmp_path, self.path)
+
+
+def compute_trends(columns: TrendColumns, area: Optional[str] = None, top: int = 10) -> Dict:
+    """Дневные ряды и churn компаний по последнему снимку каждого дня"""
+    snap, vid, company, salary = (columns.column(name) for name in ('snap', 'vid', 'company', 'salary'))
+    if area is not None:
+        code = columns.codes['areas'].get(area, -1)
+        mask = columns.column('area') == code
+        snap, vid, company, salary = snap[mask], vid[mask], company[mask], salary[mask]
+    snap_time = np.array(columns.snap_time, dtype=np.float64)
+    if not len(snap_time):
+        return {'days': [], 'companies': []}
+
+    # Последний снимок каждого дня
+    snap_day = ((snap_time + DAY_OFFSET) // 86400).astype(np.int64)
+    order = np.lexsort((snap_time, snap_day))
+    is_last = np.append(snap_day[order][1:] != snap_day[order][:-1], True)
+    day_snaps = order[is_last]
+    days = snap_day[day_snaps]
+
+    # Впервые увиденные: первое вхождение id в порядке времени снимков
+    row_order = np.argsort(snap_time[snap], kind='stable')
+    _, first = np.unique(vid[row_order], return_index=True)
+    first_day = snap_day[snap[row_order][first]]
+    new = np.bincount(np.searchsorted(days, first_day), minlength=len(days))
+
+    # Строки дневных снимков, сгруппированные по дню
+    position = np.full(len(snap_time), -1, dtype=np.int64)
+    position[day_snaps] = np.arange(len(day_snaps))
+    day_of_row = position[snap]
+    selected = np.flatnonzero(day_of_row >= 0)
+    selected = selected[np.argsort(day_of_row[selected], kind='stable')]
+    bounds = np.searchsorted(day_of_row[selected], np.arange(len(days) + 1))
+
+    opened_by_company = np.zeros(len(columns.codes['companies']), dtype=np.int64)
+    closed_by_company = np.zeros_like(opened_by_company)
+    series = []
+    previous = None
+    for number, day in enumerate(days):
+        rows = selected[bounds[number]:bounds[number + 1]]
+        ids = vid[rows]
+        salaries = salary[rows]
+        salaries = salaries[~np.isnan(salaries)]
+        closed = None
+        if previous is not None:
+            opened_rows = rows[~np.isin(ids, vid[previous])]
+            closed_rows = previous[~np.isin(vid[previous], ids)]
+            opened_by_company += np.bincount(company[opened_rows], minlength=len(opened_by_company))
+            closed_by_company += np.bincount(company[closed_rows], minlength=len(closed_by_company))
+            closed = len(closed_rows)
+        series.append({
+            'day': str(np.datetime64(int(day), 'D')),
+            'active': len(rows),
+            'new': int(new[number]) if number else None,
+            'closed': closed,
+            'salary_median': round(float(np.median(salaries))) if len(salaries) else None
+        })
+        previous = rows
+
+    churn = opened_by_company + closed_by_company
+    names = columns.dictionary('companies')
+    leaders = [code for code in np.argsort(-churn, kind='stable')[:top] if churn[code]]
+    return {
+        'days': series,
+        'companies': [{'company': names[code] or '—', 'opened': int(opened_by_company[code]),
+                       'closed': int(closed_by_company[code]),
+                       'net': int(opened_by_company[code] - closed_by_company[code])} for code in leaders]
+    }
+
+
+def source_cache(args) -> str:
+    source = f"git_{args.git}" if args.git else f"dir_{os.path.abspath(args.dir)}"
+    return cache_path(f"trends_{re.sub(r'[^0-9A-Za-z_]+', '_', source).strip('_')}.npz")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Тренды по истории снимков вакансий (NumPy)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--git', metavar='FILE', help="версии файла снимка из истории git")
+    source.add_argument('--dir', metavar='DIR', help="каталог с JSON-снимками")
+    parser.add_argument('--since', help="только коммиты после даты (для --git)")
+    parser.add_argument('--area', help="только вакансии региона")
+    parser.add_argument('--days', type=int, default=30, help="сколько последних дней печатать")
+    parser.add_argument('--top', type=int, default=10, help="компаний в таблице churn")
+    parser.add_argument('--json', metavar='FILE', help="записать результат в JSON")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("❌ Для аналитики нужен numpy: pip install .[analytics]")
+        return False
+
+    columns = TrendColumns(source_cache(args))
+    try:
+        snapshots = git_snapshots(args.git, args.since) if args.git else directory_snapshots(args.dir)
+        added = columns.update(snapshots)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"❌ Не удалось прочитать снимки: {e}")
+        return False
+    if added:
+        columns.save()
+    print(f"📦 Снимков: {len(columns.keys)} (новых {added}), строк: {len(columns.column('snap'))}, "
+          f"вакансий: {len(columns.codes['ids'])}")
+
+    trends = compute_trends(columns, args.area, args.top)
+    print(f"\n{'день':12s} {'активных':>9s} {'новых':>7s} {'закрыто':>8s} {'медиана, ₽':>11s}")
+    for row in trends['days'][-args.days:]:
+        cells = [row['new'], row['closed'], row['salary_median']]
+        new, closed, median = ('—' if value is None else f"{value:,}".replace(',', ' ') for value in cells)
+        print(f"{row['day']:12s} {row['active']:9d} {new:>7s} {closed:>8s} {median:>11s}")
+    if trends['companies']:
+        print("\n🏢 Churn компаний:")
+        for row in trends['companies']:
+            print(f"   {row['company'][:40]:40s} +{row['opened']:<4d} -{row['closed']:<4d} итого {row['net']:+d}")
+    if args.json:
+        dump_file(args.json, trends)
+        print(f"\n💾 {args.json}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -2,6 +2,8 @@ import requests
 import json
 from datetime import datetime
 
+from rate_budget import acquire_hh_token
+
 # API HH.ru
 url = "https://api.hh.ru/vacancies"
 
@@ -22,6 +24,7 @@ headers = {
 all_vacancies = []
 
 # Получаем первую страницу
+acquire_hh_token()
 response = requests.get(url, params=params, headers=headers)
 data = response.json()
 
@@ -54,6 +57,7 @@ for item in data.get('items', []):
 # Получаем остальные страницы (максимум 5 страниц = 500 вакансий)
 for page in range(1, min(total_pages, 5)):
     params['page'] = page
+    acquire_hh_token()
     response = requests.get(url, params=params, headers=headers)
     data = response.json()
     
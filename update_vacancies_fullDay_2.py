@@ -1,11 +1,10 @@
-import requests
-import json
 from datetime import datetime
-import time
 from typing import List, Dict, Optional
 
-# API HH.ru
-BASE_URL = "https://api.hh.ru/vacancies"
+from area_planner import load_shard_areas
+from fetch_policy import print_fetch_stats
+from hh_client import HHClient
+from json_codec import dump_file
 
 # Параметры поиска
 SEARCH_PARAMS = {
@@ -13,10 +12,13 @@ SEARCH_PARAMS = {
     'area': ['1556', '1563', '1575', '1586', '1596', '1614', '1620', '1624', '1646', '1652', '1661', '1679', '1704', '1716', '1739', '1754', '1771', '1783', '1806', '1817', '1828', '1844', '1859', '1880', '1890', '1898', '1905', '1913', '1932', '1941', '1943', '1946', '1948', '1960', '1975', '1982', '1985', '2114', '2134', '2155', '2173', '2209'],                        # Регионы №2
     'schedule': ['remote', 'flexible', 'fullDay', 'shift', 'flyInFlyOut'],               # Удаленная работа
     'search_field': 'name',             # Искать только в названии вакансии
-    'per_page': 1000,                    # Максимум вакансий на страницу
+    'per_page': 100,                     # Максимум вакансий на страницу (больше HH не отдаёт)
     'page': 0
 }
 
+# Шард в плане area_planner.py: если план есть, регионы берутся из него (в main)
+SHARD_INDEX = 1
+
 # Заголовки для запросов
 HEADERS = {
     'User-Agent': 'VacancyParser/1.0 (contact@example.com)'  # Более информативный User-Agent
@@ -26,11 +28,12 @@ HEADERS = {
 REQUEST_DELAY = 0.5
 
 
-def get_vacancies_page(page: int) -> Optional[Dict]:
+def get_vacancies_page(client: HHClient, page: int) -> Optional[Dict]:
     """
     Получает одну страницу вакансий из API HH.ru
     
     Args:
+        client: Клиент API HH.ru
         page: Номер страницы
         
     Returns:
@@ -38,17 +41,7 @@ def get_vacancies_page(page: int) -> Optional[Dict]:
     """
     params = SEARCH_PARAMS.copy()
     params['page'] = page
-    
-    try:
-        response = requests.get(BASE_URL, params=params, headers=HEADERS)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Ошибка при запросе страницы {page}: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Ошибка при разборе JSON на странице {page}: {e}")
-        return None
+    return client.search_vacancies(params)
 
 
 def parse_vacancy(item: Dict) -> Dict:
@@ -101,10 +94,13 @@ def parse_vacancy(item: Dict) -> Dict:
     return vacancy
 
 
-def collect_all_vacancies() -> List[Dict]:
+def collect_all_vacancies(client: HHClient) -> List[Dict]:
     """
     Собирает все вакансии со всех страниц
     
+    Args:
+        client: Клиент API HH.ru (таймаут, хеджирование и circuit breaker)
+        
     Returns:
         Список всех найденных вакансий
     """
@@ -122,11 +118,18 @@ def collect_all_vacancies() -> List[Dict]:
     
     while True:
         # Получаем страницу
-        data = get_vacancies_page(page)
+        data = get_vacancies_page(client, page)
         
         if data is None:
+            # Без первой страницы неизвестно число страниц, а при разомкнутом
+            # circuit breaker остальные запросы всё равно будут отклонены
+            if total_pages is None or client.circuit_open('/vacancies'):
+                print(f"Не удалось получить страницу {page}. Прекращаем сбор")
+                break
             print(f"Не удалось получить страницу {page}. Пропускаем...")
             page += 1
+            if page >= total_pages:
+                break
             continue
         
         # На первой странице узнаем общее количество
@@ -150,10 +153,8 @@ def collect_all_vacancies() -> List[Dict]:
         page += 1
         if page >= total_pages:
             break
-        
-        # Задержка между запросами
-        time.sleep(REQUEST_DELAY)
     
+    print_fetch_stats(client.fetch_stats())
     return all_vacancies
 
 
@@ -178,8 +179,7 @@ def save_vacancies(vacancies: List[Dict], filename: str = 'hh_vacancies_fullDay.
         'vacancies': vacancies
     }
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    dump_file(filename, output)
     
     print(f"\n✅ Файл {filename} успешно создан!")
     print(f"📊 Всего сохранено вакансий: {len(vacancies)}")
@@ -227,8 +227,13 @@ def main():
     Основная функция программы
     """
     try:
+        # Если есть план шардов от area_planner.py - берём регионы из него
+        planned_areas = load_shard_areas(SHARD_INDEX)
+        if planned_areas:
+            SEARCH_PARAMS['area'] = planned_areas
+
         # Собираем все вакансии
-        vacancies = collect_all_vacancies()
+        vacancies = collect_all_vacancies(HHClient(headers=HEADERS, request_delay=REQUEST_DELAY))
         
         if not vacancies:
             print("❌ Не удалось найти ни одной вакансии")
@@ -2,12 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import requests
-import json
-import time
 from datetime import datetime, timedelta
 import re
 from urllib.parse import urlencode, parse_qs, urlparse
 
+from json_codec import dump_file, loads
+from page_prober import page_limit
+from rate_budget import acquire_hh_token
+
 class VacancyAggregator:
     def __init__(self):
         self.base_url = "https://api.hh.ru/vacancies"
@@ -51,7 +53,7 @@ class VacancyAggregator:
             
         all_vacancies = []
         page = 0
-        max_pages = 10  # Увеличиваем до 10 страниц для получения больше вакансий
+        max_pages = page_limit(params['per_page'])  # Предел пагинации из отчёта page_prober.py
         
         print(f"Поиск вакансий: '{text}' в регионе {area} за последние 24 часа")
         print(f"Параметры поиска: {params}")
@@ -63,6 +65,7 @@ class VacancyAggregator:
                 print(f"Загружаем страницу {page + 1}...")
                 
                 # Делаем запрос к API
+                acquire_hh_token()
                 response = requests.get(self.base_url, params=params, headers=self.headers, timeout=30)
                 
                 print(f"URL запроса: {response.url}")
@@ -74,7 +77,7 @@ class VacancyAggregator:
                     
                 response.raise_for_status()
                 
-                data = response.json()
+                data = loads(response.content)
                 vacancies = data.get('items', [])
                 total_found = data.get('found', 0)
                 total_pages = data.get('pages', 1)
@@ -99,9 +102,6 @@ class VacancyAggregator:
                     
                 page += 1
                 
-                # Пауза между запросами для соблюдения лимитов API
-                time.sleep(1)
-                
             except requests.exceptions.Timeout:
                 print("Превышен таймаут запроса")
                 break
@@ -191,8 +191,7 @@ class VacancyAggregator:
         
         try:
             # Создаем полностью новый файл
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            dump_file(filepath, data)
             
             # Проверяем результат
             if os.path.exists(filepath):
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Единая точка входа: vacancy-aggregator <команда> [аргументы]
+
+Модули команд импортируются только при вызове самой команды, поэтому
+быстрые команды (status, diagnose --dry-run, --help) не загружают
+requests и стартуют за десятки миллисекунд.
+"""
+
+import sys
+from typing import List, Optional
+
+# Файлы снимков, которые показывает status
+SNAPSHOT_FILES = ['hh_vacancies.json', 'hh_vacancies_fullDay.json', 'hh_vacancies_fullDay_2.json']
+
+
+def cmd_collect(argv: List[str]) -> bool:
+    """Сбор вакансий, как в workflow (collect_vacancies.py)"""
+    from collect_vacancies import main
+    return main(argv)
+
+
+def cmd_refresh(argv: List[str]) -> bool:
+    """Сбор по уровням возраста hot/warm/cold (tiered_refresh.py)"""
+    from tiered_refresh import main
+    return main(argv)
+
+
+def cmd_update(argv: List[str]) -> bool:
+    """Свежие вакансии за 24 часа (VacancyAggregator.run_update)"""
+    import argparse
+    argparse.ArgumentParser(prog='vacancy-aggregator update',
+                            description=cmd_update.__doc__).parse_args(argv)
+    from vacancy_aggregator import VacancyAggregator
+    return VacancyAggregator().run_update()
+
+
+def cmd_plan(argv: List[str]) -> bool:
+    """Планирование шардов по регионам (area_planner.py)"""
+    from area_planner import main
+    return main(argv)
+
+
+def cmd_daemon(argv: List[str]) -> bool:
+    """Долгоживущий сборщик со статусом по HTTP (collector_daemon.py)"""
+    from collector_daemon import main
+    main(argv)
+    return True
+
+
+def cmd_serve(argv: List[str]) -> bool:
+    """Локальный API чтения (read_api.py)"""
+    from read_api import main
+    main(argv)
+    return True
+
+
+def cmd_diagnose(argv: List[str]) -> bool:
+    """Диагностика пагинации и сегментации по датам (precise_diagnostic.py)"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='vacancy-aggregator diagnose', description=cmd_diagnose.__doc__)
+    parser.add_argument('--dry-run', action='store_true', help="только показать, что будет проверено")
+    parser.add_argument('--skip-segmentation', action='store_true',
+                        help="не запускать тест сегментации по датам")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        print("Будет выполнено (без запросов к API в режиме --dry-run):")
+        print("  1. precise_page_limit_test: первая страница, страницы 0-30 и offset до 1050")
+        if not args.skip_segmentation:
+            print("  2. test_date_segmentation: found за 1, 3, 7 и 30 дней")
+        return True
+
+    from precise_diagnostic import precise_page_limit_test, test_date_segmentation
+    precise_page_limit_test()
+    if not args.skip_segmentation:
+        test_date_segmentation()
+    return True
+
+
+def cmd_probe(argv: List[str]) -> bool:
+    """Замер пределов пагинации двоичным поиском (page_prober.py)"""
+    from page_prober import main
+    return main(argv)
+
+
+def cmd_sources(argv: List[str]) -> bool:
+    """Сбор с нескольких площадок без дублей (sources.py)"""
+    from sources import main
+    return main(argv)
+
+
+def cmd_snapshot(argv: List[str]) -> bool:
+    """Бинарные снимки .vsnap: pack, get, range (binary_snapshot.py)"""
+    from binary_snapshot import main
+    return main(argv)
+
+
+def cmd_views(argv: List[str]) -> bool:
+    """Пересборка порядков сортировки <снимок>.views.json (sorted_views.py)"""
+    from sorted_views import main
+    return main(argv)
+
+
+def cmd_geo(argv: List[str]) -> bool:
+    """Пространственный индекс <снимок>.geo.json и поиск в радиусе (geo_index.py)"""
+    from geo_index import main
+    return main(argv)
+
+
+def cmd_suggest(argv: List[str]) -> bool:
+    """Префиксные подсказки <снимок>.suggest.json для фильтров (facet_suggest.py)"""
+    from facet_suggest import main
+    return main(argv)
+
+
+def cmd_facets(argv: List[str]) -> bool:
+    """Битовые индексы фасетов <снимок>.facets.json и счётчики фильтров (facet_bitmaps.py)"""
+    from facet_bitmaps import main
+    return main(argv)
+
+
+def cmd_columns(argv: List[str]) -> bool:
+    """Колоночная выгрузка <снимок>.columns.npz для аналитики (columnar_export.py)"""
+    from columnar_export import main
+    return main(argv)
+
+
+def cmd_history(argv: List[str]) -> bool:
+    """Журнал изменений вакансий: record, open-on, time-to-close (history_store.py)"""
+    from history_store import main
+    return main(argv)
+
+
+def cmd_trends(argv: List[str]) -> bool:
+    """Тренды по истории снимков из git или каталога, NumPy (trend_analytics.py)"""
+    from trend_analytics import main
+    return main(argv)
+
+
+def cmd_duplicates(argv: List[str]) -> bool:
+    """Кластеры почти-дублей вакансий, MinHash + LSH (near_duplicates.py)"""
+    from near_duplicates import main
+    return main(argv)
+
+
+def cmd_skills(argv: List[str]) -> bool:
+    """Навыки в вакансиях: частота и медиана зарплаты (skill_tagger.py)"""
+    from skill_tagger import main
+    return main(argv)
+
+
+def cmd_budget(argv: List[str]) -> bool:
+    """Общий для процессов бюджет запросов к HH (rate_budget.py)"""
+    import argparse
+    argparse.ArgumentParser(prog='vacancy-aggregator budget',
+                            description=cmd_budget.__doc__).parse_args(argv)
+    from rate_budget import main
+    main()
+    return True
+
+
+def cmd_replay(argv: List[str]) -> bool:
+    """Пересборка снимка из сохранённых файлов без запросов к API"""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(prog='vacancy-aggregator replay', description=cmd_replay.__doc__)
+    parser.add_argument('files', nargs='+', help="исходные снимки hh_vacancies*.json")
+    parser.add_argument('--output', required=True, help="файл результата")
+    args = parser.parse_args(argv)
+
+    from collect_vacancies import save_vacancies
+    from snapshot_writer import sort_vacancies
+
+    seen = set()
+    vacancies = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for vacancy in json.load(f).get('vacancies', []):
+                if vacancy.get('id') and vacancy['id'] not in seen:
+                    seen.add(vacancy['id'])
+                    vacancies.append(vacancy)
+
+    save_vacancies(sort_vacancies(vacancies), args.output)
+    return True
+
+
+def cmd_status(argv: List[str]) -> bool:
+    """Состояние снимков по их манифестам"""
+    import argparse
+    parser = argparse.ArgumentParser(prog='vacancy-aggregator status', description=cmd_status.__doc__)
+    parser.add_argument('files', nargs='*', default=SNAPSHOT_FILES)
+    args = parser.parse_args(argv)
+
+    from snapshot_writer import read_manifest
+    for path in args.files:
+        manifest = read_manifest(path)
+        if manifest is None:
+            print(f"{path}: манифеста нет")
+            continue
+        print(f"{path}: {manifest['vacancies']} вакансий, изменён {manifest['content_updated']}, "
+              f"sha256 {manifest['sha256'][:12]}")
+    return True
+
+
+COMMANDS = {
+    'collect': cmd_collect,
+    'refresh': cmd_refresh,
+    'update': cmd_update,
+    'plan': cmd_plan,
+    'daemon': cmd_daemon,
+    'serve': cmd_serve,
+    'diagnose': cmd_diagnose,
+    'probe': cmd_probe,
+    'sources': cmd_sources,
+    'snapshot': cmd_snapshot,
+    'views': cmd_views,
+    'geo': cmd_geo,
+    'suggest': cmd_suggest,
+    'facets': cmd_facets,
+    'columns': cmd_columns,
+    'history': cmd_history,
+    'trends': cmd_trends,
+    'duplicates': cmd_duplicates,
+    'skills': cmd_skills,
+    'budget': cmd_budget,
+    'replay': cmd_replay,
+    'status': cmd_status
+}
+
+
+def print_usage():
+    print("Использование: vacancy-aggregator <команда> [аргументы]\n")
+    print("Команды:")
+    for name, command in COMMANDS.items():
+        print(f"  {name:10s} {command.__doc__}")
+    print("\nСправка по команде: vacancy-aggregator <команда> --help")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Основная функция"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0
+
+    command = COMMANDS.get(argv[0])
+    if command is None:
+        print(f"❌ Неизвестная команда: {argv[0]}\n")
+        print_usage()
+        return 2
+
+    try:
+        return 0 if command(argv[1:]) is not False else 1
+    except KeyboardInterrupt:
+        print("\n\n⚠️ Прервано пользователем")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
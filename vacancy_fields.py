@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Производные поля вакансий, общие для индексов и выгрузок
+
+Работает с записями в формате collect_vacancies.parse_vacancy
+(зарплата в 'salary_raw', даты в 'published_at'/'created_at').
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+# Время HH: московское, формат published_at и параметров date_from/date_to
+MSK = timezone(timedelta(hours=3))
+HH_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+# Примерные курсы для сравнения зарплат в рублях
+CURRENCY_RATES = {
+    'RUR': 1.0,
+    'RUB': 1.0,
+    'USD': 90.0,
+    'EUR': 100.0,
+    'KZT': 0.19,
+    'BYR': 28.0,
+    'BYN': 28.0,
+    'UAH': 2.2,
+    'UZS': 0.0072,
+    'KGS': 1.05,
+    'AZN': 53.0,
+    'GEL': 33.0
+}
+
+
+def salary_rub_range(vacancy: Dict) -> Optional[Tuple[float, float]]:
+    """
+    Вилка зарплаты в рублях
+
+    Returns:
+        (от, до) в рублях; если указана одна граница, она же вторая.
+        None, если зарплата не указана или валюта неизвестна.
+    """
+    salary = vacancy.get('salary_raw')
+    if not isinstance(salary, dict):
+        return None
+    rate = CURRENCY_RATES.get(salary.get('currency') or 'RUR')
+    low, high = salary.get('from'), salary.get('to')
+    if rate is None or not (low or high):
+        return None
+    low = low or high
+    high = high or low
+    return low * rate, high * rate
+
+
+def salary_rub_mid(vacancy: Dict) -> Optional[float]:
+    """Середина вилки в рублях или None"""
+    bounds = salary_rub_range(vacancy)
+    if bounds is None:
+        return None
+    return (bounds[0] + bounds[1]) / 2
+
+
+def coordinate(value: Any) -> Optional[float]:
+    """Координата из address.lat/lng HH (число или строка) или None"""
+    try:
+        return round(float(value), 6) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def vacancy_point(vacancy: Dict) -> Optional[Tuple[float, float]]:
+    """(широта, долгота) адреса вакансии или None"""
+    lat, lng = vacancy.get('lat'), vacancy.get('lng')
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+# Часовые пояса вида '+0300', уже встреченные parse_timestamp
+_OFFSETS: Dict[str, timezone] = {}
+
+
+def _offset(value: str) -> timezone:
+    tz = _OFFSETS.get(value)
+    if tz is None:
+        minutes = int(value[1:3]) * 60 + int(value[3:5])
+        tz = _OFFSETS[value] = timezone(timedelta(minutes=-minutes if value[0] == '-' else minutes))
+    return tz
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """'2024-05-01T10:00:00+0300' -> unix time или None"""
+    if not value:
+        return None
+    try:
+        # Формат HH фиксированной длины разбирается в несколько раз быстрее strptime
+        if len(value) == 24 and value[19] in '+-':
+            return datetime.fromisoformat(value[:19]).replace(tzinfo=_offset(value[19:])).timestamp()
+        return datetime.strptime(value, HH_TIME_FORMAT).timestamp()
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None